@@ -3,7 +3,7 @@ from discord import app_commands
 from discord.ext import commands, tasks
 import asyncio
 import time
-from typing import Dict, List, Optional, Union, Any, Literal
+from typing import Dict, List, Optional, Union, Any, Literal, Set
 from datetime import datetime, timedelta
 import random
 import logging
@@ -34,13 +34,11 @@ class SimpleContextWrapper:
     async def send(self, content=None, embed=None, **kwargs):
         """Safe send method that uses the channel directly."""
         if self.channel:
-            async with self.channel.typing():
-                return await self.channel.send(content=content, embed=embed, **kwargs)
+            return await self.channel.send(content=content, embed=embed, **kwargs)
         else:
             # Try original context's send method as fallback
             if hasattr(self.original_ctx, 'send'):
-                async with self.original_ctx.typing():
-                    return await self.original_ctx.send(content=content, embed=embed, **kwargs)
+                return await self.original_ctx.send(content=content, embed=embed, **kwargs)
             # Last resort - log error
             logging.getLogger("bot.group_quiz").error("No viable send method found in SimpleContextWrapper")
             return None
@@ -66,6 +64,27 @@ from cogs.utils.decorators import require_context, in_guild_only, cooldown_with_
 
 logger = logging.getLogger("bot.group_quiz")
 
+# Max number of end-of-quiz database writes allowed to run at once
+MAX_CONCURRENT_RESULT_WRITES = 4
+# Seconds to wait on unload for queued result writes before cancelling them
+RESULT_WRITE_DRAIN_TIMEOUT = 10.0
+
+# Letter prefix on multiple-choice options, e.g. "A. " or "B) "
+_OPT_PREFIX_RE = re.compile(r'^[A-D][.\)]\s*')
+
+# Constant text and (title, color) pairs used by every answer reveal
+_TF_TRUE_EXPL = "The statement is correct."
+_TF_FALSE_EXPL = "The statement is incorrect."
+_NO_CORRECT_TEXT = "No one answered correctly!"
+# Formatter for one trivia leaderboard line, bound once
+_LB_ROW = "**{i}. {u}** — {s} pts  ✅ {c} ❌ {w}".format_map
+
+_REVEAL_TITLES = {
+    'timeout': ("⏰ Time's Up - Answer Revealed!", Color.orange()),
+    'answered': ("✅ Answer Revealed!", Color.green()),
+    'default': ("📝 Answer Revealed!", Color.blue()),
+}
+
 
 class GroupQuizCog(commands.Cog, name="Group Quiz"):
     """Commands for interactive group quizzes that work like trivia games."""
@@ -80,6 +99,11 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
         self.db_service = None
         self.message_router = None
         self.group_quiz_manager = None
+        
+        # Background result writes, tracked so they aren't garbage collected mid-flight
+        self._bg_tasks: Set[asyncio.Task] = set()
+        self._end_tasks: Set[asyncio.Task] = set()  # In-flight _end_trivia_session runs started by stop
+        self._result_write_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESULT_WRITES)
     
     def set_context(self, context):
         """Set the bot context."""
@@ -120,6 +144,33 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
     async def cog_unload(self):
         """Called when the cog is unloaded."""
         self.check_inactive_sessions.cancel()
+        # Let stopped games finish posting their results before tearing down
+        if self._end_tasks:
+            await asyncio.gather(*self._end_tasks, return_exceptions=True)
+        # Give the result writes those games queued a bounded chance to land
+        if self._bg_tasks:
+            _, pending = await asyncio.wait(set(self._bg_tasks), timeout=RESULT_WRITE_DRAIN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+    
+    def _record_results_in_background(self, quiz_id: str, **kwargs) -> None:
+        """Record batch quiz results without blocking the caller on the database."""
+        async def _write():
+            async with self._result_write_semaphore:
+                return await record_batch_quiz_results(db_service=self.db_service, quiz_id=quiz_id, **kwargs)
+        
+        def _on_done(task: asyncio.Task):
+            self._bg_tasks.discard(task)
+            if task.cancelled():
+                logger.warning(f"Batch recording for quiz {quiz_id} was cancelled")
+            elif task.exception():
+                logger.error(f"Batch recording failed for quiz {quiz_id}: {task.exception()}")
+            elif task.result() is False:
+                logger.warning(f"Batch recording for quiz {quiz_id} reported partial failure")
+        
+        task = asyncio.create_task(_write())
+        self._bg_tasks.add(task)
+        task.add_done_callback(_on_done)
     
     @tasks.loop(minutes=5)
     async def check_inactive_sessions(self):
@@ -196,6 +247,29 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             for topic in matching_topics[:25]
         ]
     
+    async def _resolve_user(self, user_id: int):
+        """Resolve a user from the client cache, falling back to a REST fetch."""
+        user = self.bot.get_user(user_id)
+        if user is None:
+            user = await self.bot.fetch_user(user_id)
+        return user
+
+    async def _resolve_users(self, user_ids) -> List[User]:
+        """Resolve several users concurrently, skipping any that can't be found."""
+        user_ids = list(user_ids)
+        results = await asyncio.gather(
+            *(self._resolve_user(user_id) for user_id in user_ids),
+            return_exceptions=True
+        )
+
+        users = []
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to resolve user {user_id}: {result}")
+            else:
+                users.append(result)
+        return users
+
     @commands.hybrid_group(name="trivia", description="Group quiz commands for interactive trivia games.")
     async def trivia_group(self, ctx):
         """Group quiz commands for interactive trivia games."""
@@ -769,6 +843,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                 
             session.is_active = True
             session.start_time = datetime.now()
+            session._start_monotonic = time.monotonic()
             
             # Create announcement embed
             embed = Embed(
@@ -864,7 +939,25 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                     logger.error(f"Error cleaning up session: {cleanup_error}")
     
     async def _ask_next_trivia_question(self, ctx, session, initial_message=None):
-        """Ask the next question in the trivia session."""
+        """Ask the remaining questions in the trivia session, one per loop iteration."""
+        # A stop flips the session out of active; its own end task posts the results
+        while session.is_active:
+            try:
+                advance = await self._ask_one_question(ctx, session, initial_message)
+            except Exception as e:
+                logger.error(f"Error in _ask_next_trivia_question: {e}")
+                # Don't end the session on error, try to continue with the next question
+                advance = True
+            
+            if not advance:
+                return
+            session.next_question()
+    
+    async def _ask_one_question(self, ctx, session, initial_message=None) -> bool:
+        """Ask the current question and show its answer.
+        
+        Returns True if the caller should advance to the next question, False once the session is over.
+        """
         # Get the channel in a safe way
         channel = None
         if hasattr(ctx, 'channel'):
@@ -904,16 +997,14 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             
             if channel:
                 try:
-                    async with channel.typing():
-                        return await channel.send(content=content, embed=embed)
+                    return await channel.send(content=content, embed=embed)
                 except Exception as channel_error:
                     logger.error(f"Error sending message via channel: {channel_error}")
             
             # Only as a backup, try ctx.send
             if hasattr(ctx, 'send'):
                 try:
-                    async with ctx.typing():
-                        return await ctx.send(content=content, embed=embed)
+                    return await ctx.send(content=content, embed=embed)
                 except Exception as send_error:
                     logger.error(f"Error sending message via ctx.send: {send_error}")
             
@@ -921,13 +1012,15 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             return None
                 
         if session.is_finished:
-            await self._end_trivia_session(ctx, session)
-            return
+            # Ran out of questions; a stopped session is ended by the stop command's own task
+            if session.is_active and session.end_task is None:
+                await self._end_trivia_session(ctx, session)
+            return False
         
         question = session.current_question
         if not question:
             await self._end_trivia_session(ctx, session)
-            return
+            return False
         
         # Validate the current question before proceeding
         is_valid = (
@@ -960,15 +1053,11 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                 if not fixed:
                     logger.warning("Skipping invalid question that couldn't be fixed")
                     # Move to next question
-                    session.next_question()
-                    await self._ask_next_trivia_question(ctx, session, initial_message)
-                    return
+                    return True
             except Exception as e:
                 logger.error(f"Error processing invalid question: {e}")
                 # Move to next question
-                session.next_question()
-                await self._ask_next_trivia_question(ctx, session, initial_message)
-                return
+                return True
         
         # Get progress info
         progress_info = session.get_progress_info()
@@ -978,7 +1067,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             logger.error("Message router not available. Please make sure it's properly initialized.")
             await send_message("❌ An error occurred while sending the quiz question. Please try again later.")
             self.group_quiz_manager.end_session(ctx.guild.id, ctx.channel.id)
-            return
+            return False
         
         try:
             # Determine the destination based on whether this is a private or public trivia
@@ -1012,12 +1101,14 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             
             if message:
                 session.current_question_message_id = message.id
+                # Keep the Message itself so the answer reveal can edit it without re-fetching
+                session.current_question_message = message
             
             # Set question start time
-            question_start_time = time.time()
+            question_start_time = time.monotonic()
             
             # Reset timer cancelled flag for this question
-            session._timer_cancelled = False
+            session.reset_timer()
             
             # Set up a task to handle the timeout
             timer_task = asyncio.create_task(
@@ -1036,7 +1127,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             
             # Wait for answers until timeout
             try:
-                while time.time() - question_start_time < session.timeout:
+                while time.monotonic() - question_start_time < session.timeout:
                     try:
                         if session.is_private:
                             # In private mode, wait for DM responses
@@ -1104,8 +1195,11 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                         session.register_participant(message.author.id, message.author.name)
                         
                         # Record answer and response time
-                        response_time = time.time() - question_start_time
+                        response_time = time.monotonic() - question_start_time
                         is_answer_correct = session.record_answer(message.author.id, message.content, response_time)
+                        # A stopped game doesn't record answers, so don't mark them wrong either
+                        if not session.is_active:
+                            continue
                         
                         # Add user to answered set
                         answered_users.add(message.author.id)
@@ -1131,7 +1225,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                             if update_task:
                                 update_task.cancel()
                             # Mark the timer task as complete to avoid showing "Time's up" after correct answer
-                            session._timer_cancelled = True
+                            session.cancel_timer()
                             # We found a correct answer, exit the loop - scores will be calculated in _show_trivia_answers
                             break
                         
@@ -1150,7 +1244,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                 update_task.cancel()
             
             # Mark timer as cancelled to prevent any remaining updates
-            session._timer_cancelled = True
+            session.cancel_timer()
             
             # Small delay to ensure any pending timer updates complete before we edit the message
             await asyncio.sleep(0.1)
@@ -1161,21 +1255,18 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                 await self._show_trivia_answers(ctx, session)
             
             # Only continue if session is still active
-            if session.is_active:
-                # Wait between questions
-                await asyncio.sleep(session.time_between_questions)
-                
-                # Move to next question
-                session.next_question()
-                await self._ask_next_trivia_question(ctx, session, initial_message)
+            if not session.is_active:
+                return False
+            
+            # Wait between questions, then move to the next one
+            await asyncio.sleep(session.time_between_questions)
+            return True
         
         except Exception as e:
-            logger.error(f"Error in _ask_next_trivia_question: {e}")
-            async with ctx.typing():
-                await ctx.send(f"❌ An error occurred while processing the trivia question: {str(e)}")
+            logger.error(f"Error in _ask_one_question: {e}")
+            await ctx.send(f"❌ An error occurred while processing the trivia question: {str(e)}")
             # Don't end the session on error, try to continue with the next question
-            session.next_question()
-            await self._ask_next_trivia_question(ctx, session, initial_message)
+            return True
     
     async def _update_question_timer(self, message, session, start_time):
         """Update the time display in the quiz question message with improved accuracy."""
@@ -1200,12 +1291,12 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             
             while True:
                 # Check if timer was cancelled early
-                if hasattr(session, '_timer_cancelled') and session._timer_cancelled:
+                if session.timer_cancelled:
                     logger.debug("Timer cancelled, stopping updates")
                     return
                 
                 # Calculate precise remaining time
-                current_time = time.time()
+                current_time = time.monotonic()
                 elapsed = current_time - start_time
                 remaining = max(0, total_timeout - elapsed)
                 
@@ -1232,15 +1323,17 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                         logger.warning(f"Failed to update timer: {update_error}")
                         # If we can't update the message, it might have been deleted/edited
                         # Check if timer was cancelled and break if so
-                        if hasattr(session, '_timer_cancelled') and session._timer_cancelled:
+                        if session.timer_cancelled:
                             return
                 
-                # Dynamic sleep based on remaining time and update interval
-                sleep_time = min(update_interval, 0.5)
-                await asyncio.sleep(sleep_time)
+                # Sleep for the full update interval; cancellation wakes us immediately
+                sleep_time = min(update_interval, remaining)
+                if await session.wait_cancelled(sleep_time):
+                    logger.debug("Timer cancelled, stopping updates")
+                    return
             
             # Final update to show 0 seconds (if timer wasn't cancelled)
-            if not (hasattr(session, '_timer_cancelled') and session._timer_cancelled):
+            if not session.timer_cancelled:
                 try:
                     await self.message_router.update_quiz_time(message, 0, total_timeout)
                     logger.debug("Final timer update: 0s remaining")
@@ -1262,12 +1355,12 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             # Use precise timing with shorter sleep intervals for better responsiveness
             while True:
                 # Check if timer was cancelled
-                if hasattr(session, '_timer_cancelled') and session._timer_cancelled:
+                if session.timer_cancelled:
                     logger.debug("Timeout handler cancelled")
                     return
                 
                 # Calculate precise remaining time
-                current_time = time.time()
+                current_time = time.monotonic()
                 elapsed = current_time - start_time
                 remaining = timeout - elapsed
                 
@@ -1275,12 +1368,13 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                 if remaining <= 0:
                     break
                 
-                # Sleep for short intervals to maintain responsiveness
-                sleep_time = min(0.5, remaining)
-                await asyncio.sleep(sleep_time)
+                # Sleep until time is up; cancellation wakes us immediately
+                if await session.wait_cancelled(remaining):
+                    logger.debug("Timeout handler cancelled")
+                    return
             
             # Time is up - check one more time if we were cancelled
-            if not (hasattr(session, '_timer_cancelled') and session._timer_cancelled):
+            if not session.timer_cancelled:
                 # Only send "Time's up" message if we're not in single answer mode
                 # or if no one got the answer yet
                 if not session.single_answer_mode:
@@ -1298,49 +1392,77 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
         except Exception as e:
             logger.error(f"Error in question timeout handler: {e}")
     
+    async def _edit_or_send(self, ctx, message, embed) -> bool:
+        """Edit a message in place, sending a new one if the edit is rejected.
+        
+        A short rate limit is waited out and the edit retried once; any other
+        HTTP failure (e.g. unknown message or the old-message edit limit) goes
+        straight to a fresh send. Returns True if the original message was edited.
+        """
+        try:
+            await message.edit(embed=embed)
+            return True
+        except discord.HTTPException as e:
+            retry_after = getattr(e, 'retry_after', None) or 0
+            if e.status == 429 and retry_after < 2:
+                await asyncio.sleep(retry_after)
+                try:
+                    await message.edit(embed=embed)
+                    return True
+                except discord.HTTPException as retry_error:
+                    e = retry_error
+            logger.warning(f"Failed to edit message {message.id} (status {e.status}, code {e.code}), sending a new one")
+        
+        await ctx.send(embed=embed)
+        return False
+    
     async def _show_trivia_answers(self, ctx, session):
         """Show the answers and scores for the current question."""
         from utils.content import truncate_content
         
         question = session.current_question
         
-        # Calculate scores based on answers
-        correct_responders = session.calculate_scores()
+        # Read the question fields once; later checks use these locals
+        q_text = getattr(question, 'question', None)
+        q_type = getattr(question, 'question_type', None)
+        q_answer = getattr(question, 'answer', None)
+        q_options = getattr(question, 'options', None) or []
+        q_explanation = getattr(question, 'explanation', None)
+        
+        # Score the question once and reuse the standings and progress below
+        correct_responders, leaderboard, progress = session.snapshot(5)
         
         # Create embed for showing the answer with truncated content
         # Check if time expired by looking at session state
         # Timer cancelled means someone answered correctly or it was manually stopped
         # Timer not cancelled means time ran out naturally
-        time_expired = not (hasattr(session, '_timer_cancelled') and session._timer_cancelled)
+        time_expired = not session.timer_cancelled
         someone_answered = len(correct_responders) > 0 if correct_responders else False
         
         # Determine the appropriate title based on what happened
         if time_expired and not someone_answered:
-            title = "⏰ Time's Up - Answer Revealed!"
-            embed_color = Color.orange()
+            title, embed_color = _REVEAL_TITLES['timeout']
         elif someone_answered:
-            title = "✅ Answer Revealed!"
-            embed_color = Color.green()
+            title, embed_color = _REVEAL_TITLES['answered']
         else:
-            title = "📝 Answer Revealed!"
-            embed_color = Color.blue()
+            title, embed_color = _REVEAL_TITLES['default']
         embed = Embed(
             title=title,
-            description=f"**Question:** {truncate_content(question.question, 'question')}",
+            description=f"**Question:** {truncate_content(q_text, 'question')}",
             color=embed_color
         )
         
         # Check if this is a true/false question
         is_true_false = False
-        if hasattr(question, 'question_type') and question.question_type == "true_false":
+        if q_type == "true_false":
             is_true_false = True
-        elif isinstance(question.question, str) and question.question.lower().startswith("true or false"):
+        elif isinstance(q_text, str) and q_text.lower().startswith("true or false"):
             is_true_false = True
         
         # Add correct answer - improved handling with content truncation
-        if hasattr(question, 'answer') and question.answer and question.answer not in ["Unable to parse from response", "Answer unavailable"]:
+        if q_answer and q_answer not in ["Unable to parse from response", "Answer unavailable"]:
             # Truncate answer text before processing
-            answer_text = truncate_content(question.answer, 'answer')
+            answer_text = truncate_content(q_answer, 'answer')
             
             # For true/false questions, ensure we display just "True" or "False" without the A/B prefix
             if is_true_false:
@@ -1353,38 +1475,37 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                     answer_text = "True"
                 elif "false" in answer_text.lower():
                     answer_text = "False"
-        elif hasattr(question, 'options') and question.options and len(question.options) > 0:
+        elif q_options:
             # If answer is missing but we have options, use the first option as fallback
-            answer_text = question.options[0]
+            answer_text = q_options[0]
             embed.add_field(name="Note", value="⚠️ The correct answer couldn't be fully determined. This is our best guess.", inline=False)
         else:
             # Last resort
             answer_text = "Unable to determine the correct answer"
         
         # For multiple choice questions, try to display answer with the letter format
-        if hasattr(question, 'question_type') and question.question_type == "multiple_choice" and hasattr(question, 'options') and question.options:
+        if q_type == "multiple_choice" and q_options:
             # Clean the options of any letter prefixes
             cleaned_options = []
-            for opt in question.options:
+            for opt in q_options:
                 if isinstance(opt, str):
                     # Remove letter prefixes if present
-                    cleaned_opt = re.sub(r'^[A-D]\.\s*', '', opt)
-                    cleaned_opt = re.sub(r'^[A-D]\)\s*', '', cleaned_opt)
-                    cleaned_options.append(cleaned_opt.strip())
+                    cleaned_options.append(_OPT_PREFIX_RE.sub('', opt).strip())
                 else:
                     cleaned_options.append(opt)
             
-            # Try to find the matching option for the answer
-            found_match = False
+            # Map lowercased option text to its position so the answer lookup is O(1)
+            option_map = {}
             for i, option in enumerate(cleaned_options):
-                if option and isinstance(option, str) and answer_text and isinstance(answer_text, str):
-                    if option.lower() == answer_text.lower():
-                        answer_text = f"{chr(65 + i)}. {option}"
-                        found_match = True
-                        break
+                if option and isinstance(option, str):
+                    option_map.setdefault(option.lower(), (i, option))
             
+            answer_key = answer_text.lower() if answer_text and isinstance(answer_text, str) else None
+            if answer_key in option_map:
+                i, option = option_map[answer_key]
+                answer_text = f"{chr(65 + i)}. {option}"
             # If no match found but answer is just a letter, convert it to the option
-            if not found_match and isinstance(answer_text, str) and answer_text.upper() in ["A", "B", "C", "D"]:
+            elif isinstance(answer_text, str) and answer_text.upper() in ["A", "B", "C", "D"]:
                 idx = ord(answer_text.upper()) - ord("A")
                 if 0 <= idx < len(cleaned_options):
                     answer_text = f"{answer_text.upper()}. {cleaned_options[idx]}"
@@ -1393,26 +1514,22 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
         
         # Show explanation if available
         if (
-            hasattr(question, 'explanation') and 
-            question.explanation and 
-            isinstance(question.explanation, str) and
-            not question.explanation.lower() in [
+            q_explanation and 
+            isinstance(q_explanation, str) and
+            not q_explanation.lower() in [
                 "json parsing error occurred", 
                 "no explanation available",
                 "unable to parse from original response"
             ]
         ):
             # Clean up the explanation if needed and apply content truncation
-            explanation_text = truncate_content(question.explanation, "explanation")
+            explanation_text = truncate_content(q_explanation, "explanation")
             
             # Fix common "Unable to parse" issues
             if "unable to parse" in explanation_text.lower():
                 # Replace with a generic explanation if we can't determine a good one
                 if is_true_false:
-                    if answer_text.lower() == "true":
-                        explanation_text = "The statement is correct."
-                    else:
-                        explanation_text = "The statement is incorrect."
+                    explanation_text = _TF_TRUE_EXPL if answer_text.lower() == "true" else _TF_FALSE_EXPL
                 else:
                     # Try to generate a simple explanation from the answer
                     explanation_text = f"The correct answer is {answer_text.strip()}."
@@ -1421,10 +1538,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
         else:
             # Generate a basic explanation if none exists
             if is_true_false:
-                if answer_text.lower() == "true":
-                    explanation_text = "The statement is correct."
-                else:
-                    explanation_text = "The statement is incorrect."
+                explanation_text = _TF_TRUE_EXPL if answer_text.lower() == "true" else _TF_FALSE_EXPL
                 embed.add_field(name="Explanation", value=explanation_text, inline=False)
         
         # Show correct responders with truncated usernames
@@ -1448,12 +1562,11 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
         else:
             embed.add_field(
                 name="Correct Responders",
-                value="No one answered correctly!",
+                value=_NO_CORRECT_TEXT,
                 inline=False
             )
         
-        # Show current standings
-        leaderboard = session.get_leaderboard(5)  # Top 5
+        # Show current standings (top 5)
         if leaderboard:
             leaderboard_text = []
             for i, entry in enumerate(leaderboard):
@@ -1468,79 +1581,77 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             )
         
         # Show progress
-        progress = session.get_progress_info()
         embed.set_footer(text=f"Question {progress['current']}/{progress['total']} | {progress['remaining']} questions remaining")
         
-        # Store message reference before editing (in case we need it)
-        original_message_id = getattr(session, 'current_question_message_id', None)
-        
         # Edit the original question message to show the answer reveal
         # This reduces clutter by replacing the question with the answer
         if session.is_private:
-            for user_id in session.participants:
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                    async with user.typing():
-                        await user.send(embed=embed)
-                except Exception as e:
-                    logger.error(f"Failed to send private answer to user {user_id}: {e}")
-            
+            # The embed is already built, so push it to every participant at once
+            users = await self._resolve_users(session.participants)
+            results = await asyncio.gather(
+                *(user.send(embed=embed) for user in users),
+                return_exceptions=True
+            )
+            for user, result in zip(users, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to send private answer to user {user.id}: {result}")
+
             # Also send a summary in the channel
             summary_embed = Embed(
                 title="Question Complete!",
                 description=f"Question {progress['current']}/{progress['total']} results have been sent to all participants via DM.",
                 color=Color.blue()
             )
-            async with ctx.typing():
-                await ctx.send(embed=summary_embed)
+            await ctx.send(embed=summary_embed)
         else:
             # Try to edit the original question message instead of sending a new one
-            if hasattr(session, 'current_question_message_id') and session.current_question_message_id:
+            original_message = getattr(session, 'current_question_message', None)
+            message_id = getattr(session, 'current_question_message_id', None)
+            if original_message or message_id:
                 try:
-                    # Get the channel where the message was sent
-                    channel = ctx.channel if hasattr(ctx, 'channel') else None
-                    if channel:
-                        # Fetch the original question message
-                        original_message = await channel.fetch_message(session.current_question_message_id)
+                    # Only fetch the message if we don't already hold it from when it was sent
+                    if original_message is None:
+                        channel = ctx.channel if hasattr(ctx, 'channel') else None
+                        if channel:
+                            original_message = await channel.fetch_message(message_id)
+                    
+                    if original_message:
                         # Edit it to show the answer (this will replace the timer and question)
-                        await original_message.edit(embed=embed)
-                        logger.info(f"Successfully edited question message {session.current_question_message_id} to show answer")
+                        if await self._edit_or_send(ctx, original_message, embed):
+                            logger.info(f"Successfully edited question message {original_message.id} to show answer")
                         
-                        # Clear the message ID since we've transformed it to an answer
+                        # Clear the message reference since we've transformed it to an answer
+                        session.current_question_message = None
                         session.current_question_message_id = None
                     else:
                         logger.warning("No channel available to fetch message for editing")
                         # Fall back to sending a new message
-                        async with ctx.typing():
-                            await ctx.send(embed=embed)
+                        await ctx.send(embed=embed)
                 except Exception as e:
                     logger.warning(f"Failed to edit original question message: {e}")
                     # Fall back to sending a new message if editing fails
-                    async with ctx.typing():
-                        await ctx.send(embed=embed)
+                    await ctx.send(embed=embed)
             else:
                 # No message ID stored, send a new message
                 logger.warning("No question message ID available for editing")
-                async with ctx.typing():
-                    await ctx.send(embed=embed)
+                await ctx.send(embed=embed)
+    
+    async def _ctx_send(self, ctx, content=None, embed=None):
+        """Send a message correctly based on context type (deferred interaction or regular context)."""
+        # Check if this is an Interaction context with followup
+        if hasattr(ctx, 'interaction') and ctx.interaction and hasattr(ctx.interaction, 'response') and ctx.interaction.response.is_done():
+            # This is a slash command that has already had its initial response (deferred)
+            return await ctx.followup.send(content=content, embed=embed)
+        elif hasattr(ctx, 'followup') and hasattr(ctx, 'responded') and ctx.responded:
+            # Direct interaction context with followup
+            return await ctx.followup.send(content=content, embed=embed)
+        else:
+            # Regular context or unresponded interaction
+            return await ctx.send(content=content, embed=embed)
     
     async def _end_trivia_session(self, ctx, session):
         """End a trivia session and show final results."""
         try:
-            # Helper function to send messages properly based on context type
-            async def send_message(content=None, embed=None):
-                """Helper function that handles sending messages correctly based on context type"""
-                # Check if this is an Interaction context with followup
-                if hasattr(ctx, 'interaction') and ctx.interaction and hasattr(ctx.interaction, 'response') and ctx.interaction.response.is_done():
-                    # This is a slash command that has already had its initial response (deferred)
-                    return await ctx.followup.send(content=content, embed=embed)
-                elif hasattr(ctx, 'followup') and hasattr(ctx, 'responded') and ctx.responded:
-                    # Direct interaction context with followup
-                    return await ctx.followup.send(content=content, embed=embed)
-                else:
-                    # Regular context or unresponded interaction
-                    return await ctx.send(content=content, embed=embed)
-                    
             if session.results_message_sent:
                 logger.info(f"Results for session {session.channel_id} already sent. Skipping duplicate send.")
                 # Still ensure session is cleaned up by the manager if it wasn't already
@@ -1552,9 +1663,12 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             session.is_active = False
             session.end_time = datetime.now()
             
-            # Calculate duration
-            duration = session.end_time - session.start_time
-            duration_seconds = duration.total_seconds()
+            # Calculate duration from the monotonic clock when available
+            start_monotonic = getattr(session, '_start_monotonic', None)
+            if start_monotonic is not None:
+                duration_seconds = time.monotonic() - start_monotonic
+            else:
+                duration_seconds = (session.end_time - session.start_time).total_seconds()
             minutes = int(duration_seconds // 60)
             seconds = int(duration_seconds % 60)
             duration_str = f"{minutes}m {seconds}s"
@@ -1564,11 +1678,23 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             if hasattr(session, 'provider_info') and session.provider_info:
                 provider_name = session.provider_info.get("provider_name", "Unknown").capitalize()
             
+            # Resolve members from the guild cache through one bound lookup
+            guild = ctx.guild
+            get_member = guild.get_member
+            host_member = get_member(session.host_id)
+            
+            # Quiz-wide values, identical for every participant row
+            questions = session.questions
+            total_q = len(questions)
+            q0 = questions[0] if questions else None
+            difficulty = getattr(q0, 'difficulty', 'unknown')
+            category = getattr(q0, 'category', 'unknown')
+            
             # Get final statistics
             quiz_stats = {
                 "host_id": session.host_id,
-                "host_name": ctx.guild.get_member(session.host_id).display_name if ctx.guild.get_member(session.host_id) else "Unknown",
-                "total_questions": len(session.questions),
+                "host_name": host_member.display_name if host_member else "Unknown",
+                "total_questions": total_q,
                 "duration": duration_seconds,
                 "duration_str": duration_str,
                 "provider": provider_name
@@ -1592,39 +1718,30 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
                         username = participant_data.get("username", "UnknownUser")
                         # Try to update username if it's 'UnknownUser' and we have a member object
                         if username == "UnknownUser":
-                            try:
-                                member = ctx.guild.get_member(user_id)
-                                if member:
-                                    username = member.display_name
-                                    logger.info(f"Updated 'UnknownUser' to actual Discord username: {username} for user ID {user_id}")
-                            except Exception as name_e:
-                                logger.warning(f"Failed to update username for user {user_id}: {name_e}")
-                        correct = participant_data.get("correct_answers", 0)
-                        wrong = participant_data.get("incorrect_answers", 0)
-                        points = participant_data.get("score", 0)
-                        difficulty = session.questions[0].difficulty if session.questions else "unknown"
-                        category = session.questions[0].category if session.questions else "unknown"
+                            member = get_member(user_id)
+                            if member:
+                                username = member.display_name
+                                logger.info(f"Updated 'UnknownUser' to actual Discord username: {username} for user ID {user_id}")
                         
                         batch_results_data.append({
                             'user_id': user_id,
                             'username': username,
-                            'correct': correct,
-                            'wrong': wrong,
-                            'points': points,
+                            'correct': participant_data.get("correct_answers", 0),
+                            'wrong': participant_data.get("incorrect_answers", 0),
+                            'points': participant_data.get("score", 0),
                             'difficulty': difficulty,
                             'category': category
                         })
                     except Exception as data_error:
                          logger.error(f"Error preparing data for user {user_id} in batch recording for quiz {db_quiz_id}: {data_error}", exc_info=True)
                 
-                # Call the batch recording function if we have data
+                # Record in the background so the results message isn't held up by the database
                 if batch_results_data:
-                    await record_batch_quiz_results(
-                        db_service=self.db_service,
+                    self._record_results_in_background(
                         quiz_id=db_quiz_id,
                         topic=session.topic,
                         results=batch_results_data,
-                        guild_id=ctx.guild.id if ctx.guild else None
+                        guild_id=guild.id if guild else None
                     )
                 else:
                     logger.warning(f"No participant data collected for batch recording in quiz {db_quiz_id}")
@@ -1635,7 +1752,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             # Check if message_router is available
             if not self.message_router:
                 logger.error("Message router not available in _end_trivia_session")
-                await send_message("❌ An error occurred while ending the trivia game. The session has been closed.")
+                await self._ctx_send(ctx, "❌ An error occurred while ending the trivia game. The session has been closed.")
                 # Ensure session is ended by manager even on error before sending results
                 self.group_quiz_manager.end_session(ctx.guild.id, ctx.channel.id) 
                 return
@@ -1646,18 +1763,23 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             # Show results - either privately to each participant and summarized to the channel, or just to the channel
             if session.is_private:
                 # Send detailed results to each participant
-                for user_id in session.participants:
-                    try:
-                        user = await self.bot.fetch_user(user_id)
-                        await self.message_router.send_quiz_results(
+                users = await self._resolve_users(session.participants)
+                results = await asyncio.gather(
+                    *(
+                        self.message_router.send_quiz_results(
                             destination=user,
                             topic=session.topic,
                             leaderboard=leaderboard,
                             quiz_stats=quiz_stats,
                             is_private=True
                         )
-                    except Exception as e:
-                        logger.error(f"Failed to send private results to user {user_id}: {e}")
+                        for user in users
+                    ),
+                    return_exceptions=True
+                )
+                for user, result in zip(users, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Failed to send private results to user {user.id}: {result}")
                 
                 # Also send a summary to the channel
                 await self.message_router.send_quiz_results(
@@ -1682,7 +1804,7 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
             
         except Exception as e:
             logger.error(f"Error ending trivia session: {e}")
-            await send_message("❌ An error occurred while ending the trivia game, but the session has been closed.")
+            await self._ctx_send(ctx, "❌ An error occurred while ending the trivia game, but the session has been closed.")
             # Ensure the session is ended even if there's an error
             self.group_quiz_manager.end_session(ctx.guild.id, ctx.channel.id)
     
@@ -1703,61 +1825,71 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
     async def _trivia_stop_impl(self, ctx):
         """Implementation of trivia stop that works with both command types."""
         try:
-            # Helper function to send messages properly based on context type
-            async def send_message(content=None, embed=None):
-                """Helper function that handles sending messages correctly based on context type"""
-                # Check if this is an Interaction context with followup
-                if hasattr(ctx, 'interaction') and ctx.interaction and hasattr(ctx.interaction, 'response') and ctx.interaction.response.is_done():
-                    # This is a slash command that has already had its initial response (deferred)
-                    return await ctx.followup.send(content=content, embed=embed)
-                elif hasattr(ctx, 'followup') and hasattr(ctx, 'responded') and ctx.responded:
-                    # Direct interaction context with followup
-                    return await ctx.followup.send(content=content, embed=embed)
-                else:
-                    # Regular context or unresponded interaction
-                    return await ctx.send(content=content, embed=embed)
-                    
             if not self.group_quiz_manager:
-                await send_message("❌ Group quiz manager is not initialized. Please try again later.")
+                await self._ctx_send(ctx, "❌ Group quiz manager is not initialized. Please try again later.")
                 logger.error("Group quiz manager not initialized in trivia_stop")
                 return
                 
             # Check if there's an active quiz in this channel
             active_session = self.group_quiz_manager.get_session(ctx.guild.id, ctx.channel.id)
             if not active_session or active_session.is_finished:
-                await send_message("❌ There's no active trivia game in this channel.")
+                await self._ctx_send(ctx, "❌ There's no active trivia game in this channel.")
                 return
             
             # Check if the user is the host or has manage channels permission
-            if ctx.author.id != active_session.host_id and not ctx.author.guild_permissions.manage_channels:
-                await send_message("❌ Only the host or a moderator can stop this trivia game.")
+            if not self._can_stop_session(ctx.author, active_session):
+                await self._ctx_send(ctx, "❌ Only the host or a moderator can stop this trivia game.")
                 return
             
-            # Set flags to prevent any future answer processing
-            active_session.is_active = False
-            active_session._timer_cancelled = True
+            # Flip the session to stopping so answers are ignored; a concurrent stop loses here
+            if not active_session.stop():
+                await self._ctx_send(ctx, "❌ There's no active trivia game in this channel.")
+                return
             
             # Don't end the session here directly - instead show results first
-            await send_message("✅ Trivia game stopped.")
-            
-            # Call the _end_trivia_session method to show results properly
-            try:
-                # This properly calculates stats and shows the leaderboard
-                await self._end_trivia_session(ctx, active_session)
-            except Exception as e:
-                logger.error(f"Error ending trivia session from stop command: {e}")
-                await send_message("❌ An error occurred while ending the trivia game, but the session has been closed.")
-                # Fallback if _end_trivia_session fails
-                self.group_quiz_manager.end_session(ctx.guild.id, ctx.channel.id)
+            await self._ctx_send(ctx, "✅ Trivia game stopped.")
+            
+            # Show results in the background so the command returns right after the ack
+            guild_id, channel_id = ctx.guild.id, ctx.channel.id
+            
+            def _on_done(task: asyncio.Task):
+                self._end_tasks.discard(task)
+                if not task.cancelled() and task.exception():
+                    logger.error(f"Error ending trivia session from stop command: {task.exception()}")
+                # Make sure the session is closed either way (end_session is idempotent)
+                self.group_quiz_manager.end_session(guild_id, channel_id)
+            
+            task = asyncio.create_task(self._end_trivia_session(ctx, active_session))
+            active_session.end_task = task
+            self._end_tasks.add(task)
+            task.add_done_callback(_on_done)
                 
         except Exception as e:
             logger.error(f"Error in trivia_stop command: {e}")
-            # Try to respond to the user regardless of the error
-            try:
-                await send_message("❌ An unexpected error occurred while stopping the trivia game.")
-            except Exception as final_error:
-                logger.error(f"Failed to send final error message: {final_error}")
-                pass
+    
+    def _can_stop_session(self, member, session) -> bool:
+        """Check whether a member may stop a session, caching the answer for the session's lifetime."""
+        allowed = session.stop_permissions.get(member.id)
+        if allowed is None:
+            # A configured quiz admin role is a direct role lookup; only walk every role's permissions without it
+            settings = self._get_cached_guild_settings(member.guild.id)
+            admin_role_id = settings.get("admin_role_id") if settings else None
+            allowed = (
+                (admin_role_id is not None and member.get_role(admin_role_id) is not None)
+                or member.guild_permissions.manage_channels
+            )
+            # Without the settings an admin role can't be ruled out, so only a yes is kept
+            if allowed or settings is not None:
+                session.stop_permissions[member.id] = allowed
+        return allowed
+    
+    def _get_cached_guild_settings(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Get the guild's settings if the guild preferences cog already has them cached, without fetching."""
+        prefs_cog = self.bot.get_cog("GuildPreferences")
+        if not prefs_cog:
+            # Without the cog no admin role is configured, so there is nothing to miss
+            return {}
+        return prefs_cog.get_cached_guild_settings(guild_id)
     
     # Hybrid command for trivia leaderboard
     @trivia_group.command(name="leaderboard", description="Show the leaderboard for the current trivia game")
@@ -1777,55 +1909,49 @@ class GroupQuizCog(commands.Cog, name="Group Quiz"):
         """Implementation of trivia leaderboard that works with both command types."""
         try:
             if not self.group_quiz_manager:
-                async with ctx.typing():
-                    await ctx.send("❌ Group quiz manager is not initialized. Please try again later.")
+                await ctx.send("❌ Group quiz manager is not initialized. Please try again later.")
                 logger.error("Group quiz manager not initialized in trivia_leaderboard")
                 return
                 
             # Check if there's an active quiz in this channel
             active_session = self.group_quiz_manager.get_session(ctx.guild.id, ctx.channel.id)
             if not active_session:
-                async with ctx.typing():
-                    await ctx.send("❌ There's no active trivia game in this channel.")
+                await ctx.send("❌ There's no active trivia game in this channel.")
+                return
+            
+            # Reuse the last embed if no scores have changed since it was built
+            cached_embed = active_session.get_cached_leaderboard_embed()
+            if cached_embed is not None:
+                await ctx.send(embed=cached_embed.copy())
                 return
             
-            # Get the leaderboard
-            leaderboard = active_session.get_leaderboard()
+            # Only the top 10 are shown, so avoid sorting every participant
+            leaderboard = active_session.get_top(10)
             
             if not leaderboard:
-                async with ctx.typing():
-                    await ctx.send("No participants in this trivia game yet.")
+                await ctx.send("No participants in this trivia game yet.")
                 return
                 
-            # Create an embed with the leaderboard
+            # Build all entries into the description rather than one field per player
+            body = "\n".join(
+                _LB_ROW({"i": i, "u": e["username"], "s": e["score"], "c": e.get("correct", 0), "w": e.get("incorrect", 0)})
+                for i, e in enumerate(leaderboard, 1)
+            )
             embed = create_embed(
                 title="📊 Trivia Leaderboard",
-                description=f"Current standings for trivia on topic **{active_session.topic}**",
+                description=f"Current standings for trivia on topic **{active_session.topic}**\n\n{body}",
                 color=Color.blue()
             )
             
-            # Add leaderboard entries
-            for i, entry in enumerate(leaderboard[:10], 1):
-                username = entry["username"]
-                score = entry["score"]
-                correct = entry.get("correct", 0)
-                wrong = entry.get("incorrect", 0)
-                
-                embed.add_field(
-                    name=f"{i}. {username}",
-                    value=f"Score: **{score}** points\nCorrect: {correct} | Wrong: {wrong}",
-                    inline=False
-                )
+            active_session.cache_leaderboard_embed(embed)
             
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed.copy())
             
         except Exception as e:
             logger.error(f"Error in trivia_leaderboard command: {e}")
             # Try to respond to the user regardless of the error
             try:
-                async with ctx.typing():
-                    await ctx.send("❌ An unexpected error occurred while getting the leaderboard.")
+                await ctx.send("❌ An unexpected error occurred while getting the leaderboard.")
             except:
                 pass
 async def setup(bot):
@@ -1,149 +1,318 @@
 """Guild-specific preference management commands."""
 
+import asyncio
 import discord
+from collections import OrderedDict
 from discord import app_commands
 from discord.ext import commands
-from typing import List, Dict, Optional, Any, Literal
+from typing import List, Dict, Optional, Any, Literal, Tuple, Set
 import logging
 
 from cogs.base_cog import BaseCog
 from cogs.utils.embeds import create_base_embed, create_success_embed, create_error_embed
 
+# Maximum number of guilds whose settings are kept in memory
+MAX_CACHED_GUILD_SETTINGS = 1024
 
-class GuildPreferencesCog(BaseCog):
+# Error replies shared by the settings commands
+_ERR_NO_DB = "❌ Database service is not available."
+_ERR_SET_QUIZ_CHANNEL = "❌ Failed to set quiz channel."
+_ERR_SET_TRIVIA_CHANNEL = "❌ Failed to set trivia channel."
+_ERR_SET_ADMIN_ROLE = "❌ Failed to set admin role."
+_ERR_VIEW_SETTINGS = "❌ Failed to retrieve guild settings."
+_ERR_ENABLE_FEATURE = "❌ Failed to enable feature."
+_ERR_DISABLE_FEATURE = "❌ Failed to disable feature."
+
+
+class GuildSettingsWriter:
+    """Coalesces guild setting writes and flushes them to the database in per-guild batches."""
+    
+    def __init__(self, db_service, logger: logging.Logger, flush_interval: float = 0.5, max_pending: int = 8):
+        """Initialize the writer for the given database service."""
+        self.db_service = db_service
+        self.logger = logger
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        # guild_id -> future resolved with whether the guild's next batch was saved
+        self._waiters: Dict[int, asyncio.Future] = {}
+        # guild_id -> batch currently being written
+        self._inflight: Dict[int, Dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, guild_id: int, setting_key: str, setting_value: Any) -> asyncio.Future:
+        """Queue a setting write and return a future that resolves with whether its batch was saved.
+        
+        Later writes to the same key replace earlier ones.
+        """
+        pending = self._pending.setdefault(guild_id, {})
+        pending[setting_key] = setting_value
+        waiter = self._waiters.get(guild_id)
+        if waiter is None:
+            waiter = self._waiters[guild_id] = asyncio.get_running_loop().create_future()
+        
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if len(pending) >= self.max_pending:
+            self._wakeup.set()
+        return waiter
+    
+    def queued_settings(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Get the settings queued or being written for a guild, or None if there are none."""
+        inflight = self._inflight.get(guild_id)
+        pending = self._pending.get(guild_id)
+        if inflight is None and pending is None:
+            return None
+        return {**(inflight or {}), **(pending or {})}
+    
+    async def _run(self) -> None:
+        """Flush pending writes every interval until nothing is left to write."""
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """Write every pending setting, one batch per guild, and report each batch's outcome."""
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, {}
+        for guild_id, settings in pending.items():
+            success = False
+            self._inflight[guild_id] = settings
+            try:
+                success = await self.db_service.set_guild_settings_bulk(guild_id=guild_id, settings=settings)
+                if not success:
+                    self.logger.error(f"Failed to save settings {list(settings)} for guild {guild_id}")
+            except Exception as e:
+                self.logger.error(f"Error saving settings for guild {guild_id}: {e}")
+            finally:
+                self._inflight.pop(guild_id, None)
+                waiter = waiters.get(guild_id)
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(bool(success))
+    
+    async def close(self) -> None:
+        """Write anything still pending and let the background flusher finish."""
+        if self._task and not self._task.done():
+            # Flush right away instead of cancelling a batch that may be mid-write
+            self._wakeup.set()
+            await self._task
+        await self.flush()
+
+
+class GuildPreferencesCog(BaseCog, name="GuildPreferences"):
     """Guild-specific preference management commands."""
     
+    # Feature flags shown in the settings view, in display order
+    _FEATURE_LABELS = (
+        ("feature_group_quiz", "✅ Group Quizzes"),
+        ("feature_custom_quiz", "✅ Custom Quizzes"),
+        ("feature_leaderboard", "✅ Leaderboards")
+    )
+    
+    # Display names for the feature choices accepted by enable/disable
+    _FEATURE_DISPLAY = {
+        "group_quiz": "Group Quizzes",
+        "custom_quiz": "Custom Quizzes",
+        "leaderboard": "Leaderboards",
+        "auto_quiz": "Auto Quiz Mode"
+    }
+    
     def __init__(self, bot: commands.Bot):
         """Initialize the guild preferences cog."""
         super().__init__(bot, name="GuildPreferences")
+        self._settings_writer: Optional[GuildSettingsWriter] = None
+        # guild_id -> (version, settings), least recently used first
+        self._settings_cache: "OrderedDict[int, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._settings_version: Dict[int, int] = {}
+        # Replies reporting failed setting writes, kept so they aren't garbage collected
+        self._report_tasks: Set[asyncio.Task] = set()
+    
+    async def cog_unload(self) -> None:
+        """Flush any queued setting writes before the cog goes away."""
+        if self._settings_writer:
+            await self._settings_writer.close()
+        await super().cog_unload()
+    
+    def _get_settings_writer(self) -> GuildSettingsWriter:
+        """Get the settings writer, creating it once the database service is available."""
+        if self._settings_writer is None:
+            self._settings_writer = GuildSettingsWriter(self.db_service, self.logger)
+        return self._settings_writer
+    
+    async def get_guild_settings(self, guild_id: int) -> Dict[str, Any]:
+        """Get guild settings, only hitting the database when the cached copy is stale."""
+        version = self._settings_version.get(guild_id, 0)
+        cached = self._settings_cache.get(guild_id)
+        if cached is not None and cached[0] == version:
+            self._settings_cache.move_to_end(guild_id)
+            return cached[1]
+        
+        writer = self._settings_writer
+        queued_before = writer is not None and writer.queued_settings(guild_id) is not None
+        settings = await self.db_service.get_guild_settings(guild_id)
+        
+        # Writes still queued may not have reached the database, so show them on top of
+        # the fetched copy but don't cache it
+        queued = writer.queued_settings(guild_id) if writer is not None else None
+        if queued is not None:
+            return {**settings, **queued}
+        if queued_before:
+            return settings
+        
+        # A write during the fetch bumps the version, so this copy is refetched next time
+        self._settings_cache[guild_id] = (version, settings)
+        self._settings_cache.move_to_end(guild_id)
+        if len(self._settings_cache) > MAX_CACHED_GUILD_SETTINGS:
+            evicted_id, _ = self._settings_cache.popitem(last=False)
+            self._settings_version.pop(evicted_id, None)
+        return settings
+    
+    def get_cached_guild_settings(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Get a guild's settings only if a current copy is cached, without touching the database."""
+        version = self._settings_version.get(guild_id, 0)
+        cached = self._settings_cache.get(guild_id)
+        if cached is None or cached[0] != version:
+            return None
+        return cached[1]
+    
+    def _save_setting(self, ctx: commands.Context, setting_key: str, setting_value: Any, error_message: str) -> None:
+        """Queue a setting write without waiting for its batch.
+        
+        The command replies straight away; if the batch later fails, the cached
+        change is dropped and ``error_message`` is sent to the command's channel.
+        """
+        guild_id = ctx.guild.id
+        saved = self._get_settings_writer().enqueue(guild_id, setting_key, setting_value)
+        self._update_cached_setting(guild_id, setting_key, setting_value)
+        
+        def _on_saved(future: asyncio.Future) -> None:
+            if future.cancelled() or future.result():
+                return
+            self._discard_cached_settings(guild_id)
+            task = asyncio.create_task(ctx.send(error_message))
+            self._report_tasks.add(task)
+            task.add_done_callback(self._report_tasks.discard)
+        
+        saved.add_done_callback(_on_saved)
+    
+    def _discard_cached_settings(self, guild_id: int) -> None:
+        """Drop a guild's cached settings so the next read refetches them."""
+        self._settings_version[guild_id] = self._settings_version.get(guild_id, 0) + 1
+        self._settings_cache.pop(guild_id, None)
+    
+    def _update_cached_setting(self, guild_id: int, setting_key: str, setting_value: Any) -> None:
+        """Apply a setting change to the cached copy and bump the guild's settings version."""
+        version = self._settings_version.get(guild_id, 0) + 1
+        self._settings_version[guild_id] = version
+        cached = self._settings_cache.get(guild_id)
+        if cached is not None:
+            cached[1][setting_key] = setting_value
+            self._settings_cache[guild_id] = (version, cached[1])
     
     @commands.hybrid_group(name="guild", description="Guild-specific settings and preferences")
     @commands.has_permissions(manage_guild=True)
     async def guild_group(self, ctx: commands.Context):
         """Guild preferences group command."""
         if ctx.invoked_subcommand is None:
-            async with ctx.typing():
-                await ctx.send_help(ctx.command)
+            await ctx.send_help(ctx.command)
     
     @guild_group.command(name="set_quiz_channel", description="Set the default quiz channel")
     @app_commands.describe(channel="The channel where quiz messages should be sent")
     async def set_quiz_channel(self, ctx: commands.Context, channel: discord.TextChannel):
         """Set the default quiz channel for this guild."""
         if not self.db_service:
-            async with ctx.typing():
-                await ctx.send("❌ Database service is not available.")
+            await ctx.send(_ERR_NO_DB)
             return
         
         try:
-            # Save to guild settings
-            await self.db_service.set_guild_setting(
-                guild_id=ctx.guild.id,
-                setting_key="quiz_channel_id",
-                setting_value=str(channel.id)
-            )
+            # Save to guild settings, batched with other writes; a failed batch is reported afterwards
+            self._save_setting(ctx, "quiz_channel_id", channel.id, _ERR_SET_QUIZ_CHANNEL)
             
             embed = create_success_embed(
                 title="Quiz Channel Set",
                 description=f"Default quiz channel set to {channel.mention}"
             )
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
             
         except Exception as e:
             self.logger.error(f"Error setting quiz channel: {e}")
-            async with ctx.typing():
-                await ctx.send("❌ Failed to set quiz channel.")
+            await ctx.send(_ERR_SET_QUIZ_CHANNEL)
     
     @guild_group.command(name="set_trivia_channel", description="Set the default trivia channel")
     @app_commands.describe(channel="The channel where trivia games should run")
     async def set_trivia_channel(self, ctx: commands.Context, channel: discord.TextChannel):
         """Set the default trivia channel for this guild."""
         if not self.db_service:
-            async with ctx.typing():
-                await ctx.send("❌ Database service is not available.")
+            await ctx.send(_ERR_NO_DB)
             return
         
         try:
-            await self.db_service.set_guild_setting(
-                guild_id=ctx.guild.id,
-                setting_key="trivia_channel_id",
-                setting_value=str(channel.id)
-            )
+            # Save to guild settings, batched with other writes; a failed batch is reported afterwards
+            self._save_setting(ctx, "trivia_channel_id", channel.id, _ERR_SET_TRIVIA_CHANNEL)
             
             embed = create_success_embed(
                 title="Trivia Channel Set",
                 description=f"Default trivia channel set to {channel.mention}"
             )
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
             
         except Exception as e:
             self.logger.error(f"Error setting trivia channel: {e}")
-            async with ctx.typing():
-                await ctx.send("❌ Failed to set trivia channel.")
+            await ctx.send(_ERR_SET_TRIVIA_CHANNEL)
     
     @guild_group.command(name="set_admin_role", description="Set the quiz admin role")
     @app_commands.describe(role="The role that can manage quiz settings")
     async def set_admin_role(self, ctx: commands.Context, role: discord.Role):
         """Set the admin role for quiz management in this guild."""
         if not self.db_service:
-            async with ctx.typing():
-                await ctx.send("❌ Database service is not available.")
+            await ctx.send(_ERR_NO_DB)
             return
         
         try:
-            await self.db_service.set_guild_setting(
-                guild_id=ctx.guild.id,
-                setting_key="admin_role_id",
-                setting_value=str(role.id)
-            )
+            # Save to guild settings, batched with other writes; a failed batch is reported afterwards
+            self._save_setting(ctx, "admin_role_id", role.id, _ERR_SET_ADMIN_ROLE)
             
             embed = create_success_embed(
                 title="Admin Role Set",
                 description=f"Quiz admin role set to {role.mention}"
             )
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
             
         except Exception as e:
             self.logger.error(f"Error setting admin role: {e}")
-            async with ctx.typing():
-                await ctx.send("❌ Failed to set admin role.")
+            await ctx.send(_ERR_SET_ADMIN_ROLE)
     
     @guild_group.command(name="settings", description="View current guild settings")
     async def view_settings(self, ctx: commands.Context):
         """View current guild settings."""
         if not self.db_service:
-            async with ctx.typing():
-                await ctx.send("❌ Database service is not available.")
+            await ctx.send(_ERR_NO_DB)
             return
         
         try:
-            settings = await self.db_service.get_guild_settings(ctx.guild.id)
+            guild = ctx.guild
+            settings = await self.get_guild_settings(guild.id)
             
             embed = create_base_embed(
-                title=f"⚙️ Settings for {ctx.guild.name}",
+                title=f"⚙️ Settings for {guild.name}",
                 description="Current guild configuration"
             )
             
-            embed.set_thumbnail(url=ctx.guild.icon.url if ctx.guild.icon else None)
-            
-            # Channel settings
-            channel_settings = []
-            
-            quiz_channel_id = settings.get("quiz_channel_id")
-            if quiz_channel_id:
-                channel = ctx.guild.get_channel(int(quiz_channel_id))
-                channel_settings.append(f"**Quiz Channel:** {channel.mention if channel else 'Not set'}")
-            else:
-                channel_settings.append("**Quiz Channel:** Not set")
+            embed.set_thumbnail(url=guild.icon.url if guild.icon else None)
             
-            trivia_channel_id = settings.get("trivia_channel_id")
-            if trivia_channel_id:
-                channel = ctx.guild.get_channel(int(trivia_channel_id))
-                channel_settings.append(f"**Trivia Channel:** {channel.mention if channel else 'Not set'}")
-            else:
-                channel_settings.append("**Trivia Channel:** Not set")
+            # Channel settings (IDs are cached as ints; unset IDs resolve to None)
+            quiz_channel, trivia_channel = (
+                guild.get_channel(settings.get(key)) for key in ("quiz_channel_id", "trivia_channel_id")
+            )
+            channel_settings = [
+                f"**Quiz Channel:** {quiz_channel.mention if quiz_channel else 'Not set'}",
+                f"**Trivia Channel:** {trivia_channel.mention if trivia_channel else 'Not set'}"
+            ]
             
             embed.add_field(
                 name="📺 Channel Settings",
@@ -152,14 +321,8 @@ class GuildPreferencesCog(BaseCog):
             )
             
             # Role settings
-            role_settings = []
-            
-            admin_role_id = settings.get("admin_role_id")
-            if admin_role_id:
-                role = ctx.guild.get_role(int(admin_role_id))
-                role_settings.append(f"**Admin Role:** {role.mention if role else 'Not set'}")
-            else:
-                role_settings.append("**Admin Role:** Not set")
+            admin_role = guild.get_role(settings.get("admin_role_id"))
+            role_settings = [f"**Admin Role:** {admin_role.mention if admin_role else 'Not set'}"]
             
             embed.add_field(
                 name="👥 Role Settings",
@@ -168,13 +331,7 @@ class GuildPreferencesCog(BaseCog):
             )
             
             # Feature flags
-            feature_flags = []
-            if settings.get("feature_group_quiz", True):
-                feature_flags.append("✅ Group Quizzes")
-            if settings.get("feature_custom_quiz", True):
-                feature_flags.append("✅ Custom Quizzes")
-            if settings.get("feature_leaderboard", True):
-                feature_flags.append("✅ Leaderboards")
+            feature_flags = [label for key, label in self._FEATURE_LABELS if settings.get(key, True)]
             
             embed.add_field(
                 name="🚀 Features",
@@ -182,13 +339,11 @@ class GuildPreferencesCog(BaseCog):
                 inline=False
             )
             
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
             
         except Exception as e:
             self.logger.error(f"Error viewing settings: {e}")
-            async with ctx.typing():
-                await ctx.send("❌ Failed to retrieve guild settings.")
+            await ctx.send(_ERR_VIEW_SETTINGS)
     
     @guild_group.command(name="enable_feature", description="Enable a bot feature")
     @app_commands.describe(feature="The feature to enable")
@@ -201,29 +356,23 @@ class GuildPreferencesCog(BaseCog):
     async def enable_feature(self, ctx: commands.Context, feature: str):
         """Enable a specific feature for this guild."""
         if not self.db_service:
-            async with ctx.typing():
-                await ctx.send("❌ Database service is not available.")
+            await ctx.send(_ERR_NO_DB)
             return
         
         try:
-            await self.db_service.set_guild_setting(
-                guild_id=ctx.guild.id,
-                setting_key=f"feature_{feature}",
-                setting_value="true"
-            )
+            # Save to guild settings, batched with other writes; a failed batch is reported afterwards
+            self._save_setting(ctx, f"feature_{feature}", True, _ERR_ENABLE_FEATURE)
             
-            feature_name = feature.replace("_", " ").title()
+            feature_name = self._FEATURE_DISPLAY.get(feature) or feature.replace("_", " ").title()
             embed = create_success_embed(
                 title="Feature Enabled",
                 description=f"✅ {feature_name} has been enabled for this guild."
             )
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
             
         except Exception as e:
             self.logger.error(f"Error enabling feature: {e}")
-            async with ctx.typing():
-                await ctx.send("❌ Failed to enable feature.")
+            await ctx.send(_ERR_ENABLE_FEATURE)
     
     @guild_group.command(name="disable_feature", description="Disable a bot feature")
     @app_commands.describe(feature="The feature to disable")
@@ -236,29 +385,23 @@ class GuildPreferencesCog(BaseCog):
     async def disable_feature(self, ctx: commands.Context, feature: str):
         """Disable a specific feature for this guild."""
         if not self.db_service:
-            async with ctx.typing():
-                await ctx.send("❌ Database service is not available.")
+            await ctx.send(_ERR_NO_DB)
             return
         
         try:
-            await self.db_service.set_guild_setting(
-                guild_id=ctx.guild.id,
-                setting_key=f"feature_{feature}",
-                setting_value="false"
-            )
+            # Save to guild settings, batched with other writes; a failed batch is reported afterwards
+            self._save_setting(ctx, f"feature_{feature}", False, _ERR_DISABLE_FEATURE)
             
-            feature_name = feature.replace("_", " ").title()
+            feature_name = self._FEATURE_DISPLAY.get(feature) or feature.replace("_", " ").title()
             embed = create_success_embed(
                 title="Feature Disabled",
                 description=f"❌ {feature_name} has been disabled for this guild."
             )
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
             
         except Exception as e:
             self.logger.error(f"Error disabling feature: {e}")
-            async with ctx.typing():
-                await ctx.send("❌ Failed to disable feature.")
+            await ctx.send(_ERR_DISABLE_FEATURE)
 
 
 async def setup(bot: commands.Bot):
@@ -3,12 +3,133 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional, List, Union, Dict
+from typing import Optional, List, Union, Dict, Any
+from difflib import get_close_matches
+from operator import attrgetter
+from weakref import WeakKeyDictionary
 import asyncio
+import logging
 
 from cogs.base_cog import BaseCog
 from utils.ui import create_embed
 
+# Category display order in the dropdown and the all-commands embed
+CATEGORY_ORDER = ("Quiz Commands", "Data & Analytics", "User Commands", "Admin Commands", "Owner Commands", "Other Commands")
+
+# Category name -> (emoji, dropdown description, category embed description)
+CATEGORY_META = {
+    "Quiz Commands": ("🎯", "All quiz-related commands", "Commands for starting and managing quizzes"),
+    "Data & Analytics": ("📊", "Stats, leaderboards, and analytics", "View statistics, leaderboards, history, and analytics"),
+    "User Commands": ("👤", "Preferences and user features", "Commands for preferences and user features"),
+    "Admin Commands": ("⚙️", "Server administration commands", "Commands for server administration"),
+    "Owner Commands": ("👑", "Bot owner only commands", "Commands restricted to the bot owner"),
+}
+
+# Fallback for any other category; the dropdown shows its command count instead
+OTHER_CATEGORY_META = ("📂", None, "Miscellaneous commands")
+
+# Discord's limit on an embed field value
+MAX_FIELD_LENGTH = 1024
+
+# Marks "not cached yet" where None is a valid cached value
+_SENTINEL = object()
+
+
+# Static help pages, kept as embed dicts and turned into embeds with Embed.from_dict
+_GUIDE_EMBED_DICT = {
+    "title": "📖 Commands Guide",
+    "description": "Learn how to use the bot effectively!",
+    "color": discord.Color.green().value,
+    "fields": [
+        {
+            "name": "🎮 Getting Started",
+            "value": (
+                "1. Use `!quiz start <topic>` to start a solo quiz\n"
+                "2. Use `!trivia start <topic>` for group trivia\n"
+                "3. Answer questions using reactions or text\n"
+                "4. Track your progress with `!stats`\n"
+                "5. Compete on the `!leaderboard`"
+            ),
+            "inline": False
+        },
+        {
+            "name": "📝 Command Syntax",
+            "value": (
+                "• `<required>` - Required parameter\n"
+                "• `[optional]` - Optional parameter\n"
+                "• `...` - Multiple parameters allowed\n"
+                "• `command*` - Command group with subcommands"
+            ),
+            "inline": False
+        },
+        {
+            "name": "🎯 Popular Commands",
+            "value": (
+                "• `!quiz start <topic>` - Start a quiz session\n"
+                "• `!trivia start <topic>` - Start group trivia\n"
+                "• `!trivia stop` - Stop current trivia\n"
+                "• `!stats` - View your statistics\n"
+                "• `!preferences` - Set your preferences\n"
+                "• `!leaderboard` - View server rankings\n"
+                "• `!help <command>` - Get detailed help"
+            ),
+            "inline": False
+        },
+    ],
+}
+
+_SUPPORT_EMBED_DICT = {
+    "title": "❓ Support",
+    "description": "Need help or have questions?",
+    "color": discord.Color.gold().value,
+    "fields": [
+        {
+            "name": "🐛 Report Issues",
+            "value": (
+                "Found a bug? Let us know!\n"
+                "• Use `!feedback` command\n"
+                "• Contact server admins\n"
+                "• Check pinned messages"
+            ),
+            "inline": False
+        },
+        {
+            "name": "💡 Feature Requests",
+            "value": (
+                "Have an idea for improvement?\n"
+                "• Use `!suggest` command\n"
+                "• Discuss in general chat\n"
+                "• Vote on community polls"
+            ),
+            "inline": False
+        },
+        {
+            "name": "🔗 Useful Links",
+            "value": (
+                "• [Getting Started Guide](https://github.com/anthropics/claude-code/issues)\n"
+                "• [Command Reference](https://docs.anthropic.com/en/docs/claude-code)\n"
+                "• Join our support server for help!"
+            ),
+            "inline": False
+        },
+    ],
+}
+
+
+def _embed_from_template(template: Dict[str, Any]) -> discord.Embed:
+    """Build an embed from a template dict without sharing its mutable field data."""
+    data = dict(template)
+    data["fields"] = [dict(field) for field in template.get("fields", ())]
+    return discord.Embed.from_dict(data)
+
+
+def _command_display(command: commands.Command) -> str:
+    """Format a command name for the all-commands listing."""
+    if isinstance(command, commands.Group):
+        return f"`{command.name}*`"
+    # Show full qualified name for subcommands
+    return f"`{command.qualified_name}`" if command.parent else f"`{command.name}`"
+
 
 class SelectCategory(discord.ui.Select):
     """Dropdown menu for selecting command categories."""
@@ -16,30 +137,10 @@ class SelectCategory(discord.ui.Select):
     def __init__(self, categories: Dict[str, List[commands.Command]]):
         options = []
         
-        # Define the order of categories
-        category_order = ["Quiz Commands", "Data & Analytics", "User Commands", "Admin Commands", "Owner Commands", "Other Commands"]
-        
-        for category_name in category_order:
+        for category_name in CATEGORY_ORDER:
             if category_name in categories and categories[category_name]:
-                # Get description based on category
-                if category_name == "Quiz Commands":
-                    desc = "All quiz-related commands"
-                    emoji = "🎯"
-                elif category_name == "Data & Analytics":
-                    desc = "Stats, leaderboards, and analytics"
-                    emoji = "📊"
-                elif category_name == "User Commands":
-                    desc = "Preferences and user features"
-                    emoji = "👤"
-                elif category_name == "Admin Commands":
-                    desc = "Server administration commands"
-                    emoji = "⚙️"
-                elif category_name == "Owner Commands":
-                    desc = "Bot owner only commands"
-                    emoji = "👑"
-                else:
-                    desc = f"{len(categories[category_name])} commands"
-                    emoji = "📂"
+                emoji, desc, _ = CATEGORY_META.get(category_name, OTHER_CATEGORY_META)
+                desc = desc or f"{len(categories[category_name])} commands"
                 
                 options.append(discord.SelectOption(
                     label=category_name,
@@ -61,109 +162,130 @@ class SelectCategory(discord.ui.Select):
             max_values=1,
             options=options[:25]  # Discord limit
         )
-        self.categories = categories
+    
+    @property
+    def categories(self) -> Dict[str, List[commands.Command]]:
+        """Categories held by the parent view, so only one reference is kept."""
+        return (self.view.categories if self.view else None) or {}
     
     async def callback(self, interaction: discord.Interaction):
         """Handle category selection."""
         view: HelpView = self.view
         selected = self.values[0]
+        # Acknowledge first so building the embed can't run past the 3 second interaction window
+        await interaction.response.defer()
         
-        # Create a new dropdown with the selected option as default
-        new_dropdown = SelectCategory(self.categories)
-        for option in new_dropdown.options:
+        # Mark the selected option as default in place; the dropdown is already on the view
+        for option in self.options:
             option.default = (option.label == selected)
         
-        # Replace the old dropdown with the new one
-        view.clear_items()
-        view.add_item(new_dropdown)
-        
-        # Re-add the buttons in the correct order
-        for item in [view.guide_button, view.support_button, view.main_menu_button, view.close_button]:
-            view.add_item(item)
-        
         if selected == "All Commands":
             embed = view.cog.create_all_commands_embed(self.categories)
         else:
             commands_list = self.categories.get(selected, [])
             embed = view.cog.create_category_embed(selected, commands_list)
         
-        await interaction.response.edit_message(embed=embed, view=view)
+        await interaction.edit_original_response(embed=embed, view=view)
+
+
+class GuideButton(discord.ui.Button):
+    """Button that shows the commands guide."""
+    
+    def __init__(self):
+        super().__init__(label="Commands Guide", emoji="📖", style=discord.ButtonStyle.primary)
+    
+    async def callback(self, interaction: discord.Interaction):
+        view: HelpView = self.view
+        await interaction.response.defer()
+        embed = view.cog.create_guide_embed()
+        await interaction.edit_original_response(embed=embed, view=view)
+
+
+class SupportButton(discord.ui.Button):
+    """Button that shows support information."""
+    
+    def __init__(self):
+        super().__init__(label="Support", emoji="❓", style=discord.ButtonStyle.secondary)
+    
+    async def callback(self, interaction: discord.Interaction):
+        view: HelpView = self.view
+        await interaction.response.defer()
+        embed = view.cog.create_support_embed()
+        await interaction.edit_original_response(embed=embed, view=view)
+
+
+class MainMenuButton(discord.ui.Button):
+    """Button that returns to the main help page."""
+    
+    def __init__(self):
+        super().__init__(label="Main Menu", emoji="🏠", style=discord.ButtonStyle.success)
+    
+    async def callback(self, interaction: discord.Interaction):
+        view: HelpView = self.view
+        await interaction.response.defer()
+        embed = view.cog.create_main_embed()
+        await interaction.edit_original_response(embed=embed, view=view)
+
+
+class CloseButton(discord.ui.Button):
+    """Button that deletes the help menu."""
+    
+    def __init__(self):
+        super().__init__(label="Close", emoji="❌", style=discord.ButtonStyle.danger)
+    
+    async def callback(self, interaction: discord.Interaction):
+        view: HelpView = self.view
+        await interaction.response.defer()
+        await interaction.delete_original_response()
+        view.stop()
 
 
 class HelpView(discord.ui.View):
     """Interactive view for help command."""
     
     def __init__(self, cog: 'HelpCog', categories: Dict[str, List[commands.Command]], author_id: int):
-        # Set timeout to None for persistent view
-        super().__init__(timeout=None)
+        # Time out so finished menus don't stay registered for the life of the bot
+        super().__init__(timeout=300)
         self.cog = cog
         self.bot = cog.bot
         self.categories = categories
         self.author_id = author_id
-        
-        # Create buttons first so they can be referenced
-        self.guide_button = self.GuideButton()
-        self.support_button = self.SupportButton()
-        self.main_menu_button = self.MainMenuButton()
-        self.close_button = self.CloseButton()
+        self.message: Optional[discord.Message] = None
         
         # Add category selector
         if categories:
             self.add_item(SelectCategory(categories))
         
-        # Add buttons
-        self.add_item(self.guide_button)
-        self.add_item(self.support_button)
-        self.add_item(self.main_menu_button)
-        self.add_item(self.close_button)
+        # Add buttons; each view needs its own item instances
+        for button in (GuideButton(), SupportButton(), MainMenuButton(), CloseButton()):
+            self.add_item(button)
     
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Ensure only the command author can use the buttons."""
         if interaction.user.id != self.author_id:
-            async with interaction.channel.typing():
-                await interaction.response.send_message(
-                    "This help menu is for another user. Use `/help` to open your own!",
-                    ephemeral=True
-                )
+            await interaction.response.send_message(
+                "This help menu is for another user. Use `/help` to open your own!",
+                ephemeral=True
+            )
             return False
         return True
     
-    class GuideButton(discord.ui.Button):
-        def __init__(self):
-            super().__init__(label="Commands Guide", emoji="📖", style=discord.ButtonStyle.primary)
-        
-        async def callback(self, interaction: discord.Interaction):
-            view: HelpView = self.view
-            embed = view.cog.create_guide_embed()
-            await interaction.response.edit_message(embed=embed, view=view)
-    
-    class SupportButton(discord.ui.Button):
-        def __init__(self):
-            super().__init__(label="Support", emoji="❓", style=discord.ButtonStyle.secondary)
-        
-        async def callback(self, interaction: discord.Interaction):
-            view: HelpView = self.view
-            embed = view.cog.create_support_embed()
-            await interaction.response.edit_message(embed=embed, view=view)
-    
-    class MainMenuButton(discord.ui.Button):
-        def __init__(self):
-            super().__init__(label="Main Menu", emoji="🏠", style=discord.ButtonStyle.success)
-        
-        async def callback(self, interaction: discord.Interaction):
-            view: HelpView = self.view
-            embed = view.cog.create_main_embed()
-            await interaction.response.edit_message(embed=embed, view=view)
-    
-    class CloseButton(discord.ui.Button):
-        def __init__(self):
-            super().__init__(label="Close", emoji="❌", style=discord.ButtonStyle.danger)
-        
-        async def callback(self, interaction: discord.Interaction):
-            view: HelpView = self.view
-            await interaction.response.defer()
-            await interaction.delete_original_response()
-            view.stop()
+    async def on_timeout(self) -> None:
+        """Disable the menu and drop references to the cog and categories."""
+        for item in self.children:
+            item.disabled = True
+        
+        # Try to update the message if possible
+        try:
+            if self.message:
+                await self.message.edit(view=self)
+        except Exception as e:
+            logging.getLogger("bot.help").warning(f"Failed to update help menu on timeout: {e}")
+        
+        self.categories = None
+        self.cog = None
+        self.bot = None
+        self.message = None
 
 
 class HelpCog(BaseCog):
@@ -200,56 +322,145 @@ class HelpCog(BaseCog):
     # Commands that should be in Data & Analytics
     DATA_COMMANDS = {'stats', 'leaderboard', 'history', 'analytics'}
     
+    # Lowercased user input -> category name (full names plus common shorthands)
+    _CATEGORY_ALIASES = {
+        **{name.lower(): name for name in CATEGORY_ORDER},
+        "quiz": "Quiz Commands",
+        "quizzes": "Quiz Commands",
+        "user": "User Commands",
+        "admin": "Admin Commands",
+        "owner": "Owner Commands",
+        "data": "Data & Analytics",
+        "analytics": "Data & Analytics",
+        "all": "All Commands",
+        "all commands": "All Commands",
+    }
+    
     def __init__(self, bot: commands.Bot):
         """Initialize the help cog."""
         super().__init__(bot, "Help")
         # Remove default help command if it exists
         bot.remove_command('help')
+        
+        # Owner ID resolved once from config (0 when unset, which matches no user)
+        self._owner_id: int = 0
+        
+        # Categories only differ between owner and non-owner, so cache both variants
+        self._category_cache: Dict[bool, Dict[str, List[commands.Command]]] = {}
+        self._cache_version = 0
+        self._cache_epoch: Optional[tuple] = None
+        # Embed dicts for built menu pages; callers always get a fresh embed
+        self._embed_cache: Dict[str, Dict[str, Any]] = {}
+        # Lowercased visible command name -> command name, for "did you mean" suggestions
+        self._lower_names: Optional[Dict[str, str]] = None
+        # Command -> example line parsed from its docstring (None if it has none)
+        self._example_cache: "WeakKeyDictionary[commands.Command, Optional[str]]" = WeakKeyDictionary()
+        # Command -> formatted usage signature
+        self._sig_cache: "WeakKeyDictionary[commands.Command, str]" = WeakKeyDictionary()
+        # Command -> listing text for the all-commands page, filled when categories are built
+        self._display_cache: "WeakKeyDictionary[commands.Command, str]" = WeakKeyDictionary()
+    
+    def set_context(self, context) -> None:
+        """Set the bot context and resolve the owner ID used for permission checks."""
+        super().set_context(context)
+        self._owner_id = (self.config.owner_id if self.config else None) or 0
+    
+    def _check_cache_epoch(self) -> None:
+        """Drop cached help data when cogs or commands have been added, removed or reloaded."""
+        epoch = (tuple(map(id, self.bot.cogs.values())), len(self.bot.all_commands))
+        if epoch != self._cache_epoch:
+            self._cache_epoch = epoch
+            self._cache_version += 1
+            self._category_cache.clear()
+            # The main page shows the command count
+            self._embed_cache.pop("main", None)
+            self._lower_names = None
+            self._sig_cache.clear()
+            self._display_cache.clear()
+    
+    def _cached_embed(self, key: str, builder) -> discord.Embed:
+        """Get a fresh copy of a cached embed, building it on first use."""
+        template = self._embed_cache.get(key)
+        if template is None:
+            template = self._embed_cache[key] = builder().to_dict()
+        # Embed.copy() is shallow and would share the cached field list
+        return _embed_from_template(template)
     
     def get_command_categories(self, ctx: commands.Context) -> Dict[str, List[commands.Command]]:
         """Organize commands into categories based on user permissions."""
+        user_is_owner = ctx.author.id == self._owner_id
+        self._check_cache_epoch()
+        cached = self._category_cache.get(user_is_owner)
+        if cached is not None:
+            return cached
+        
+        categories = self._build_categories(user_is_owner)
+        self._category_cache[user_is_owner] = categories
+        return categories
+    
+    def get_commands_for_category(self, ctx: commands.Context, category_name: str) -> List[commands.Command]:
+        """Get the commands in one category, without building the others on a cache miss."""
+        user_is_owner = ctx.author.id == self._owner_id
+        self._check_cache_epoch()
+        cached = self._category_cache.get(user_is_owner)
+        if cached is not None:
+            return cached.get(category_name, [])
+        return self._build_categories(user_is_owner, only=category_name).get(category_name, [])
+    
+    def _build_categories(self, user_is_owner: bool, only: Optional[str] = None) -> Dict[str, List[commands.Command]]:
+        """Sort visible commands into categories, optionally keeping just the ``only`` category."""
         categories = {}
-        user_is_owner = ctx.author.id == self.config.owner_id if self.config else False
         processed_commands = set()  # Track processed commands to avoid duplicates
         
+        # Class-level lookups hoisted into locals for the loop
+        hidden_commands = self.HIDDEN_COMMANDS
+        hidden_cogs = self.HIDDEN_COGS
+        owner_commands = self.OWNER_COMMANDS
+        data_commands = self.DATA_COMMANDS
+        cog_category_map = self.COG_CATEGORY_MAP
+        
         for command in self.bot.commands:
+            # qualified_name is rebuilt from the parent chain on every access, so read it once
+            qname = command.qualified_name
+            
             # Skip if already processed
-            if command.qualified_name in processed_commands:
+            if qname in processed_commands:
                 continue
                 
             # Skip hidden commands
             if command.hidden:
                 continue
             
+            name = command.name
+            
             # Skip explicitly hidden commands
-            if command.name in self.HIDDEN_COMMANDS:
+            if name in hidden_commands:
                 continue
             
             # Skip owner commands if user is not owner
-            if command.name in self.OWNER_COMMANDS and not user_is_owner:
+            if name in owner_commands and not user_is_owner:
                 continue
             
             # Skip commands from hidden cogs
-            if command.cog and command.cog.qualified_name in self.HIDDEN_COGS:
+            cog = command.cog
+            cog_name = cog.qualified_name if cog else None
+            if cog_name in hidden_cogs:
                 continue
             
             # Determine category
-            if command.name in self.OWNER_COMMANDS:
+            if name in owner_commands:
                 category = "Owner Commands"
-            elif command.name in self.DATA_COMMANDS:
+            elif name in data_commands:
                 category = "Data & Analytics"
-            elif command.cog:
-                cog_name = command.cog.qualified_name
-                # Try both the qualified name and the class name
-                if cog_name not in self.COG_CATEGORY_MAP:
-                    # Try the class name without "Cog" suffix
-                    cog_class_name = command.cog.__class__.__name__
-                    category = self.COG_CATEGORY_MAP.get(cog_class_name, self.COG_CATEGORY_MAP.get(cog_name, "Other Commands"))
-                else:
-                    category = self.COG_CATEGORY_MAP.get(cog_name, "Other Commands")
+            elif cog:
+                # Try the qualified name first, then the class name
+                category = cog_category_map.get(cog_name) or cog_category_map.get(type(cog).__name__, "Other Commands")
             else:
                 category = "Other Commands"
             
+            if only is not None and category != only:
+                continue
+            
             # Add to category
             if category not in categories:
                 categories[category] = []
@@ -257,16 +468,24 @@ class HelpCog(BaseCog):
             # For group commands, don't add the group itself, just its subcommands
             if isinstance(command, commands.Group):
                 for subcommand in command.commands:
-                    if not subcommand.hidden and subcommand.qualified_name not in processed_commands:
+                    if subcommand.hidden:
+                        continue
+                    sub_qname = subcommand.qualified_name
+                    if sub_qname not in processed_commands:
                         categories[category].append(subcommand)
-                        processed_commands.add(subcommand.qualified_name)
+                        processed_commands.add(sub_qname)
             else:
                 categories[category].append(command)
-                processed_commands.add(command.qualified_name)
+                processed_commands.add(qname)
         
-        # Sort commands within each category by qualified name
-        for category in categories:
-            categories[category].sort(key=lambda x: x.qualified_name)
+        # Sort commands within each category by qualified name (key= reads it once per command)
+        # and format their listing text now, so rendering is just a join
+        display_cache = self._display_cache
+        for commands_list in categories.values():
+            commands_list.sort(key=attrgetter("qualified_name"))
+            for command in commands_list:
+                if command not in display_cache:
+                    display_cache[command] = _command_display(command)
         
         return categories
     
@@ -290,49 +509,43 @@ class HelpCog(BaseCog):
             command = self.bot.get_command(entity)
             if command:
                 # Check if user can see this command
-                if command.name in self.OWNER_COMMANDS and ctx.author.id != (self.config.owner_id if self.config else None):
+                if command.name in self.OWNER_COMMANDS and ctx.author.id != self._owner_id:
                     embed = self.create_error_embed("You don't have permission to view this command.")
                 else:
                     embed = self.create_command_embed(command)
-                async with ctx.typing():
-                    await ctx.send(embed=embed)
+                await ctx.send(embed=embed)
                 return
             
-            # Check if it's a category
-            categories = self.get_command_categories(ctx)
-            entity_title = entity.title()
-            
-            # Map common variations
-            category_aliases = {
-                "Quiz": "Quiz Commands",
-                "Quizzes": "Quiz Commands",
-                "User": "User Commands",
-                "Admin": "Admin Commands",
-                "Owner": "Owner Commands",
-            }
-            
-            category_name = category_aliases.get(entity_title, entity_title)
-            
-            if category_name in categories:
-                embed = self.create_category_embed(category_name, categories[category_name])
-                async with ctx.typing():
-                    await ctx.send(embed=embed)
+            # Check if it's a category; categories are only built for a recognised name
+            category_name = self._CATEGORY_ALIASES.get(entity.lower())
+            if category_name == "All Commands":
+                await ctx.send(embed=self.create_all_commands_embed(self.get_command_categories(ctx)))
                 return
+            if category_name:
+                commands_list = self.get_commands_for_category(ctx, category_name)
+                if commands_list:
+                    embed = self.create_category_embed(category_name, commands_list)
+                    await ctx.send(embed=embed)
+                    return
             
             # Neither command nor category found
             embed = self.create_error_embed(f"No command or category named '{entity}' found.")
-            async with ctx.typing():
-                await ctx.send(embed=embed)
+            await ctx.send(embed=embed)
         else:
             # Show interactive help menu
             categories = self.get_command_categories(ctx)
             embed = self.create_main_embed()
             view = HelpView(self, categories, ctx.author.id)
-            async with ctx.typing():
-                await ctx.send(embed=embed, view=view)
+            view.message = await ctx.send(embed=embed, view=view)
     
     def create_main_embed(self) -> discord.Embed:
         """Create the main help embed."""
+        # Built lazily: bot.user is only known once the bot has logged in
+        self._check_cache_epoch()
+        return self._cached_embed("main", self._build_main_embed)
+    
+    def _build_main_embed(self) -> discord.Embed:
+        """Build the main help embed."""
         embed = create_embed(
             title="📚 Bot Help",
             description=(
@@ -341,7 +554,7 @@ class HelpCog(BaseCog):
                 "Use the dropdown menu below to explore different command categories, "
                 "or use the buttons for guides and support.\n\n"
                 f"**Prefix:** `{self.bot.command_prefix}`\n"
-                f"**Total Commands:** {len(list(self.bot.commands))}\n"
+                f"**Total Commands:** {len(self.bot.commands)}\n"
             ),
             color=discord.Color.blue()
         )
@@ -380,45 +593,29 @@ class HelpCog(BaseCog):
             color=discord.Color.blue()
         )
         
-        # Define the order of categories
-        category_order = ["Quiz Commands", "Data & Analytics", "User Commands", "Admin Commands", "Owner Commands", "Other Commands"]
-        
-        for category_name in category_order:
+        for category_name in CATEGORY_ORDER:
             if category_name not in categories or not categories[category_name]:
                 continue
             
             commands_list = categories[category_name]
             
-            # Format commands
-            cmd_texts = []
-            for cmd in commands_list:
-                if isinstance(cmd, commands.Group):
-                    cmd_texts.append(f"`{cmd.name}*`")
-                else:
-                    # Show full qualified name for subcommands
-                    if hasattr(cmd, 'parent') and cmd.parent:
-                        cmd_texts.append(f"`{cmd.qualified_name}`")
-                    else:
-                        cmd_texts.append(f"`{cmd.name}`")
-            
-            # Choose emoji based on category
-            if category_name == "Quiz Commands":
-                emoji = "🎯"
-            elif category_name == "Data & Analytics":
-                emoji = "📊"
-            elif category_name == "User Commands":
-                emoji = "👤"
-            elif category_name == "Admin Commands":
-                emoji = "⚙️"
-            elif category_name == "Owner Commands":
-                emoji = "👑"
-            else:
-                emoji = "📂"
+            emoji = CATEGORY_META.get(category_name, OTHER_CATEGORY_META)[0]
             
-            # Add field
-            cmd_text = " • ".join(cmd_texts)
-            if len(cmd_text) > 1024:
-                cmd_text = cmd_text[:1021] + "..."
+            # Add field, stopping at the field limit rather than joining everything and slicing
+            display_cache = self._display_cache
+            last = len(commands_list) - 1
+            parts = []
+            length = 0
+            for i, cmd in enumerate(commands_list):
+                display = display_cache.get(cmd) or _command_display(cmd)
+                new_length = length + (3 if parts else 0) + len(display)  # 3 = len(" • ")
+                # Unless this is the last entry, keep room for a trailing " • ..."
+                if new_length > MAX_FIELD_LENGTH or (i < last and new_length > MAX_FIELD_LENGTH - 6):
+                    parts.append("...")
+                    break
+                parts.append(display)
+                length = new_length
+            cmd_text = " • ".join(parts)
             
             embed.add_field(
                 name=f"{emoji} {category_name}",
@@ -431,25 +628,7 @@ class HelpCog(BaseCog):
     
     def create_category_embed(self, category_name: str, commands_list: List[commands.Command]) -> discord.Embed:
         """Create embed for a specific category."""
-        # Choose emoji based on category
-        if category_name == "Quiz Commands":
-            emoji = "🎯"
-            description = "Commands for starting and managing quizzes"
-        elif category_name == "Data & Analytics":
-            emoji = "📊"
-            description = "View statistics, leaderboards, history, and analytics"
-        elif category_name == "User Commands":
-            emoji = "👤"
-            description = "Commands for preferences and user features"
-        elif category_name == "Admin Commands":
-            emoji = "⚙️"
-            description = "Commands for server administration"
-        elif category_name == "Owner Commands":
-            emoji = "👑"
-            description = "Commands restricted to the bot owner"
-        else:
-            emoji = "📂"
-            description = "Miscellaneous commands"
+        emoji, _, description = CATEGORY_META.get(category_name, OTHER_CATEGORY_META)
         
         embed = create_embed(
             title=f"{emoji} {category_name}",
@@ -489,7 +668,7 @@ class HelpCog(BaseCog):
         if command.aliases:
             embed.add_field(
                 name="Aliases",
-                value=" • ".join([f"`{alias}`" for alias in command.aliases]),
+                value=" • ".join(f"`{alias}`" for alias in command.aliases),
                 inline=False
             )
         
@@ -522,103 +701,24 @@ class HelpCog(BaseCog):
                     inline=False
                 )
         
-        # Add examples if available
-        if hasattr(command.callback, '__doc__') and command.callback.__doc__:
-            doc = command.callback.__doc__
-            if "Example:" in doc:
-                example_text = doc.split("Example:")[1].strip().split("\n")[0]
-                embed.add_field(name="Example", value=example_text, inline=False)
+        # Add examples if available (docstrings never change, so parse each command once)
+        example_text = self._example_cache.get(command, _SENTINEL)
+        if example_text is _SENTINEL:
+            doc = getattr(command.callback, '__doc__', None) or ""
+            example_text = doc.split("Example:", 1)[1].strip().split("\n", 1)[0] if "Example:" in doc else None
+            self._example_cache[command] = example_text
+        if example_text:
+            embed.add_field(name="Example", value=example_text, inline=False)
         
         return embed
     
     def create_guide_embed(self) -> discord.Embed:
         """Create embed with commands guide."""
-        embed = create_embed(
-            title="📖 Commands Guide",
-            description="Learn how to use the bot effectively!",
-            color=discord.Color.green()
-        )
-        
-        embed.add_field(
-            name="🎮 Getting Started",
-            value=(
-                "1. Use `!quiz start <topic>` to start a solo quiz\n"
-                "2. Use `!trivia start <topic>` for group trivia\n"
-                "3. Answer questions using reactions or text\n"
-                "4. Track your progress with `!stats`\n"
-                "5. Compete on the `!leaderboard`"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="📝 Command Syntax",
-            value=(
-                "• `<required>` - Required parameter\n"
-                "• `[optional]` - Optional parameter\n"
-                "• `...` - Multiple parameters allowed\n"
-                "• `command*` - Command group with subcommands"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🎯 Popular Commands",
-            value=(
-                "• `!quiz start <topic>` - Start a quiz session\n"
-                "• `!trivia start <topic>` - Start group trivia\n"
-                "• `!trivia stop` - Stop current trivia\n"
-                "• `!stats` - View your statistics\n"
-                "• `!preferences` - Set your preferences\n"
-                "• `!leaderboard` - View server rankings\n"
-                "• `!help <command>` - Get detailed help"
-            ),
-            inline=False
-        )
-        
-        return embed
+        return _embed_from_template(_GUIDE_EMBED_DICT)
     
     def create_support_embed(self) -> discord.Embed:
         """Create embed with support information."""
-        embed = create_embed(
-            title="❓ Support",
-            description="Need help or have questions?",
-            color=discord.Color.gold()
-        )
-        
-        embed.add_field(
-            name="🐛 Report Issues",
-            value=(
-                "Found a bug? Let us know!\n"
-                "• Use `!feedback` command\n"
-                "• Contact server admins\n"
-                "• Check pinned messages"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="💡 Feature Requests",
-            value=(
-                "Have an idea for improvement?\n"
-                "• Use `!suggest` command\n"
-                "• Discuss in general chat\n"
-                "• Vote on community polls"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🔗 Useful Links",
-            value=(
-                "• [Getting Started Guide](https://github.com/anthropics/claude-code/issues)\n"
-                "• [Command Reference](https://docs.anthropic.com/en/docs/claude-code)\n"
-                "• Join our support server for help!"
-            ),
-            inline=False
-        )
-        
-        return embed
+        return _embed_from_template(_SUPPORT_EMBED_DICT)
     
     def create_error_embed(self, error_message: str) -> discord.Embed:
         """Create error embed."""
@@ -630,13 +730,14 @@ class HelpCog(BaseCog):
     
     def get_command_signature(self, command: commands.Command) -> str:
         """Get formatted command signature."""
-        # For subcommands, show the full qualified name
-        parts = [command.qualified_name]
-        
-        if command.signature:
-            parts.append(command.signature)
-        
-        return f"{self.bot.command_prefix}{' '.join(parts)}"
+        signature = self._sig_cache.get(command)
+        if signature is None:
+            # For subcommands, show the full qualified name
+            parts = command.qualified_name
+            if command.signature:
+                parts = f"{parts} {command.signature}"
+            signature = self._sig_cache[command] = f"{self.bot.command_prefix}{parts}"
+        return signature
     
     @commands.Cog.listener()
     async def on_command_error(self, ctx: commands.Context, error: commands.CommandError):
@@ -645,20 +746,21 @@ class HelpCog(BaseCog):
             # Extract the command name from the error
             command_name = str(error).split('"')[1]
             
-            # Find similar commands
-            similar = []
-            for cmd in self.bot.commands:
-                if cmd.hidden:
-                    continue
-                if command_name.lower() in cmd.name.lower() or cmd.name.lower() in command_name.lower():
-                    similar.append(cmd.name)
+            # Find similar commands, ranked by similarity
+            self._check_cache_epoch()
+            if self._lower_names is None:
+                self._lower_names = {cmd.name.lower(): cmd.name for cmd in self.bot.commands if not cmd.hidden}
+            similar = [
+                self._lower_names[name]
+                for name in get_close_matches(command_name.lower(), self._lower_names, n=5, cutoff=0.5)
+            ]
             
             embed = self.create_error_embed(f"Command '{command_name}' not found.")
             
             if similar:
                 embed.add_field(
                     name="Did you mean:",
-                    value=" • ".join([f"`{cmd}`" for cmd in similar[:5]]),
+                    value=" • ".join(f"`{cmd}`" for cmd in similar[:5]),
                     inline=False
                 )
             
@@ -668,8 +770,7 @@ class HelpCog(BaseCog):
                 inline=False
             )
             
-            async with ctx.typing():
-                await ctx.send(embed=embed, ephemeral=True)
+            await ctx.send(embed=embed, ephemeral=True)
             return
         
         # Let other error handlers deal with other errors
@@ -1,17 +1,20 @@
 """Data models for quiz functionality."""
 
-from enum import Enum
-from typing import Dict, List, Optional, Any
+from enum import IntEnum
+from typing import Dict, List, Optional, Any, Tuple
+from bisect import bisect_left, insort
+from array import array
 import time
+import secrets
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, asdict
 
 from services import Question
 
 logger = logging.getLogger("bot.quiz.models")
 
 
-class QuizState(Enum):
+class QuizState(IntEnum):
     """Enum representing the possible states of a quiz."""
     SETUP = 0
     ACTIVE = 1
@@ -20,38 +23,70 @@ class QuizState(Enum):
     FINISHED = 4
 
 
-@dataclass
 class QuizParticipant:
-    """Represents a participant in a quiz."""
-    user_id: int
-    score: int = 0
-    correct_count: int = 0
-    wrong_count: int = 0
+    """Represents a participant in a quiz, reading their totals from the quiz's aggregate arrays."""
     
-    def record_answer(self, is_correct: bool, points: int = 0) -> None:
-        """Record an answer for this participant."""
-        if is_correct:
-            self.correct_count += 1
-            self.score += points
-        else:
-            self.wrong_count += 1
+    __slots__ = ("user_id", "_quiz", "_idx")
+    
+    def __init__(self, quiz: "ActiveQuiz", user_id: int, idx: int):
+        self.user_id = user_id
+        self._quiz = quiz
+        self._idx = idx
+    
+    @property
+    def score(self) -> int:
+        """Get the participant's points."""
+        return self._quiz._scores[self._idx]
+    
+    @property
+    def correct_count(self) -> int:
+        """Get the number of correct answers."""
+        return self._quiz._correct[self._idx]
+    
+    @property
+    def wrong_count(self) -> int:
+        """Get the number of wrong answers."""
+        return self._quiz._wrong[self._idx]
     
     @property
     def total_answers(self) -> int:
-        """Get total number of answers."""
-        return self.correct_count + self.wrong_count
+        """Get the number of answers given."""
+        return self._quiz._totals[self._idx]
     
     @property
     def accuracy(self) -> float:
-        """Get accuracy percentage."""
-        if self.total_answers == 0:
-            return 0.0
-        return (self.correct_count / self.total_answers) * 100
+        """Get the percentage of answers that were correct."""
+        return self._quiz._accuracy[self._idx]
+    
+    def __repr__(self) -> str:
+        return (f"QuizParticipant(user_id={self.user_id}, score={self.score}, "
+                f"correct_count={self.correct_count}, wrong_count={self.wrong_count})")
+
+
+@dataclass(slots=True)
+class LeaderboardEntry:
+    """A single row of a quiz leaderboard."""
+    user_id: int
+    score: int
+    correct_answers: int
+    wrong_answers: int
+    total_answers: int
+    accuracy: float
+    username: str = ""
 
 
 class ActiveQuiz:
     """Represents an active quiz session."""
     
+    __slots__ = (
+        "guild_id", "channel_id", "host_id", "topic", "questions", "_total_questions", "timeout",
+        "current_question_idx", "state", "participants", "_ranking",
+        "_user_ids", "_scores", "_correct", "_wrong", "_totals", "_accuracy",
+        "start_time", "_monotonic_start", "_monotonic_end", "last_activity_time", "end_time", "current_question_start_time",
+        "message_id", "llm_provider", "is_private", "timer_task",
+        "quiz_id", "_version", "_cached_leaderboard", "_cached_progress", "_cached_stats",
+    )
+    
     def __init__(
         self,
         guild_id: int,
@@ -67,156 +102,217 @@ class ActiveQuiz:
         self.channel_id = channel_id
         self.host_id = host_id
         self.topic = topic
-        self.questions = questions
+        # Questions are fixed once the quiz is created
+        self.questions = tuple(questions)
+        self._total_questions = len(self.questions)
         self.timeout = timeout
         self.current_question_idx = 0
         self.state = QuizState.SETUP
         self.participants: Dict[int, QuizParticipant] = {}
-        self.start_time = time.time()
-        self.last_activity_time = self.start_time
+        # Per-participant aggregates as parallel arrays indexed by join order; the
+        # QuizParticipant objects are views over these
+        self._user_ids: List[int] = []
+        self._scores = array('i')
+        self._correct = array('i')
+        self._wrong = array('i')
+        # Derived from the counts above; updated on write so reads are plain lookups
+        self._totals = array('i')
+        self._accuracy = array('d')
+        # Participant indices kept in leaderboard order, updated as scores change
+        self._ranking: List[int] = []
+        now = time.time()
+        self.start_time = now
+        # Live duration is measured on the monotonic clock
+        self._monotonic_start = time.monotonic()
+        self.last_activity_time = now
         self.end_time: Optional[float] = None
+        self._monotonic_end: Optional[float] = None
         self.current_question_start_time: Optional[float] = None
         self.message_id: Optional[int] = None
         self.llm_provider = llm_provider
         self.is_private = is_private
         self.timer_task = None
-        self.questions_asked = 0
-        self.questions_answered = 0
-        self.correct_answers = 0
-        self.wrong_answers = 0
-        self.quiz_id = f"quiz_{int(time.time())}_{guild_id}_{channel_id}"
+        self.quiz_id = f"quiz_{int(now)}_{guild_id}_{channel_id}_{secrets.token_hex(4)}"
+        # Bumped on every mutation; derived payloads are cached against it
+        self._version = 0
+        self._cached_leaderboard: Optional[Tuple[int, List[LeaderboardEntry]]] = None
+        self._cached_progress: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._cached_stats: Optional[Tuple[int, Dict[str, Any]]] = None
         
-        logger.info(f"Created new quiz with ID {self.quiz_id} on topic '{topic}' with {len(questions)} questions")
+        logger.info(f"Created new quiz with ID {self.quiz_id} on topic '{topic}' with {self._total_questions} questions")
     
     @property
     def current_question(self) -> Optional[Question]:
         """Get the current question."""
-        if 0 <= self.current_question_idx < len(self.questions):
+        if 0 <= self.current_question_idx < self._total_questions:
             return self.questions[self.current_question_idx]
         return None
     
     @property
     def is_finished(self) -> bool:
         """Check if the quiz is finished."""
-        if self.state == QuizState.FINISHED:
-            return True
-        if self.current_question_idx >= len(self.questions):
-            logger.debug(f"Quiz {self.quiz_id} marked as finished: all questions asked")
-            self.state = QuizState.FINISHED
-            return True
-        return False
+        return self.state is QuizState.FINISHED or self.current_question_idx >= self._total_questions
     
     @property
     def remaining_questions(self) -> int:
         """Get the number of remaining questions."""
-        return max(0, len(self.questions) - self.current_question_idx)
+        return max(0, self._total_questions - self.current_question_idx)
     
     @property
     def progress(self) -> str:
         """Get a string representation of the quiz progress."""
-        return f"Question {self.current_question_idx + 1}/{len(self.questions)}"
+        return f"Question {self.current_question_idx + 1}/{self._total_questions}"
     
     @property
     def duration(self) -> float:
         """Get the quiz duration in seconds."""
-        if self.end_time:
-            return self.end_time - self.start_time
-        return time.time() - self.start_time
+        end = self._monotonic_end if self._monotonic_end is not None else time.monotonic()
+        return end - self._monotonic_start
+    
+    def finish(self) -> None:
+        """Mark the quiz as finished, stamping its end on both clocks."""
+        self.state = QuizState.FINISHED
+        self.end_time = time.time()
+        self._monotonic_end = time.monotonic()
+        self._version += 1
     
     def next_question(self) -> Optional[Question]:
         """Move to the next question."""
-        self.questions_asked += 1
-        logger.debug(f"Moving to next question in quiz {self.quiz_id}: {self.current_question_idx} -> {self.current_question_idx + 1}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Moving to next question in quiz %s: %d -> %d",
+                         self.quiz_id, self.current_question_idx, self.current_question_idx + 1)
         self.current_question_idx += 1
+        now = time.time()
         
-        if self.current_question_idx >= len(self.questions):
-            logger.debug(f"No more questions in quiz {self.quiz_id}")
-            self.state = QuizState.FINISHED
-            self.end_time = time.time()
+        if self.current_question_idx >= self._total_questions:
+            if debug:
+                logger.debug("No more questions in quiz %s", self.quiz_id)
+            self.finish()
             return None
             
-        current_time = time.time()
-        self.current_question_start_time = current_time
-        self.last_activity_time = current_time  # Update last activity time
+        self.current_question_start_time = now
+        self.last_activity_time = now  # Update last activity time
+        self._version += 1
         return self.current_question
     
     def add_participant(self, user_id: int) -> QuizParticipant:
         """Add a participant to the quiz."""
         if user_id not in self.participants:
-            self.participants[user_id] = QuizParticipant(user_id=user_id)
-            logger.debug(f"Added participant {user_id} to quiz {self.quiz_id}")
+            idx = len(self._user_ids)
+            self.participants[user_id] = QuizParticipant(self, user_id, idx)
+            self._user_ids.append(user_id)
+            self._scores.append(0)
+            self._correct.append(0)
+            self._wrong.append(0)
+            self._totals.append(0)
+            self._accuracy.append(0.0)
+            insort(self._ranking, idx, key=self._ranking_key)
+            self._version += 1
+            logger.debug("Added participant %s to quiz %s", user_id, self.quiz_id)
         return self.participants[user_id]
     
     def record_answer(self, user_id: int, is_correct: bool, points_awarded: int = 0) -> QuizParticipant:
         """Records an answer attempt for a user."""
         participant = self.add_participant(user_id)
-        participant.record_answer(is_correct, points_awarded)
+        idx = participant._idx
         
         if is_correct:
-            self.correct_answers += 1
-            logger.debug(f"Correct answer by user {user_id} in quiz {self.quiz_id} (+{points_awarded} points)")
+            if points_awarded:
+                # Re-position the participant since their score is changing
+                ranking = self._ranking
+                del ranking[bisect_left(ranking, self._ranking_key(idx), key=self._ranking_key)]
+                self._scores[idx] += points_awarded
+                insort(ranking, idx, key=self._ranking_key)
+            self._correct[idx] += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Correct answer by user %s in quiz %s (+%s points)", user_id, self.quiz_id, points_awarded)
         else:
-            self.wrong_answers += 1
-            logger.debug(f"Wrong answer by user {user_id} in quiz {self.quiz_id}")
+            self._wrong[idx] += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Wrong answer by user %s in quiz %s", user_id, self.quiz_id)
+        total = self._totals[idx] = self._totals[idx] + 1
+        self._accuracy[idx] = (self._correct[idx] / total) * 100
             
-        self.questions_answered += 1
         self.last_activity_time = time.time()  # Update last activity time
+        self._version += 1
         return participant
     
+    def _ranking_key(self, idx: int) -> tuple:
+        """Sort key for the leaderboard: highest score first, ties by user ID."""
+        return (-self._scores[idx], self._user_ids[idx])
+    
+    def _leaderboard_entry(self, idx: int) -> LeaderboardEntry:
+        """Build a leaderboard entry from the aggregate arrays."""
+        user_id = self._user_ids[idx]
+        return LeaderboardEntry(
+            user_id=user_id,
+            score=self._scores[idx],
+            correct_answers=self._correct[idx],
+            wrong_answers=self._wrong[idx],
+            total_answers=self._totals[idx],
+            accuracy=self._accuracy[idx],
+            username=f"User {user_id}"  # Will be filled in by the cog
+        )
+    
+    def get_leaderboard_entries(self, limit: Optional[int] = None) -> List[LeaderboardEntry]:
+        """Get the leaderboard as entries, rebuilding them only if the quiz changed."""
+        cached = self._cached_leaderboard
+        if not cached or cached[0] != self._version:
+            cached = self._cached_leaderboard = (
+                self._version, [self._leaderboard_entry(i) for i in self._ranking]
+            )
+        return cached[1][:limit]
+    
     def get_leaderboard(self) -> List[Dict[str, Any]]:
         """Get the quiz leaderboard."""
-        leaderboard = []
-        for user_id, participant in sorted(
-            self.participants.items(), 
-            key=lambda x: x[1].score, 
-            reverse=True
-        ):
-            entry = {
-                "user_id": user_id,
-                "score": participant.score,
-                "correct_answers": participant.correct_count,
-                "wrong_answers": participant.wrong_count,
-                "total_answers": participant.total_answers,
-                "accuracy": participant.accuracy,
-                "username": f"User {user_id}"  # Will be filled in by the cog
-            }
-            leaderboard.append(entry)
-        return leaderboard
+        return [asdict(e) for e in self.get_leaderboard_entries()]
+    
+    def get_top(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Get the top k leaderboard entries."""
+        return [asdict(e) for e in self.get_leaderboard_entries(k)]
+    
+    def _answer_totals(self) -> Tuple[int, int]:
+        """Sum correct and wrong answers across all participants."""
+        return sum(self._correct), sum(self._wrong)
     
     def get_progress_info(self) -> Dict[str, Any]:
         """Get information about quiz progress."""
-        return {
-            "current_question": self.current_question_idx + 1,
-            "total_questions": len(self.questions),
-            "remaining_questions": self.remaining_questions,
-            "questions_asked": self.questions_asked,
-            "questions_answered": self.questions_answered,
-            "correct_answers": self.correct_answers,
-            "wrong_answers": self.wrong_answers,
-            "progress_percent": ((self.current_question_idx + 1) / len(self.questions)) * 100,
-            "state": self.state.name,
-            "quiz_id": self.quiz_id,
-            "duration": self.duration,
-            "participant_count": len(self.participants)
-        }
+        cached = self._cached_progress
+        if not cached or cached[0] != self._version:
+            correct, wrong = self._answer_totals()
+            cached = self._cached_progress = (self._version, {
+                "current_question": self.current_question_idx + 1,
+                "total_questions": self._total_questions,
+                "remaining_questions": self.remaining_questions,
+                "questions_asked": self.current_question_idx,
+                "questions_answered": correct + wrong,
+                "correct_answers": correct,
+                "wrong_answers": wrong,
+                "progress_percent": ((self.current_question_idx + 1) / self._total_questions) * 100,
+                "quiz_id": self.quiz_id,
+                "participant_count": len(self.participants)
+            })
+        # State is set directly by the cog and duration moves with the clock
+        return {**cached[1], "state": self.state.name, "duration": self.duration}
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive quiz statistics."""
-        total_participants = len(self.participants)
-        total_answers = self.questions_answered
-        
-        return {
-            "quiz_id": self.quiz_id,
-            "topic": self.topic,
-            "total_questions": len(self.questions),
-            "questions_asked": self.questions_asked,
-            "questions_answered": self.questions_answered,
-            "total_participants": total_participants,
-            "correct_answers": self.correct_answers,
-            "wrong_answers": self.wrong_answers,
-            "accuracy": (self.correct_answers / total_answers * 100) if total_answers > 0 else 0,
-            "duration": self.duration,
-            "llm_provider": self.llm_provider,
-            "is_private": self.is_private,
-            "state": self.state.name
-        }
\ No newline at end of file
+        cached = self._cached_stats
+        if not cached or cached[0] != self._version:
+            correct, wrong = self._answer_totals()
+            total_answers = correct + wrong
+            cached = self._cached_stats = (self._version, {
+                "quiz_id": self.quiz_id,
+                "topic": self.topic,
+                "total_questions": self._total_questions,
+                "questions_asked": self.current_question_idx,
+                "questions_answered": total_answers,
+                "total_participants": len(self.participants),
+                "correct_answers": correct,
+                "wrong_answers": wrong,
+                "accuracy": (correct / total_answers * 100) if total_answers > 0 else 0,
+                "llm_provider": self.llm_provider,
+                "is_private": self.is_private
+            })
+        return {**cached[1], "duration": self.duration, "state": self.state.name}
\ No newline at end of file
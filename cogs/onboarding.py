@@ -5,6 +5,7 @@ from discord.ext import commands
 from typing import List, Dict, Optional, Any, ClassVar
 import logging
 import datetime
+import asyncio
 
 from cogs.base_cog import BaseCog
 from cogs.utils.embeds import create_base_embed, create_success_embed, create_error_embed
@@ -22,39 +23,36 @@ class WelcomeView(discord.ui.View):
     @discord.ui.button(label="Start a Quiz", style=discord.ButtonStyle.primary, custom_id="welcome:quiz")
     async def start_quiz(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         """Quick access to starting a quiz."""
-        async with interaction.channel.typing():
-            await interaction.response.send_message(
-                "To start a quiz, use the `/quiz start` command. "
-                "You'll need to specify a topic and optionally set the difficulty and question count.",
-                ephemeral=True
-            )
+        await interaction.response.send_message(
+            "To start a quiz, use the `/quiz start` command. "
+            "You'll need to specify a topic and optionally set the difficulty and question count.",
+            ephemeral=True
+        )
     
     @discord.ui.button(label="Setup Guide", style=discord.ButtonStyle.secondary, custom_id="welcome:guide")
     async def setup_guide(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         """Show setup guide for server admins."""
-        async with interaction.channel.typing():
-            await interaction.response.send_message(
-                "**Setup Guide for Administrators**\n\n"
-                "1. Make sure the bot has the required permissions\n"
-                "2. Use `/admin setup` to configure server-specific settings\n"
-                "3. Use `/admin permissions` to set up role permissions\n\n"
-                "For more detailed instructions, check out our documentation.",
-                ephemeral=True
-            )
+        await interaction.response.send_message(
+            "**Setup Guide for Administrators**\n\n"
+            "1. Make sure the bot has the required permissions\n"
+            "2. Use `/admin setup` to configure server-specific settings\n"
+            "3. Use `/admin permissions` to set up role permissions\n\n"
+            "For more detailed instructions, check out our documentation.",
+            ephemeral=True
+        )
     
     @discord.ui.button(label="Command List", style=discord.ButtonStyle.secondary, custom_id="welcome:commands")
     async def command_list(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         """Show the list of available commands."""
-        async with interaction.channel.typing():
-            await interaction.response.send_message(
-                "Use `/help` to see the full list of commands. "
-                "Here are some of the most commonly used ones:\n\n"
-                "• `/quiz start` - Start a new quiz\n"
-                "• `/trivia start` - Start a group trivia game\n"
-                "• `/faq` - Show frequently asked questions\n"
-                "• `/preferences` - Set your personal preferences",
-                ephemeral=True
-            )
+        await interaction.response.send_message(
+            "Use `/help` to see the full list of commands. "
+            "Here are some of the most commonly used ones:\n\n"
+            "• `/quiz start` - Start a new quiz\n"
+            "• `/trivia start` - Start a group trivia game\n"
+            "• `/faq` - Show frequently asked questions\n"
+            "• `/preferences` - Set your personal preferences",
+            ephemeral=True
+        )
 
 
 class OnboardingCog(BaseCog):
@@ -63,17 +61,20 @@ class OnboardingCog(BaseCog):
     def __init__(self, bot: commands.Bot):
         """Initialize the onboarding cog."""
         super().__init__(bot, name="Onboarding")
+        self._welcome_template = self._build_welcome_template()
+        # The view holds no per-guild state, so one persistent instance serves every message
+        self._welcome_view = WelcomeView(bot)
     
-    def _create_welcome_embed(self, guild: discord.Guild) -> discord.Embed:
-        """Create the welcome embed for a new server."""
+    async def cog_load(self) -> None:
+        """Register the persistent welcome view when the cog is loaded."""
+        await super().cog_load()
+        self.bot.add_view(self._welcome_view)
+    
+    def _build_welcome_template(self) -> discord.Embed:
+        """Build the guild-independent parts of the welcome embed."""
         embed = create_base_embed(
             title="👋 Thanks for adding Educational Quiz Bot!",
-            description=(
-                f"Hello, {guild.name}! I'm an educational bot that helps you learn through "
-                "interactive quizzes and trivia games. Let's get started!"
-            ),
-            color=discord.Color.blue(),
-            timestamp=datetime.datetime.now()
+            color=discord.Color.blue()
         )
         
         embed.add_field(
@@ -108,28 +109,44 @@ class OnboardingCog(BaseCog):
         
         return embed
     
+    def _create_welcome_embed(self, guild: discord.Guild) -> discord.Embed:
+        """Create the welcome embed for a new server."""
+        # The copy shares the template's fields, which are never modified
+        embed = self._welcome_template.copy()
+        embed.description = (
+            f"Hello, {guild.name}! I'm an educational bot that helps you learn through "
+            "interactive quizzes and trivia games. Let's get started!"
+        )
+        embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+        return embed
+    
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
         """Send a welcome message when the bot joins a new server."""
         self.logger.info(f"Joined new guild: {guild.name} (ID: {guild.id})")
 
         target_channel: Optional[discord.TextChannel] = None
+        me = guild.me
+        text_channels = guild.text_channels  # Built and sorted on each access, so bind it once
 
         # 1. Try to find a channel named 'general'
-        for channel in guild.text_channels:
-            if channel.name == "general":
-                if channel.permissions_for(guild.me).send_messages and channel.permissions_for(guild.me).embed_links:
-                    target_channel = channel
-                    self.logger.info(f"Found #general channel in {guild.name}: {channel.name} (ID: {channel.id})")
-                    break
-                else:
-                    self.logger.warning(f"Found #general channel in {guild.name} but missing send/embed permissions.")
+        general = discord.utils.get(text_channels, name="general")
+        if general:
+            perms = general.permissions_for(me)
+            if perms.send_messages and perms.embed_links:
+                target_channel = general
+                self.logger.info(f"Found #general channel in {guild.name}: {general.name} (ID: {general.id})")
+            else:
+                self.logger.warning(f"Found #general channel in {guild.name} but missing send/embed permissions.")
         
         # 2. If 'general' not found or not usable, find the first available text channel
         if not target_channel:
             self.logger.info(f"#general channel not found or not usable in {guild.name}. Searching for alternative.")
-            for channel in guild.text_channels:
-                if channel.permissions_for(guild.me).send_messages and channel.permissions_for(guild.me).embed_links:
+            for channel in text_channels:
+                if channel is general:
+                    continue
+                perms = channel.permissions_for(me)
+                if perms.send_messages and perms.embed_links:
                     target_channel = channel
                     self.logger.info(f"Found alternative channel in {guild.name}: {channel.name} (ID: {channel.id})")
                     break
@@ -138,20 +155,23 @@ class OnboardingCog(BaseCog):
 
         # 3. Send the message if a channel was found
         if target_channel:
-            try:
-                welcome_embed = self._create_welcome_embed(guild)
-                async with target_channel.typing():
-                    await target_channel.send(embed=welcome_embed, view=WelcomeView(self.bot))
-                
-                # Record onboarding status in database
-                if self.db_service:
-                    await self.db_service.record_onboarding(guild.id, target_channel.id)
-                
-                self.logger.info(f"Sent welcome message to {guild.name} in channel {target_channel.name}")
-            except discord.errors.Forbidden:
+            welcome_embed = self._create_welcome_embed(guild)
+            
+            # Send the welcome message and record onboarding status in database concurrently
+            pending = [target_channel.send(embed=welcome_embed, view=self._welcome_view)]
+            if self.db_service:
+                pending.append(self.db_service.record_onboarding(guild.id, target_channel.id))
+            send_result, *db_results = await asyncio.gather(*pending, return_exceptions=True)
+            
+            if isinstance(send_result, discord.errors.Forbidden):
                 self.logger.error(f"Forbidden to send welcome message to {target_channel.name} in {guild.name}. Check bot permissions.")
-            except Exception as e:
-                self.logger.error(f"Error sending welcome message to {guild.name} in {target_channel.name}: {e}", exc_info=True)
+            elif isinstance(send_result, Exception):
+                self.logger.error(f"Error sending welcome message to {guild.name} in {target_channel.name}: {send_result}", exc_info=send_result)
+            else:
+                self.logger.info(f"Sent welcome message to {guild.name} in channel {target_channel.name}")
+            
+            if db_results and isinstance(db_results[0], Exception):
+                self.logger.error(f"Error recording onboarding for {guild.name}: {db_results[0]}", exc_info=db_results[0])
         else:
             self.logger.warning(f"Could not send welcome message to {guild.name} as no suitable channel was found.")
     
@@ -163,13 +183,11 @@ class OnboardingCog(BaseCog):
             error_embed = create_error_embed(
                 description="You need Manage Server permission to use this command."
             )
-            async with ctx.typing():
-                await ctx.send(embed=error_embed, ephemeral=True)
+            await ctx.send(embed=error_embed, ephemeral=True)
             return
             
         welcome_embed = self._create_welcome_embed(ctx.guild)
-        async with ctx.typing():
-            await ctx.send(embed=welcome_embed, view=WelcomeView(self.bot))
+        await ctx.send(embed=welcome_embed, view=self._welcome_view)
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -8,280 +8,397 @@ the persistent button system, including recovery status and cleanup operations.
 import discord
 from discord.ext import commands
 from discord import app_commands
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple, ClassVar, Callable, Awaitable
+import asyncio
+import functools
+import inspect
+import time
 
 from cogs.base_cog import BaseCog
 from utils.context import BotContext
 
+# Either permission grants access to the UI admin commands
+_ADMIN_MASK = discord.Permissions.administrator.flag | discord.Permissions.manage_guild.flag
+
+_SERVICE_LABELS = {
+    "ui_service": "UI service",
+    "recovery_service": "Recovery service",
+}
+
+# Reply prefix for errors raised inside each command, see cog_app_command_error
+_ERROR_MESSAGES = {
+    "ui_status": "Error getting UI status",
+    "ui_cleanup": "Error during cleanup",
+    "ui_recover": "Error during recovery",
+    "ui_analytics": "Error getting analytics",
+}
+
+
+def _admin_command(needs: str, cooldown: Optional[float] = None):
+    """Wrap a UI admin command with the shared permission, cooldown and service handling.
+    
+    The wrapped command receives the required service as its argument after
+    the interaction and decides for itself whether it needs to defer. With a
+    cooldown, one run is allowed per guild (or DM user) every ``cooldown``
+    seconds, charged only once the permission check has passed. Errors
+    propagate to cog_app_command_error.
+    """
+    def decorator(func):
+        # guild or DM user id -> cooldown bucket
+        buckets: Dict[int, app_commands.Cooldown] = {}
+        
+        @functools.wraps(func)
+        async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
+            if not await self._check_admin_permissions(interaction):
+                return
+            
+            if cooldown is not None:
+                now = time.time()
+                # Forget buckets that have fully recovered
+                for key in [key for key, bucket in buckets.items() if bucket.get_tokens(now) == bucket.rate]:
+                    del buckets[key]
+                
+                key = interaction.guild_id or interaction.user.id
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = app_commands.Cooldown(1, cooldown)
+                retry_after = bucket.update_rate_limit(now)
+                if retry_after:
+                    raise app_commands.CommandOnCooldown(bucket, retry_after)
+            
+            await self._ensure_services()
+            
+            service = getattr(self, needs)
+            if service is None:
+                await self._send_ephemeral(interaction, f"{_SERVICE_LABELS[needs]} not available")
+                return
+            
+            await func(self, interaction, service, *args, **kwargs)
+        
+        # Hide the injected service from the slash command parameters
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        del parameters[2]
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+    return decorator
+
 
 class PersistentUIAdminCog(BaseCog, name="PersistentUIAdmin"):
     """Administrative commands for persistent UI management."""
     
+    # How long cached status/analytics are served before being refreshed
+    _STATUS_TTL: ClassVar[float] = 5.0
+    _ANALYTICS_TTL: ClassVar[float] = 30.0
+    
     def __init__(self, bot):
         super().__init__(bot, "PersistentUIAdmin")
         self.ui_service = None
         self.recovery_service = None
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._status_refresh: Optional[asyncio.Task] = None
+        self._analytics_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        # Running cleanup/recovery, shared by overlapping invocations
+        self._cleanup_inflight: Optional[asyncio.Task] = None
+        self._recover_inflight: Optional[asyncio.Task] = None
+        # Services are built on first admin command use rather than at startup
+        self._services_lock = asyncio.Lock()
+        self._services_ready = False
     
-    async def cog_load(self):
-        """Initialize services when cog is loaded."""
-        await super().cog_load()
+    async def _ensure_services(self) -> None:
+        """Initialize the UI services on first use and cache them."""
+        if self._services_ready:
+            return
         
-        try:
-            # Initialize UI services
-            from services.persistent_ui_service import PersistentUIService
-            from services.ui_recovery_service import UIRecoveryService
-            
-            self.ui_service = PersistentUIService(self.context)
-            self.recovery_service = UIRecoveryService(self.context)
-            
-            # Make services available through context
-            self.context.ui_service = self.ui_service
-            self.context.recovery_service = self.recovery_service
-            
-            self.logger.info("Persistent UI admin services initialized")
+        async with self._services_lock:
+            if self._services_ready:
+                return
             
-        except Exception as e:
-            self.logger.error(f"Failed to initialize UI services: {e}")
+            try:
+                from services.persistent_ui_service import PersistentUIService
+                from services.ui_recovery_service import UIRecoveryService
+                
+                # Reuse services already published by startup recovery
+                self.ui_service = getattr(self.context, 'ui_service', None) or PersistentUIService(self.context)
+                self.recovery_service = getattr(self.context, 'recovery_service', None) or UIRecoveryService(self.context)
+                
+                # Make services available through context
+                self.context.ui_service = self.ui_service
+                self.context.recovery_service = self.recovery_service
+                
+                self._services_ready = True
+                self.logger.info("Persistent UI admin services initialized")
+                
+            except Exception as e:
+                self.logger.error(f"Failed to initialize UI services: {e}")
     
     @app_commands.command(name="ui_status", description="Show persistent UI system status")
     @app_commands.describe(detailed="Show detailed statistics")
-    async def ui_status(self, interaction: discord.Interaction, detailed: bool = False):
+    @_admin_command(needs="recovery_service")
+    async def ui_status(self, interaction: discord.Interaction, recovery_service, detailed: bool = False):
         """Display persistent UI system status and statistics."""
         
-        if not await self._check_admin_permissions(interaction):
-            return
-        
-        try:
+        # Get recovery status and analytics, serving cached snapshots where possible
+        cached = self._status_cache
+        analytics = None
+        want_analytics = detailed and self.ui_service is not None
+        if want_analytics:
+            analytics = self._cached_analytics(24)
+        fetch_analytics = want_analytics and analytics is None
+        if cached is None or fetch_analytics:
             await interaction.response.defer(ephemeral=True)
+        
+        if cached is None and fetch_analytics:
+            # Independent lookups, so fetch them concurrently
+            status_data, analytics = await asyncio.gather(
+                self._refresh_status(), self._fetch_analytics(24)
+            )
+        elif cached is None:
+            status_data = await self._refresh_status()
+        else:
+            status_data = cached[1]
+            if time.monotonic() - cached[0] >= self._STATUS_TTL:
+                self._schedule_status_refresh()
+            if fetch_analytics:
+                analytics = await self._fetch_analytics(24)
+        now = datetime.now(timezone.utc)
+        
+        # Create status embed
+        embed = discord.Embed(
+            title="🔧 Persistent UI System Status",
+            color=discord.Color.blue(),
+            timestamp=now
+        )
+        
+        if 'error' not in status_data:
+            recovery_stats = status_data.get('recovery_stats', {})
             
-            # Get recovery status
-            if self.recovery_service:
-                status_data = await self.recovery_service.get_recovery_status()
-            else:
-                status_data = {'error': 'Recovery service not available'}
-            
-            # Create status embed
-            embed = discord.Embed(
-                title="🔧 Persistent UI System Status",
-                color=discord.Color.blue(),
-                timestamp=datetime.utcnow()
+            # Basic status
+            embed.add_field(
+                name="📊 Current Status",
+                value=(
+                    f"**Active Buttons:** {status_data.get('current_active_buttons', 'N/A')}\n"
+                    f"**Cleanup Task:** {'✅ Running' if status_data.get('cleanup_task_running') else '❌ Stopped'}\n"
+                    f"**Last Recovery:** {recovery_stats.get('last_recovery', 'Never')}"
+                ),
+                inline=False
             )
             
-            if 'error' not in status_data:
-                recovery_stats = status_data.get('recovery_stats', {})
-                
-                # Basic status
+            # Recovery statistics
+            if recovery_stats:
                 embed.add_field(
-                    name="📊 Current Status",
+                    name="🔄 Recovery Statistics",
                     value=(
-                        f"**Active Buttons:** {status_data.get('current_active_buttons', 'N/A')}\n"
-                        f"**Cleanup Task:** {'✅ Running' if status_data.get('cleanup_task_running') else '❌ Stopped'}\n"
-                        f"**Last Recovery:** {recovery_stats.get('last_recovery', 'Never')}"
+                        f"**Buttons Recovered:** {recovery_stats.get('buttons_recovered', 0)}\n"
+                        f"**Messages Scanned:** {recovery_stats.get('messages_scanned', 0)}\n"
+                        f"**Recovery Time:** {recovery_stats.get('recovery_time_seconds', 0):.2f}s"
                     ),
-                    inline=False
+                    inline=True
                 )
-                
-                # Recovery statistics
-                if recovery_stats:
+            
+            # Analytics (if detailed)
+            if analytics and 'error' not in analytics:
+                # Already ranked by count
+                handler_stats = analytics.get('handler_stats', [])
+                if handler_stats:
+                    handler_text = "\n".join([
+                        f"• {h['handler_class']}: {h['count']} interactions"
+                        for h in handler_stats[:3]
+                    ])
                     embed.add_field(
-                        name="🔄 Recovery Statistics",
-                        value=(
-                            f"**Buttons Recovered:** {recovery_stats.get('buttons_recovered', 0)}\n"
-                            f"**Messages Scanned:** {recovery_stats.get('messages_scanned', 0)}\n"
-                            f"**Recovery Time:** {recovery_stats.get('recovery_time_seconds', 0):.2f}s"
-                        ),
+                        name="📈 Top Handlers (24h)",
+                        value=handler_text or "No interactions",
                         inline=True
                     )
-                
-                # Analytics (if detailed)
-                if detailed and 'analytics' in status_data:
-                    analytics = status_data['analytics']
-                    if 'error' not in analytics:
-                        handler_stats = analytics.get('handler_stats', [])
-                        if handler_stats:
-                            top_handlers = sorted(handler_stats, key=lambda x: x['count'], reverse=True)[:3]
-                            handler_text = "\n".join([
-                                f"• {h['handler_class']}: {h['count']} interactions"
-                                for h in top_handlers
-                            ])
-                            embed.add_field(
-                                name="📈 Top Handlers (24h)",
-                                value=handler_text or "No interactions",
-                                inline=True
-                            )
-            else:
-                embed.add_field(
-                    name="❌ Error",
-                    value=status_data['error'],
-                    inline=False
-                )
-            
-            await interaction.followup.send(embed=embed)
-            
-        except Exception as e:
-            self.logger.error(f"Error in ui_status command: {e}")
-            await interaction.followup.send(f"Error getting UI status: {e}", ephemeral=True)
+        else:
+            embed.add_field(
+                name="❌ Error",
+                value=status_data['error'],
+                inline=False
+            )
+        
+        await self._send_ephemeral(interaction, embed=embed)
     
     @app_commands.command(name="ui_cleanup", description="Clean up expired persistent UI elements")
-    async def ui_cleanup(self, interaction: discord.Interaction):
+    @_admin_command(needs="ui_service", cooldown=30.0)
+    async def ui_cleanup(self, interaction: discord.Interaction, ui_service):
         """Manually trigger cleanup of expired buttons and messages."""
         
-        if not await self._check_admin_permissions(interaction):
-            return
+        await interaction.response.defer(ephemeral=True)
         
-        try:
-            await interaction.response.defer(ephemeral=True)
-            
-            if not self.ui_service:
-                await interaction.followup.send("UI service not available", ephemeral=True)
-                return
-            
-            # Perform cleanup
-            cleaned_count = await self.ui_service.cleanup_expired_buttons()
-            
-            embed = discord.Embed(
-                title="🧹 UI Cleanup Complete",
-                description=f"Cleaned up {cleaned_count} expired UI elements",
-                color=discord.Color.green(),
-                timestamp=datetime.utcnow()
-            )
-            
-            await interaction.followup.send(embed=embed)
-            
-        except Exception as e:
-            self.logger.error(f"Error in ui_cleanup command: {e}")
-            await interaction.followup.send(f"Error during cleanup: {e}", ephemeral=True)
+        # Perform cleanup
+        cleaned_count = await self._single_flight("_cleanup_inflight", ui_service.cleanup_expired_buttons)
+        now = datetime.now(timezone.utc)
+        
+        embed = discord.Embed(
+            title="🧹 UI Cleanup Complete",
+            description=f"Cleaned up {cleaned_count} expired UI elements",
+            color=discord.Color.green(),
+            timestamp=now
+        )
+        
+        await interaction.followup.send(embed=embed)
     
     @app_commands.command(name="ui_recover", description="Force recovery of persistent buttons")
-    async def ui_recover(self, interaction: discord.Interaction):
+    @_admin_command(needs="recovery_service", cooldown=30.0)
+    async def ui_recover(self, interaction: discord.Interaction, recovery_service):
         """Manually trigger recovery of persistent buttons."""
         
-        if not await self._check_admin_permissions(interaction):
-            return
+        await interaction.response.defer(ephemeral=True)
         
-        try:
-            await interaction.response.defer(ephemeral=True)
-            
-            if not self.recovery_service:
-                await interaction.followup.send("Recovery service not available", ephemeral=True)
-                return
-            
-            # Perform recovery
-            recovery_result = await self.recovery_service.perform_startup_recovery()
-            
-            if recovery_result['success']:
-                stats = recovery_result['statistics']
-                embed = discord.Embed(
-                    title="🔄 UI Recovery Complete",
-                    color=discord.Color.green(),
-                    timestamp=datetime.utcnow()
-                )
-                embed.add_field(
-                    name="Results",
-                    value=(
-                        f"**Buttons Recovered:** {stats.get('buttons_recovered', 0)}\n"
-                        f"**Messages Scanned:** {stats.get('messages_scanned', 0)}\n"
-                        f"**Recovery Time:** {stats.get('recovery_time_seconds', 0):.2f}s"
-                    ),
-                    inline=False
-                )
-            else:
-                embed = discord.Embed(
-                    title="❌ UI Recovery Failed",
-                    description=recovery_result.get('error', 'Unknown error'),
-                    color=discord.Color.red(),
-                    timestamp=datetime.utcnow()
-                )
-            
-            await interaction.followup.send(embed=embed)
-            
-        except Exception as e:
-            self.logger.error(f"Error in ui_recover command: {e}")
-            await interaction.followup.send(f"Error during recovery: {e}", ephemeral=True)
+        # Perform recovery
+        recovery_result = await self._single_flight("_recover_inflight", recovery_service.perform_startup_recovery)
+        now = datetime.now(timezone.utc)
+        
+        if recovery_result['success']:
+            stats = recovery_result['statistics']
+            embed = discord.Embed(
+                title="🔄 UI Recovery Complete",
+                color=discord.Color.green(),
+                timestamp=now
+            )
+            embed.add_field(
+                name="Results",
+                value=(
+                    f"**Buttons Recovered:** {stats.get('buttons_recovered', 0)}\n"
+                    f"**Messages Scanned:** {stats.get('messages_scanned', 0)}\n"
+                    f"**Recovery Time:** {stats.get('recovery_time_seconds', 0):.2f}s"
+                ),
+                inline=False
+            )
+        else:
+            embed = discord.Embed(
+                title="❌ UI Recovery Failed",
+                description=recovery_result.get('error', 'Unknown error'),
+                color=discord.Color.red(),
+                timestamp=now
+            )
+        
+        await interaction.followup.send(embed=embed)
     
     @app_commands.command(name="ui_analytics", description="Show button interaction analytics")
     @app_commands.describe(hours="Number of hours to look back (default: 24)")
-    async def ui_analytics(self, interaction: discord.Interaction, hours: int = 24):
+    @_admin_command(needs="ui_service")
+    async def ui_analytics(self, interaction: discord.Interaction, ui_service, hours: int = 24):
         """Display analytics for button interactions."""
         
-        if not await self._check_admin_permissions(interaction):
+        # Validate hours parameter
+        if hours < 1 or hours > 168:  # Max 1 week
+            await self._send_ephemeral(interaction, "Hours must be between 1 and 168 (1 week)")
             return
         
-        try:
+        # Get analytics, only deferring when they have to be fetched
+        analytics = self._cached_analytics(hours)
+        if analytics is None:
             await interaction.response.defer(ephemeral=True)
-            
-            if not self.ui_service:
-                await interaction.followup.send("UI service not available", ephemeral=True)
-                return
-            
-            # Validate hours parameter
-            if hours < 1 or hours > 168:  # Max 1 week
-                await interaction.followup.send("Hours must be between 1 and 168 (1 week)", ephemeral=True)
-                return
-            
-            # Get analytics
-            analytics = await self.ui_service.get_button_analytics(hours=hours)
+            analytics = await self._fetch_analytics(hours)
             
             if 'error' in analytics:
                 await interaction.followup.send(f"Error getting analytics: {analytics['error']}", ephemeral=True)
                 return
-            
-            embed = discord.Embed(
-                title=f"📊 Button Analytics ({hours}h)",
-                color=discord.Color.purple(),
-                timestamp=datetime.utcnow()
+        
+        embed = discord.Embed(
+            title=f"📊 Button Analytics ({hours}h)",
+            color=discord.Color.purple(),
+            timestamp=datetime.now(timezone.utc)
+        )
+        
+        # Handler statistics, already aggregated and ranked by the service
+        handler_stats = analytics.get('handler_stats', [])
+        if handler_stats:
+            handler_text = "\n".join(
+                f"• **{stat['handler_class']}**: {stat['count']} interactions "
+                f"({stat.get('avg_response_time') or 0:.0f}ms avg)"
+                for stat in handler_stats
             )
             
-            # Handler statistics
-            handler_stats = analytics.get('handler_stats', [])
-            if handler_stats:
-                # Group by handler class and sum counts
-                handler_totals = {}
-                for stat in handler_stats:
-                    handler = stat['handler_class']
-                    if handler not in handler_totals:
-                        handler_totals[handler] = {'total': 0, 'avg_response': 0, 'count': 0}
-                    handler_totals[handler]['total'] += stat['count']
-                    if stat.get('avg_response_time'):
-                        handler_totals[handler]['avg_response'] += stat['avg_response_time']
-                        handler_totals[handler]['count'] += 1
-                
-                # Format top handlers
-                sorted_handlers = sorted(handler_totals.items(), key=lambda x: x[1]['total'], reverse=True)[:5]
-                handler_text = ""
-                for handler, data in sorted_handlers:
-                    avg_response = data['avg_response'] / max(data['count'], 1)
-                    handler_text += f"• **{handler}**: {data['total']} interactions ({avg_response:.0f}ms avg)\n"
-                
-                embed.add_field(
-                    name="🎯 Top Handlers",
-                    value=handler_text or "No interactions found",
-                    inline=False
-                )
-            
-            # Error statistics
-            error_stats = analytics.get('error_stats', [])
-            if error_stats:
-                error_text = ""
-                for stat in error_stats:
-                    error_rate = (stat['errors'] / stat['total_interactions']) * 100
-                    error_text += f"• **{stat['handler_class']}**: {stat['errors']}/{stat['total_interactions']} ({error_rate:.1f}%)\n"
-                
-                embed.add_field(
-                    name="⚠️ Error Rates",
-                    value=error_text or "No errors found",
-                    inline=False
-                )
-            
-            if not handler_stats and not error_stats:
-                embed.description = f"No button interactions found in the last {hours} hours."
-            
-            await interaction.followup.send(embed=embed)
+            embed.add_field(
+                name="🎯 Top Handlers",
+                value=handler_text or "No interactions found",
+                inline=False
+            )
+        
+        # Error statistics
+        error_stats = analytics.get('error_stats', [])
+        if error_stats:
+            error_text = ""
+            for stat in error_stats:
+                error_rate = (stat['errors'] / stat['total_interactions']) * 100
+                error_text += f"• **{stat['handler_class']}**: {stat['errors']}/{stat['total_interactions']} ({error_rate:.1f}%)\n"
             
-        except Exception as e:
-            self.logger.error(f"Error in ui_analytics command: {e}")
-            await interaction.followup.send(f"Error getting analytics: {e}", ephemeral=True)
+            embed.add_field(
+                name="⚠️ Error Rates",
+                value=error_text or "No errors found",
+                inline=False
+            )
+        
+        if not handler_stats and not error_stats:
+            embed.description = f"No button interactions found in the last {hours} hours."
+        
+        await self._send_ephemeral(interaction, embed=embed)
+    
+    async def _refresh_status(self) -> Dict[str, Any]:
+        """Fetch the recovery status and cache it if it succeeded."""
+        status_data = await self.recovery_service.get_recovery_status(include_analytics=False)
+        if 'error' not in status_data:
+            self._status_cache = (time.monotonic(), status_data)
+        return status_data
+    
+    def _cached_analytics(self, hours: int) -> Optional[Dict[str, Any]]:
+        """Get cached top-handler analytics for a lookback window if still fresh."""
+        cached = self._analytics_cache.get(hours)
+        if cached and time.monotonic() - cached[0] < self._ANALYTICS_TTL:
+            return cached[1]
+        return None
+    
+    async def _fetch_analytics(self, hours: int) -> Dict[str, Any]:
+        """Fetch top-handler analytics for a lookback window and cache them if they succeeded."""
+        analytics = await self.ui_service.get_button_analytics(hours=hours, top_n=5)
+        if 'error' not in analytics:
+            self._analytics_cache[hours] = (time.monotonic(), analytics)
+        return analytics
+    
+    def _schedule_status_refresh(self) -> None:
+        """Refresh the cached status in the background unless a refresh is already running."""
+        if self._status_refresh is None or self._status_refresh.done():
+            self._status_refresh = asyncio.create_task(self._refresh_status())
+    
+    async def _single_flight(self, attr: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """Run operation, or join the run already in progress for the same slot."""
+        task = getattr(self, attr)
+        if task is None or task.done():
+            task = asyncio.create_task(operation())
+            setattr(self, attr, task)
+        # Shield so one caller being cancelled doesn't cancel the shared run
+        return await asyncio.shield(task)
+    
+    async def _send_ephemeral(self, interaction: discord.Interaction, content: Optional[str] = None,
+                              *, embed: Optional[discord.Embed] = None) -> None:
+        """Reply ephemerally, following up if the response was already deferred."""
+        if interaction.response.is_done():
+            await interaction.followup.send(content, embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(content, embed=embed, ephemeral=True)
+    
+    async def cog_app_command_error(self, interaction: discord.Interaction,
+                                    error: app_commands.AppCommandError) -> None:
+        """Handle cooldown hits and errors raised by the UI admin commands."""
+        if isinstance(error, app_commands.CommandOnCooldown):
+            await self._send_ephemeral(
+                interaction,
+                f"⏳ This command is on cooldown. Try again in {error.retry_after:.0f} seconds."
+            )
+            return
+        
+        command_name = interaction.command.name if interaction.command else 'unknown'
+        if isinstance(error, app_commands.CommandInvokeError):
+            error = error.original
+            self.logger.error(f"Error in {command_name} command: {error}")
+            await self._send_ephemeral(interaction, f"{_ERROR_MESSAGES.get(command_name, 'Error')}: {error}")
+            return
+        
+        self.logger.error(f"Error in {command_name} command: {error}")
     
     async def _check_admin_permissions(self, interaction: discord.Interaction) -> bool:
         """Check if user has admin permissions for UI commands."""
@@ -290,12 +407,8 @@ class PersistentUIAdminCog(BaseCog, name="PersistentUIAdmin"):
         if interaction.user.id in self.bot.owner_ids:
             return True
         
-        # Check if user has administrator permission in guild
-        if interaction.guild and interaction.user.guild_permissions.administrator:
-            return True
-        
-        # Check if user has manage server permission
-        if interaction.guild and interaction.user.guild_permissions.manage_guild:
+        # Check if user has administrator or manage server permission in guild
+        if interaction.guild is not None and interaction.user.guild_permissions.value & _ADMIN_MASK:
             return True
         
         await interaction.response.send_message(
@@ -3,12 +3,16 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import List, Dict, Optional, Any, Literal, ClassVar
+from typing import List, Dict, Optional, Any, Literal, ClassVar, Tuple, FrozenSet, Mapping
+from collections import OrderedDict
+from types import MappingProxyType
+import asyncio
 import logging
 import datetime
+import time
 
 from cogs.base_cog import BaseCog
-from cogs.utils.embeds import create_base_embed, create_success_embed, create_error_embed
+from cogs.utils.embeds import create_base_embed, create_error_embed
 from cogs.utils.decorators import require_context
 from cogs.utils.validation import validate_integer_range
 
@@ -17,57 +21,200 @@ class PreferencesCog(BaseCog):
     """User preference management commands."""
     
     # Class constants
-    THEMES: ClassVar[List[str]] = ["default", "dark", "light", "colorful", "minimal"]
+    THEMES: ClassVar[Tuple[str, ...]] = ("default", "dark", "light", "colorful", "minimal")
+    # Membership checks go through the set; THEMES keeps display order
+    _THEMES_SET: ClassVar[FrozenSet[str]] = frozenset(THEMES)
+    # Autocomplete choices are built once and filtered by reference on each keystroke
+    _THEME_LOWER: ClassVar[Tuple[str, ...]] = tuple(theme.lower() for theme in THEMES)
+    _THEME_CHOICES: ClassVar[Tuple[app_commands.Choice, ...]] = tuple(
+        app_commands.Choice(name=theme.capitalize(), value=theme) for theme in THEMES
+    )
+    _DEFAULT_PREFS: ClassVar[Mapping[str, Any]] = MappingProxyType({
+        "difficulty": "medium",
+        "question_count": 5,
+        "question_type": "multiple_choice",
+        "theme": "default"
+    })
+    # Display labels for the fixed preference values
+    _DIFFICULTY_LABEL: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "easy": "Easy",
+        "medium": "Medium",
+        "hard": "Hard"
+    })
+    _QTYPE_LABEL: ClassVar[Mapping[str, str]] = MappingProxyType({
+        "multiple_choice": "Multiple Choice",
+        "true_false": "True/False",
+        "short_answer": "Short Answer"
+    })
+    _THEME_LABEL: ClassVar[Mapping[str, str]] = MappingProxyType({theme: theme.capitalize() for theme in THEMES})
+    # command name -> (log action, user-facing description) for errors raised inside a command
+    _COMMAND_ERRORS: ClassVar[Mapping[str, Tuple[str, str]]] = MappingProxyType({
+        "preferences": ("fetching", "Error fetching your preferences. Please try again later."),
+        "set": ("setting", "Error updating your preferences. Please try again later."),
+        "reset": ("resetting", "Error resetting your preferences. Please try again later.")
+    })
+    _PREF_TTL: ClassVar[float] = 60.0
+    _PREF_CACHE_SIZE: ClassVar[int] = 4096
+    # Window in which rapid updates from one user are merged into a single write
+    _WRITE_DELAY: ClassVar[float] = 0.08
     
     def __init__(self, bot: commands.Bot):
         """Initialize the preferences cog."""
         super().__init__(bot, name="Preferences")
+        # user_id -> (fetched at, preferences), least recently used first
+        self._pref_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # user_id -> (merged pending updates, task that writes them)
+        self._pending_writes: Dict[int, Tuple[Dict[str, Any], asyncio.Task]] = {}
+        # user_id -> latest write task, which waits for the one before it
+        self._write_tasks: Dict[int, asyncio.Task] = {}
+        # Static parts of the preferences embed, patched per user on each call
+        self._prefs_template = self._build_preferences_template()
+    
+    def _store_preferences(self, user_id: int, preferences: Dict[str, Any]) -> None:
+        """Cache a user's preferences, evicting the least recently used entries."""
+        cache = self._pref_cache
+        cache[user_id] = (time.monotonic(), preferences)
+        cache.move_to_end(user_id)
+        while len(cache) > self._PREF_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    async def _get_preferences(self, user_id: int) -> Dict[str, Any]:
+        """Get a user's preferences, using the in-process cache while it is fresh."""
+        cached = self._pref_cache.get(user_id)
+        if cached and time.monotonic() - cached[0] < self._PREF_TTL:
+            self._pref_cache.move_to_end(user_id)
+            return cached[1]
+        
+        preferences = await self.db_service.get_user_preferences(user_id)
+        # An empty result means the lookup failed, so don't keep it around
+        if preferences:
+            self._store_preferences(user_id, preferences)
+        return preferences
     
-    def _create_preferences_embed(self, user: discord.Member, preferences: Dict[str, Any]) -> discord.Embed:
-        """Create an embed showing user preferences."""
+    async def _write_preferences(self, user_id: int, updates: Mapping[str, Any]) -> bool:
+        """Queue a preference update, sharing one database write with other updates in the window."""
+        pending = self._pending_writes.get(user_id)
+        if pending is None:
+            previous = self._write_tasks.get(user_id)
+            pending = ({}, asyncio.create_task(self._flush_preferences(user_id, previous)))
+            self._pending_writes[user_id] = pending
+            self._write_tasks[user_id] = pending[1]
+        pending[0].update(updates)
+        # Shield so one caller being cancelled doesn't cancel the shared write
+        return await asyncio.shield(pending[1])
+    
+    async def _flush_preferences(self, user_id: int, previous: Optional[asyncio.Task] = None) -> bool:
+        """Write a user's merged pending updates once the batching window has passed.
+        
+        The write starts only after the user's previous write has finished, so
+        batches reach the database in the order they were queued.
+        """
+        try:
+            await asyncio.sleep(self._WRITE_DELAY)
+            updates, _ = self._pending_writes.pop(user_id)
+            if previous is not None:
+                # Its result belongs to its own callers; only the ordering matters here
+                await asyncio.wait([previous])
+            
+            success = await self.db_service.set_user_preferences(user_id=user_id, **updates)
+            if success:
+                # Apply the update locally instead of reading it back from the database
+                preferences = dict(await self._get_preferences(user_id))
+                preferences.update(updates)
+                self._store_preferences(user_id, preferences)
+            return success
+        finally:
+            if self._write_tasks.get(user_id) is asyncio.current_task():
+                del self._write_tasks[user_id]
+    
+    async def cog_unload(self) -> None:
+        """Finish queued preference writes before the cog goes away."""
+        # Each user's latest task waits for the earlier ones; loop in case more get queued meanwhile
+        while self._write_tasks:
+            await asyncio.gather(*self._write_tasks.values(), return_exceptions=True)
+        await super().cog_unload()
+    
+    def _validate_theme(self, theme: str) -> Optional[str]:
+        """Validate a theme name, returning an error message if it is unknown."""
+        if theme in self._THEMES_SET:
+            return None
+        return f"Theme must be one of: {', '.join(self.THEMES)}"
+    
+    def _build_preferences_template(self) -> Dict[str, Any]:
+        """Build the static preferences embed payload once."""
         embed = create_base_embed(
-            title=f"⚙️ Preferences for {user.display_name}",
+            title="⚙️ Preferences",
             description="Your personal quiz and bot preferences.",
-            color=discord.Color.blue(),
-            timestamp=datetime.datetime.now()
+            color=discord.Color.blue()
+        )
+        
+        # Values are filled in per user
+        embed.add_field(name="🎮 Quiz Preferences", value="", inline=True)
+        embed.add_field(name="🎨 UI Preferences", value="", inline=True)
+        
+        embed.add_field(
+            name="ℹ️ About Preferences",
+            value=(
+                "Your preferences are applied automatically when you start a quiz.\n"
+                "Use `/preferences set` to change your preferences."
+            ),
+            inline=False
         )
         
-        embed.set_thumbnail(url=user.display_avatar.url)
+        return embed.to_dict()
+    
+    def _create_preferences_embed(self, user: discord.Member, preferences: Mapping[str, Any],
+                                  header: Optional[str] = None) -> discord.Embed:
+        """Create an embed showing user preferences, optionally headed by a status line."""
+        p = {**self._DEFAULT_PREFS, **(preferences or {})}
+        template = self._prefs_template
+        quiz_field, ui_field, about_field = template["fields"]
+        
+        data = dict(template)
+        data["title"] = f"⚙️ Preferences for {user.display_name}"
+        if header:
+            data["description"] = f"{header}\n\n{template['description']}"
+        data["thumbnail"] = {"url": user.display_avatar.url}
+        data["timestamp"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
         
         # Quiz Preferences
         quiz_prefs = [
-            f"**Difficulty:** {preferences.get('difficulty', 'medium').capitalize()}",
-            f"**Question Count:** {preferences.get('question_count', 5)}",
-            f"**Question Type:** {preferences.get('question_type', 'multiple_choice').replace('_', ' ').capitalize()}"
+            f"**Difficulty:** {self._DIFFICULTY_LABEL.get(p['difficulty'], p['difficulty'])}",
+            f"**Question Count:** {p['question_count']}",
+            f"**Question Type:** {self._QTYPE_LABEL.get(p['question_type'], p['question_type'])}"
         ]
         
-        embed.add_field(
-            name="🎮 Quiz Preferences",
-            value="\n".join(quiz_prefs),
-            inline=True
-        )
-        
         # UI Preferences
         ui_prefs = [
-            f"**Theme:** {preferences.get('theme', 'default').capitalize()}",
+            f"**Theme:** {self._THEME_LABEL.get(p['theme'], p['theme'])}",
         ]
         
-        embed.add_field(
-            name="🎨 UI Preferences",
-            value="\n".join(ui_prefs),
-            inline=True
-        )
+        # Field dicts are copied so the template is never shared with a live embed
+        data["fields"] = [
+            {**quiz_field, "value": "\n".join(quiz_prefs)},
+            {**ui_field, "value": "\n".join(ui_prefs)},
+            dict(about_field),
+        ]
         
-        embed.add_field(
-            name="ℹ️ About Preferences",
-            value=(
-                "Your preferences are applied automatically when you start a quiz.\n"
-                "Use `/preferences set` to change your preferences."
-            ),
-            inline=False
-        )
+        return discord.Embed.from_dict(data)
+    
+    async def cog_command_error(self, ctx: commands.Context, error: Exception) -> None:
+        """Log and report errors raised inside the preference commands."""
+        original = error
+        while isinstance(original, (commands.HybridCommandError, commands.CommandInvokeError,
+                                    app_commands.CommandInvokeError)):
+            original = original.original
+        
+        command_error = self._COMMAND_ERRORS.get(ctx.command.name if ctx.command else None)
+        if original is error or command_error is None:
+            # Not raised by a command body, leave it to the default handling
+            await super().cog_command_error(ctx, error)
+            return
         
-        return embed
+        action, description = command_error
+        self.logger.error(f"Error {action} preferences for {ctx.author.id}: {original}")
+        error_embed = create_error_embed(description=description)
+        await ctx.send(embed=error_embed, ephemeral=True)
     
     @commands.hybrid_group(name="preferences", description="Manage your personal quiz preferences.")
     @require_context
@@ -75,22 +222,11 @@ class PreferencesCog(BaseCog):
         """Commands for managing personal preferences."""
         if ctx.invoked_subcommand is None:
             # Show current preferences
-            try:
-                # Get user's preferences
-                preferences = await self.db_service.get_user_preferences(ctx.author.id)
-                
-                # Create and send preferences embed
-                embed = self._create_preferences_embed(ctx.author, preferences)
-                async with ctx.typing():
-                    await ctx.send(embed=embed)
-                
-            except Exception as e:
-                self.logger.error(f"Error fetching preferences for {ctx.author.id}: {e}")
-                error_embed = create_error_embed(
-                    description="Error fetching your preferences. Please try again later."
-                )
-                async with ctx.typing():
-                    await ctx.send(embed=error_embed, ephemeral=True)
+            preferences = await self._get_preferences(ctx.author.id)
+            
+            # Create and send preferences embed
+            embed = self._create_preferences_embed(ctx.author, preferences)
+            await ctx.send(embed=embed)
     
     @preferences_group.command(name="set", description="Set your quiz preferences.")
     @app_commands.describe(
@@ -106,101 +242,82 @@ class PreferencesCog(BaseCog):
                             question_type: Optional[Literal["multiple_choice", "true_false", "short_answer"]] = None,
                             theme: Optional[Literal["default", "dark", "light", "colorful", "minimal"]] = None):
         """Set your personal quiz preferences."""
-        try:
-            # Validate question count
-            if question_count is not None:
-                validation_error = validate_integer_range(question_count, min_value=1, max_value=50, 
-                                                         field_name="Question count")
-                if validation_error:
-                    error_embed = create_error_embed(description=validation_error)
-                    async with ctx.typing():
-                        await ctx.send(embed=error_embed, ephemeral=True)
-                    return
+        # Validate question count
+        if question_count is not None:
+            validation_error = validate_integer_range(question_count, min_value=1, max_value=50, 
+                                                     field_name="Question count")
+            if validation_error:
+                error_embed = create_error_embed(description=validation_error)
+                await ctx.send(embed=error_embed, ephemeral=True)
+                return
+        
+        # Validate theme
+        if theme is not None:
+            validation_error = self._validate_theme(theme)
+            if validation_error:
+                error_embed = create_error_embed(description=validation_error)
+                await ctx.send(embed=error_embed, ephemeral=True)
+                return
+        
+        # Save preferences to database
+        updates = {
+            "difficulty": difficulty,
+            "question_count": question_count,
+            "question_type": question_type,
+            "theme": theme
+        }
+        success = await self._write_preferences(
+            ctx.author.id,
+            {key: value for key, value in updates.items() if value is not None}
+        )
+        
+        if success:
+            preferences = await self._get_preferences(ctx.author.id)
             
-            # Save preferences to database
-            success = await self.db_service.set_user_preferences(
-                user_id=ctx.author.id,
-                difficulty=difficulty,
-                question_count=question_count,
-                question_type=question_type,
-                theme=theme
+            # Confirm the update in the preferences embed itself
+            embed = self._create_preferences_embed(
+                ctx.author, preferences, header="✅ Preferences updated successfully."
             )
-            
-            if success:
-                # Get updated preferences
-                preferences = await self.db_service.get_user_preferences(ctx.author.id)
-                
-                # Create confirmation embed
-                embed = create_success_embed(
-                    title="✅ Preferences Updated",
-                    description="Your preferences have been successfully updated!"
-                )
-                preferences_embed = self._create_preferences_embed(ctx.author, preferences)
-                async with ctx.typing():
-                    await ctx.send(embeds=[embed, preferences_embed])
-            else:
-                error_embed = create_error_embed(
-                    description="Failed to update preferences. Please try again later."
-                )
-                async with ctx.typing():
-                    await ctx.send(embed=error_embed, ephemeral=True)
-            
-        except Exception as e:
-            self.logger.error(f"Error setting preferences for {ctx.author.id}: {e}")
+            await ctx.send(embed=embed)
+        else:
             error_embed = create_error_embed(
-                description="Error updating your preferences. Please try again later."
+                description="Failed to update preferences. Please try again later."
             )
-            async with ctx.typing():
-                await ctx.send(embed=error_embed, ephemeral=True)
+            await ctx.send(embed=error_embed, ephemeral=True)
     
     @preferences_group.command(name="reset", description="Reset your preferences to default values.")
     @require_context
     async def reset_preferences(self, ctx: commands.Context):
         """Reset your preferences to default values."""
-        try:
-            # Set default preferences
-            success = await self.db_service.set_user_preferences(
-                user_id=ctx.author.id,
-                difficulty="medium",
-                question_count=5,
-                question_type="multiple_choice",
-                theme="default"
+        # Nothing to write if the user is already on the defaults with no update in flight
+        success = False
+        if ctx.author.id not in self._write_tasks:
+            current = await self._get_preferences(ctx.author.id)
+            success = all(current.get(key) == value for key, value in self._DEFAULT_PREFS.items())
+        
+        if not success:
+            # Set default preferences, queued behind any pending update so it wins
+            success = await self._write_preferences(ctx.author.id, self._DEFAULT_PREFS)
+        
+        if success:
+            # Confirm the reset in the preferences embed itself
+            embed = self._create_preferences_embed(
+                ctx.author, self._DEFAULT_PREFS, header="✅ Preferences reset to default values."
             )
-            
-            if success:
-                # Get updated preferences
-                preferences = await self.db_service.get_user_preferences(ctx.author.id)
-                
-                # Create confirmation embed
-                embed = create_success_embed(
-                    title="✅ Preferences Reset",
-                    description="Your preferences have been reset to default values!"
-                )
-                preferences_embed = self._create_preferences_embed(ctx.author, preferences)
-                async with ctx.typing():
-                    await ctx.send(embeds=[embed, preferences_embed])
-            else:
-                error_embed = create_error_embed(
-                    description="Failed to reset preferences. Please try again later."
-                )
-                async with ctx.typing():
-                    await ctx.send(embed=error_embed, ephemeral=True)
-            
-        except Exception as e:
-            self.logger.error(f"Error resetting preferences for {ctx.author.id}: {e}")
+            await ctx.send(embed=embed)
+        else:
             error_embed = create_error_embed(
-                description="Error resetting your preferences. Please try again later."
+                description="Failed to reset preferences. Please try again later."
             )
-            async with ctx.typing():
-                await ctx.send(embed=error_embed, ephemeral=True)
+            await ctx.send(embed=error_embed, ephemeral=True)
     
     @set_preferences.autocomplete("theme")
     async def theme_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         """Provide autocomplete for theme options."""
+        current_lower = current.lower()
         return [
-            app_commands.Choice(name=theme.capitalize(), value=theme)
-            for theme in self.THEMES
-            if current.lower() in theme.lower()
+            choice for choice, theme_lower in zip(self._THEME_CHOICES, self._THEME_LOWER)
+            if current_lower in theme_lower
         ]
 
 
@@ -2,10 +2,11 @@
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
+import heapq
 import time
-from typing import Dict, List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Tuple, ClassVar, FrozenSet
 import logging
 from datetime import datetime, timedelta
 
@@ -19,10 +20,71 @@ from cogs.utils.decorators import require_context, in_guild_only, cooldown_with_
 
 logger = logging.getLogger("bot.quiz")
 
+# Popular topics from various categories, offered by topic autocomplete
+_TOPICS = (
+    # Science & Technology
+    "Python Programming", "JavaScript", "Web Development", "Machine Learning", "Data Science",
+    "Space Exploration", "Artificial Intelligence", "Biology", "Chemistry", "Physics",
+    "Computer Science", "Environmental Science", "Astronomy", "Robotics", "Quantum Physics",
+
+    # History & Geography
+    "World History", "Ancient Civilizations", "Geography", "American History", "European History",
+    "World War II", "Ancient Egypt", "Medieval Times", "Renaissance", "Cold War",
+
+    # Entertainment & Pop Culture
+    "Movies", "Music", "Video Games", "Marvel Comics", "Star Wars", "Harry Potter",
+    "Lord of the Rings", "Television Shows", "90s Culture", "Disney",
+
+    # Sports & Games
+    "Football", "Basketball", "Olympics", "Soccer", "Baseball", "Chess", "Board Games",
+    "Tennis", "Golf", "Cricket",
+
+    # Literature & Arts
+    "Classic Literature", "Poetry", "Shakespeare", "Modern Literature", "Art History",
+    "Famous Artists", "Architecture", "Book Characters", "Mythology",
+
+    # General Knowledge
+    "General Knowledge", "Trivia", "Current Events", "Famous People", "Capital Cities",
+    "Languages", "Inventions", "Food & Cooking", "Animals", "Nature"
+)
+
+
+
+def _index_topics_by_prefix(pairs: Tuple[Tuple[str, str], ...]) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Bucket (lowercase, topic) pairs by first character, keeping their order."""
+    buckets: Dict[str, List[Tuple[str, str]]] = {}
+    for pair in pairs:
+        buckets.setdefault(pair[0][:1], []).append(pair)
+    return {prefix: tuple(bucket) for prefix, bucket in buckets.items()}
+
+
+# (lowercase, topic) pairs in display order, bucketed by first character so
+# prefix matches only scan topics that can match
+_TOPICS_LOWER: Tuple[Tuple[str, str], ...] = tuple(
+    sorted(((topic.lower(), topic) for topic in _TOPICS), key=lambda pair: pair[1])
+)
+_TOPICS_BY_PREFIX = _index_topics_by_prefix(_TOPICS_LOWER)
+
+# Choice objects are immutable, so they are built once and reused
+_TOPIC_CHOICES: Dict[str, app_commands.Choice] = {
+    topic: app_commands.Choice(name=topic, value=topic) for _, topic in _TOPICS_LOWER
+}
+_DEFAULT_CHOICES: Tuple[app_commands.Choice, ...] = tuple(
+    _TOPIC_CHOICES[topic] for _, topic in _TOPICS_LOWER[:25]
+)
+
 
 class QuizCog(BaseCog, name="Quiz"):
     """Quiz commands for educational learning through LLM-generated questions."""
     
+    # How long provider and template listings are reused before being re-read
+    _CATALOG_TTL: ClassVar[float] = 60.0
+    # Quizzes are abandoned after 30 minutes of inactivity or 1 hour in total
+    _INACTIVITY_TIMEOUT: ClassVar[float] = 1800.0
+    _MAX_QUIZ_DURATION: ClassVar[float] = 3600.0
+    # How long a finished quiz may stay registered before the expiry loop drops it
+    _FINISHED_QUIZ_GRACE: ClassVar[float] = 60.0
+    
     def __init__(self, bot: commands.Bot):
         """Initialize the quiz cog."""
         super().__init__(bot, "Quiz")
@@ -32,6 +94,16 @@ class QuizCog(BaseCog, name="Quiz"):
         self.user_settings: Dict[int, Dict] = {}  # user_id -> settings
         self.session_recovery_data = {}  # For recovery after bot restarts
         
+        # (fetched at, providers) and (fetched at, templates, template names)
+        self._providers_cache: Optional[Tuple[float, List[str]]] = None
+        self._templates_cache: Optional[Tuple[float, List[Dict[str, str]], FrozenSet[str]]] = None
+        
+        # (deadline, session key, quiz id) min-heap; entries are re-checked when popped
+        # rather than updated whenever a quiz sees activity
+        self._expiry_heap: List[Tuple[float, Tuple[int, int], str]] = []
+        self._expiry_wakeup = asyncio.Event()
+        self._expiry_task: Optional[asyncio.Task] = None
+        
         # Configuration will be set by set_context
         self.quiz_config = None
         self.llm_config = None
@@ -42,13 +114,41 @@ class QuizCog(BaseCog, name="Quiz"):
         
         self.quiz_config = self.config.quiz
         self.llm_config = self.config.llm
+        
+        # Configuration may have changed which providers and templates are available
+        self._providers_cache = None
+        self._templates_cache = None
+    
+    def _get_providers_cached(self) -> List[str]:
+        """Get the available LLM providers, reusing the last listing while it is fresh."""
+        cached = self._providers_cache
+        if cached and time.monotonic() - cached[0] < self._CATALOG_TTL:
+            return cached[1]
+        
+        providers = llm_service.get_available_providers()
+        # Don't hold on to an empty listing so newly configured providers show up
+        if providers:
+            self._providers_cache = (time.monotonic(), providers)
+        return providers
+    
+    def _get_templates_cached(self) -> Tuple[List[Dict[str, str]], FrozenSet[str]]:
+        """Get the available quiz templates and their names, reusing the last listing while it is fresh."""
+        cached = self._templates_cache
+        if cached and time.monotonic() - cached[0] < self._CATALOG_TTL:
+            return cached[1], cached[2]
+        
+        templates = quiz_generator.get_available_quiz_types()
+        template_names = frozenset(t['name'] for t in templates)
+        if templates:
+            self._templates_cache = (time.monotonic(), templates, template_names)
+        return templates, template_names
     
     async def cog_load(self) -> None:
         """Initialize the cog when it's loaded."""
         await super().cog_load()
         
         # Start background tasks
-        self.cleanup_expired_quizzes.start()
+        self._expiry_task = asyncio.create_task(self._expiry_loop())
         
         # Initialize database tables if needed
         if self.db_service:
@@ -59,7 +159,8 @@ class QuizCog(BaseCog, name="Quiz"):
     
     async def cog_unload(self) -> None:
         """Clean up when the cog is unloaded."""
-        self.cleanup_expired_quizzes.cancel()
+        if self._expiry_task:
+            self._expiry_task.cancel()
         
         # Stop all active quiz timers and save state for potential recovery
         for session_key, quiz in self.active_quizzes.items():
@@ -94,101 +195,111 @@ class QuizCog(BaseCog, name="Quiz"):
             self.logger.error(f"Error ensuring database tables: {e}", exc_info=True)
             return False
     
-    @tasks.loop(minutes=5)
+    def _quiz_deadlines(self, quiz: ActiveQuiz) -> Tuple[float, float]:
+        """Get when a quiz expires for inactivity and when it expires at the latest."""
+        inactivity_deadline = quiz.last_activity_time + self._INACTIVITY_TIMEOUT
+        deadline = min(inactivity_deadline, quiz.start_time + self._MAX_QUIZ_DURATION)
+        if quiz.end_time is not None:
+            # A finished quiz only stays around long enough to post its results
+            deadline = min(deadline, quiz.end_time + self._FINISHED_QUIZ_GRACE)
+        return inactivity_deadline, deadline
+    
+    def _register_quiz(self, session_key: Tuple[int, int], quiz: ActiveQuiz) -> None:
+        """Make a quiz the channel's active quiz and track it for expiry."""
+        self.active_quizzes[session_key] = quiz
+        self._schedule_expiry(session_key, quiz)
+    
+    def _schedule_expiry(self, session_key: Tuple[int, int], quiz: ActiveQuiz) -> None:
+        """Track a quiz so it is cleaned up once it expires, or shortly after it finishes."""
+        _, deadline = self._quiz_deadlines(quiz)
+        heapq.heappush(self._expiry_heap, (deadline, session_key, quiz.quiz_id))
+        # Wake the expiry loop if this is now the earliest deadline
+        if self._expiry_heap[0][2] == quiz.quiz_id:
+            self._expiry_wakeup.set()
+    
+    async def _expiry_loop(self) -> None:
+        """Sleep until the next quiz deadline and clean up whatever has expired."""
+        await self.bot.wait_until_ready()
+        
+        while True:
+            self._expiry_wakeup.clear()
+            if self._expiry_heap:
+                delay = self._expiry_heap[0][0] - time.time()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._expiry_wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+            else:
+                await self._expiry_wakeup.wait()
+            
+            try:
+                await self.cleanup_expired_quizzes()
+            except Exception as e:
+                self.logger.error(f"Error cleaning up expired quizzes: {e}")
+    
     async def cleanup_expired_quizzes(self):
-        """Clean up expired quizzes."""
+        """Clean up quizzes whose deadlines have passed."""
         current_time = time.time()
-        expired_sessions = []
+        heap = self._expiry_heap
         
-        for (guild_id, channel_id), quiz in self.active_quizzes.items():
-            # Check if the quiz is finished
-            if quiz.is_finished: 
-                expired_sessions.append((guild_id, channel_id))
-                if quiz.timer_task:
-                    quiz.timer_task.cancel()
-                continue
-                
-            # Check for inactivity (30 minutes)
-            inactive_time = current_time - quiz.last_activity_time
-            if inactive_time > 1800:  # 30 minutes of inactivity
-                self.logger.info(f"Quiz in guild {guild_id}, channel {channel_id} abandoned due to inactivity (last activity: {inactive_time/60:.1f} minutes ago)")
-                expired_sessions.append((guild_id, channel_id))
-                if quiz.timer_task:
-                    quiz.timer_task.cancel()
-                
-                # Try to send an inactivity message
-                try:
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        async with channel.typing():
-                            await channel.send("⏰ Quiz has been canceled due to inactivity (30 minutes without activity).")
-                except Exception as e:
-                    self.logger.error(f"Error sending inactivity message: {e}")
+        while heap and heap[0][0] <= current_time:
+            _, session_key, quiz_id = heapq.heappop(heap)
+            quiz = self.active_quizzes.get(session_key)
+            # Already ended, or the channel has moved on to another quiz
+            if quiz is None or quiz.quiz_id != quiz_id:
                 continue
+            
+            guild_id, channel_id = session_key
+            if not quiz.is_finished:
+                inactivity_deadline, deadline = self._quiz_deadlines(quiz)
+                if deadline > current_time:
+                    # There has been activity since this entry was pushed
+                    heapq.heappush(heap, (deadline, session_key, quiz_id))
+                    continue
                 
-            # Check if it's been running too long (1 hour max total time)
-            if (current_time - quiz.start_time) > 3600:  # 1 hour timeout
-                expired_sessions.append((guild_id, channel_id))
-                if quiz.timer_task:
-                    quiz.timer_task.cancel()
-        
-        # Remove all expired sessions
-        for session_key in expired_sessions:
-            if session_key in self.active_quizzes:
+                # Check for inactivity (30 minutes)
+                if inactivity_deadline <= current_time:
+                    inactive_time = current_time - quiz.last_activity_time
+                    self.logger.info(f"Quiz in guild {guild_id}, channel {channel_id} abandoned due to inactivity (last activity: {inactive_time/60:.1f} minutes ago)")
+                    
+                    # Try to send an inactivity message
+                    try:
+                        channel = self.bot.get_channel(channel_id)
+                        if channel:
+                            async with channel.typing():
+                                await channel.send("⏰ Quiz has been canceled due to inactivity (30 minutes without activity).")
+                    except Exception as e:
+                        self.logger.error(f"Error sending inactivity message: {e}")
+            
+            # Finished, inactive or running past the 1 hour maximum
+            if quiz.timer_task:
+                quiz.timer_task.cancel()
+            if self.active_quizzes.get(session_key) is quiz:
                 del self.active_quizzes[session_key]
-                guild_id, channel_id = session_key
                 self.logger.info(f"Cleaned up expired quiz in guild {guild_id}, channel {channel_id}")
     
-    @cleanup_expired_quizzes.before_loop
-    async def before_cleanup(self):
-        """Wait until the bot is ready before starting the task loop."""
-        await self.bot.wait_until_ready()
-    
     async def _topic_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         """Provide autocomplete suggestions for quiz topics."""
-        # Popular topics from various categories
-        all_topics = [
-            # Science & Technology
-            "Python Programming", "JavaScript", "Web Development", "Machine Learning", "Data Science",
-            "Space Exploration", "Artificial Intelligence", "Biology", "Chemistry", "Physics",
-            "Computer Science", "Environmental Science", "Astronomy", "Robotics", "Quantum Physics",
-            
-            # History & Geography
-            "World History", "Ancient Civilizations", "Geography", "American History", "European History",
-            "World War II", "Ancient Egypt", "Medieval Times", "Renaissance", "Cold War",
-            
-            # Entertainment & Pop Culture
-            "Movies", "Music", "Video Games", "Marvel Comics", "Star Wars", "Harry Potter",
-            "Lord of the Rings", "Television Shows", "90s Culture", "Disney",
-            
-            # Sports & Games
-            "Football", "Basketball", "Olympics", "Soccer", "Baseball", "Chess", "Board Games",
-            "Tennis", "Golf", "Cricket",
-            
-            # Literature & Arts
-            "Classic Literature", "Poetry", "Shakespeare", "Modern Literature", "Art History",
-            "Famous Artists", "Architecture", "Book Characters", "Mythology",
-            
-            # General Knowledge
-            "General Knowledge", "Trivia", "Current Events", "Famous People", "Capital Cities",
-            "Languages", "Inventions", "Food & Cooking", "Animals", "Nature"
-        ]
-        
         # Filter topics based on current input (case-insensitive)
         current_lower = current.lower()
+        if not current_lower:
+            return list(_DEFAULT_CHOICES)
+        
+        # Topics starting with the current string come first, then other matches
         matching_topics = [
-            topic for topic in all_topics 
-            if current_lower in topic.lower()
+            topic for topic_lower, topic in _TOPICS_BY_PREFIX.get(current_lower[0], ())
+            if topic_lower.startswith(current_lower)
         ]
-        
-        # Sort by relevance (topics starting with the current string come first)
-        matching_topics.sort(key=lambda x: (not x.lower().startswith(current_lower), x))
+        if len(matching_topics) < 25:
+            for topic_lower, topic in _TOPICS_LOWER:
+                if current_lower in topic_lower and not topic_lower.startswith(current_lower):
+                    matching_topics.append(topic)
+                    if len(matching_topics) == 25:
+                        break
         
         # Return up to 25 choices (Discord's limit)
-        return [
-            app_commands.Choice(name=topic, value=topic)
-            for topic in matching_topics[:25]
-        ]
+        return [_TOPIC_CHOICES[topic] for topic in matching_topics[:25]]
     
     # === QUIZ COMMANDS ===
     
@@ -276,7 +387,7 @@ class QuizCog(BaseCog, name="Quiz"):
             return
         
         # Validate provider
-        available_providers = llm_service.get_available_providers()
+        available_providers = self._get_providers_cached()
         if provider not in available_providers:
             providers_list = ", ".join(f"`{p}`" for p in available_providers)
             if isinstance(ctx, discord.Interaction):
@@ -288,10 +399,9 @@ class QuizCog(BaseCog, name="Quiz"):
             return
         
         # Validate template
-        available_templates = quiz_generator.get_available_quiz_types()
-        template_names = [t['name'] for t in available_templates]
+        available_templates, template_names = self._get_templates_cached()
         if template not in template_names:
-            templates_list = ", ".join(f"`{t}`" for t in template_names)
+            templates_list = ", ".join(f"`{t['name']}`" for t in available_templates)
             if isinstance(ctx, discord.Interaction):
                 async with ctx.channel.typing():
                     await ctx.followup.send(f"❌ Invalid template. Available templates: {templates_list}")
@@ -357,8 +467,8 @@ class QuizCog(BaseCog, name="Quiz"):
             
             # Store using composite key
             session_key = (guild_id, channel_id)
-            self.active_quizzes[session_key] = quiz
             quiz.state = QuizState.ACTIVE
+            self._register_quiz(session_key, quiz)
             
             # Store recovery data
             self._save_session_recovery_data(quiz)
@@ -441,8 +551,7 @@ class QuizCog(BaseCog, name="Quiz"):
             return
         
         # Stop the quiz
-        quiz.state = QuizState.FINISHED
-        quiz.end_time = time.time()
+        quiz.finish()
         
         if quiz.timer_task:
             quiz.timer_task.cancel()
@@ -459,7 +568,7 @@ class QuizCog(BaseCog, name="Quiz"):
     @quiz_group.command(name="providers", description="Show available LLM providers.")
     async def quiz_providers(self, ctx: commands.Context):
         """Show available LLM providers for quiz generation."""
-        providers = llm_service.get_available_providers()
+        providers = self._get_providers_cached()
         
         if not providers:
             async with ctx.typing():
@@ -492,7 +601,7 @@ class QuizCog(BaseCog, name="Quiz"):
     @quiz_group.command(name="templates", description="Show available quiz templates.")
     async def quiz_templates(self, ctx: commands.Context):
         """Show available quiz templates for generation."""
-        templates = quiz_generator.get_available_quiz_types()
+        templates, _ = self._get_templates_cached()
         
         if not templates:
             async with ctx.typing():
@@ -717,10 +826,12 @@ class QuizCog(BaseCog, name="Quiz"):
         if quiz.next_question():
             await self._send_question(ctx, quiz)
         else:
-            await self._send_final_results(ctx, quiz)
             guild_id = ctx.guild.id if ctx.guild else 0
             channel_id = ctx.channel.id
             session_key = (guild_id, channel_id)
+            # Make sure the finished quiz is dropped soon even if sending the results fails
+            self._schedule_expiry(session_key, quiz)
+            await self._send_final_results(ctx, quiz)
             if session_key in self.active_quizzes:
                 del self.active_quizzes[session_key]
                 # Remove from recovery data
@@ -729,7 +840,7 @@ class QuizCog(BaseCog, name="Quiz"):
     
     async def _send_final_results(self, ctx: commands.Context, quiz: ActiveQuiz):
         """Send final quiz results."""
-        leaderboard = quiz.get_leaderboard()
+        leaderboard = quiz.get_leaderboard_entries(10)
         stats = quiz.get_stats()
         
         # Create results embed
@@ -747,24 +858,24 @@ class QuizCog(BaseCog, name="Quiz"):
         # Add leaderboard
         if leaderboard:
             leaderboard_text = ""
-            for i, entry in enumerate(leaderboard[:10]):  # Top 10
+            for i, entry in enumerate(leaderboard):  # Top 10
                 # Get user object
                 try:
-                    user = self.bot.get_user(entry['user_id']) or await self.bot.fetch_user(entry['user_id'])
+                    user = self.bot.get_user(entry.user_id) or await self.bot.fetch_user(entry.user_id)
                     username = user.display_name
                 except:
-                    username = entry['username']
+                    username = entry.username
                 
                 medal = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}."
-                xp_earned = entry['correct_answers'] * 10  # Calculate XP earned
+                xp_earned = entry.correct_answers * 10  # Calculate XP earned
                 
                 # Add XP to the leaderboard entry
                 formatted_entry = format_leaderboard_entry(
                     position=medal,
                     username=username,
-                    score=entry['score'],
-                    correct=entry['correct_answers'],
-                    total=entry['total_answers']
+                    score=entry.score,
+                    correct=entry.correct_answers,
+                    total=entry.total_answers
                 )
                 leaderboard_text += f"{formatted_entry} • +{xp_earned} XP\n"
             
@@ -772,7 +883,7 @@ class QuizCog(BaseCog, name="Quiz"):
                 embed.add_field(name="🏆 Leaderboard", value=leaderboard_text, inline=False)
         
         # Calculate total XP awarded
-        total_xp = sum(entry['correct_answers'] * 10 for entry in leaderboard) if leaderboard else 0
+        total_xp = stats['correct_answers'] * 10
         
         # Add duration
         duration = timedelta(seconds=int(stats['duration']))
@@ -879,11 +990,13 @@ class QuizCog(BaseCog, name="Quiz"):
             if quiz.next_question():
                 await self._send_question(message.channel, quiz)
             else:
-                await self._send_final_results(message.channel, quiz)
                 # Get guild ID (or use 0 for DMs)
                 guild_id = message.guild.id if message.guild else 0
                 channel_id = message.channel.id
                 session_key = (guild_id, channel_id)
+                # Make sure the finished quiz is dropped soon even if sending the results fails
+                self._schedule_expiry(session_key, quiz)
+                await self._send_final_results(message.channel, quiz)
                 if session_key in self.active_quizzes:
                     del self.active_quizzes[session_key]
                     # Remove from recovery data
@@ -976,10 +1089,12 @@ class QuizCog(BaseCog, name="Quiz"):
                 if quiz.next_question():
                     await self._send_question(channel, quiz)
                 else:
-                    await self._send_final_results(channel, quiz)
                     guild_id = channel.guild.id if hasattr(channel, 'guild') and channel.guild else 0
                     channel_id = payload.channel_id
                     session_key = (guild_id, channel_id)
+                    # Make sure the finished quiz is dropped soon even if sending the results fails
+                    self._schedule_expiry(session_key, quiz)
+                    await self._send_final_results(channel, quiz)
                     if session_key in self.active_quizzes:
                         del self.active_quizzes[session_key]
                         # Remove from recovery data
@@ -1,20 +1,56 @@
 """Guild-specific database operations."""
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import json
 
 logger = logging.getLogger(__name__)
 
 
+# Setting keys kept in their own guild_settings columns -> column name in db/schema.sql
+_SETTING_COLUMNS = {
+    "quiz_channel_id": "quiz_channel_id",
+    "trivia_channel_id": "trivia_channel_id",
+    "admin_role_id": "admin_role_id",
+    "notification_channel_id": "announcement_channel_id",
+    "default_quiz_difficulty": "default_quiz_difficulty",
+    "default_question_count": "default_question_count",
+    "trivia_timeout": "default_quiz_timeout",
+    "allow_custom_quizzes": "enable_custom_quizzes",
+    "allow_leaderboards": "enable_leaderboards",
+}
+_ID_SETTINGS = frozenset({"quiz_channel_id", "trivia_channel_id", "admin_role_id", "notification_channel_id"})
+_INT_SETTINGS = frozenset({"default_question_count", "trivia_timeout"})
+_BOOL_SETTINGS = frozenset({"allow_custom_quizzes", "allow_leaderboards"})
+
+
+def _as_bool(value: Any) -> bool:
+    """Read a feature flag value, accepting native bools or legacy "true"/"false" strings."""
+    return value if isinstance(value, bool) else str(value).lower() == "true"
+
+
+def _column_value(setting_key: str, setting_value: Any) -> Any:
+    """Convert a setting value to the type of its guild_settings column."""
+    if setting_key in _ID_SETTINGS:
+        return int(setting_value) if setting_value else None
+    if setting_key in _INT_SETTINGS:
+        return int(setting_value)
+    if setting_key in _BOOL_SETTINGS:
+        return _as_bool(setting_value)
+    return setting_value
+
+
 async def get_guild_settings(db_service, guild_id: int) -> Dict[str, Any]:
     """Get all settings for a guild."""
     query = """
         SELECT settings, quiz_channel_id, trivia_channel_id, admin_role_id,
-               notification_channel_id, default_quiz_difficulty, default_question_count,
-               trivia_timeout, allow_custom_quizzes, allow_leaderboards
+               announcement_channel_id AS notification_channel_id,
+               default_quiz_difficulty, default_question_count,
+               default_quiz_timeout AS trivia_timeout,
+               enable_custom_quizzes AS allow_custom_quizzes,
+               enable_leaderboards AS allow_leaderboards
         FROM guild_settings
-        WHERE guild_id = %s
+        WHERE guild_id = $1
     """
     
     async with db_service.pool.acquire() as conn:
@@ -37,13 +73,16 @@ async def get_guild_settings(db_service, guild_id: int) -> Dict[str, Any]:
                 "feature_leaderboard": True
             }
         
-        # Merge JSON settings with column values
+        # Merge JSON settings with column values; asyncpg hands JSONB back as text
         settings = row['settings'] or {}
+        if isinstance(settings, str):
+            settings = json.loads(settings)
         settings.update({
-            "quiz_channel_id": str(row['quiz_channel_id']) if row['quiz_channel_id'] else None,
-            "trivia_channel_id": str(row['trivia_channel_id']) if row['trivia_channel_id'] else None,
-            "admin_role_id": str(row['admin_role_id']) if row['admin_role_id'] else None,
-            "notification_channel_id": str(row['notification_channel_id']) if row['notification_channel_id'] else None,
+            # ID columns are BIGINTs, so hand them back as ints rather than strings
+            "quiz_channel_id": row['quiz_channel_id'] or None,
+            "trivia_channel_id": row['trivia_channel_id'] or None,
+            "admin_role_id": row['admin_role_id'] or None,
+            "notification_channel_id": row['notification_channel_id'] or None,
             "default_quiz_difficulty": row['default_quiz_difficulty'],
             "default_question_count": row['default_question_count'],
             "trivia_timeout": row['trivia_timeout'],
@@ -54,13 +93,13 @@ async def get_guild_settings(db_service, guild_id: int) -> Dict[str, Any]:
         return settings
 
 
-async def set_guild_setting(db_service, guild_id: int, setting_key: str, setting_value: Any) -> bool:
-    """Set a specific guild setting."""
+async def set_guild_setting(db_service, guild_id: int, setting_key: str, setting_value: Union[int, bool, str, None]) -> bool:
+    """Set a specific guild setting; IDs may be passed as ints and feature flags as bools."""
     try:
         # First, ensure guild exists in settings table
         insert_query = """
             INSERT INTO guild_settings (guild_id, settings)
-            VALUES (%s, %s)
+            VALUES ($1, $2)
             ON CONFLICT (guild_id) DO NOTHING
         """
         
@@ -68,26 +107,14 @@ async def set_guild_setting(db_service, guild_id: int, setting_key: str, setting
             await conn.execute(insert_query, guild_id, json.dumps({}))
             
             # Update based on the setting key
-            if setting_key in ["quiz_channel_id", "trivia_channel_id", "admin_role_id", "notification_channel_id"]:
+            if setting_key in _SETTING_COLUMNS:
                 # These are direct columns
                 update_query = f"""
                     UPDATE guild_settings
-                    SET {setting_key} = %s, updated_at = NOW()
-                    WHERE guild_id = %s
+                    SET {_SETTING_COLUMNS[setting_key]} = $1, updated_at = NOW()
+                    WHERE guild_id = $2
                 """
-                await conn.execute(update_query, int(setting_value) if setting_value else None, guild_id)
-            
-            elif setting_key in ["default_quiz_difficulty", "default_question_count", "trivia_timeout"]:
-                # These are also direct columns
-                update_query = f"""
-                    UPDATE guild_settings
-                    SET {setting_key} = %s, updated_at = NOW()
-                    WHERE guild_id = %s
-                """
-                value = setting_value
-                if setting_key in ["default_question_count", "trivia_timeout"]:
-                    value = int(value)
-                await conn.execute(update_query, value, guild_id)
+                await conn.execute(update_query, _column_value(setting_key, setting_value), guild_id)
             
             elif setting_key.startswith("feature_"):
                 # These go in the JSON settings
@@ -95,16 +122,16 @@ async def set_guild_setting(db_service, guild_id: int, setting_key: str, setting
                     UPDATE guild_settings
                     SET settings = jsonb_set(
                         COALESCE(settings, '{}'::jsonb),
-                        %s,
-                        %s::jsonb
+                        $1,
+                        $2::jsonb
                     ),
                     updated_at = NOW()
-                    WHERE guild_id = %s
+                    WHERE guild_id = $3
                 """
                 await conn.execute(
                     update_query,
                     [setting_key],
-                    json.dumps(setting_value == "true"),
+                    json.dumps(_as_bool(setting_value)),
                     guild_id
                 )
             
@@ -114,11 +141,11 @@ async def set_guild_setting(db_service, guild_id: int, setting_key: str, setting
                     UPDATE guild_settings
                     SET settings = jsonb_set(
                         COALESCE(settings, '{}'::jsonb),
-                        %s,
-                        %s::jsonb
+                        $1,
+                        $2::jsonb
                     ),
                     updated_at = NOW()
-                    WHERE guild_id = %s
+                    WHERE guild_id = $3
                 """
                 await conn.execute(
                     update_query,
@@ -134,6 +161,43 @@ async def set_guild_setting(db_service, guild_id: int, setting_key: str, setting
         return False
 
 
+async def set_guild_settings_bulk(db_service, guild_id: int, settings: Dict[str, Any]) -> bool:
+    """Set several guild settings in a single upsert."""
+    try:
+        columns = {}
+        json_settings = {}
+        for setting_key, setting_value in settings.items():
+            if setting_key in _SETTING_COLUMNS:
+                columns[_SETTING_COLUMNS[setting_key]] = _column_value(setting_key, setting_value)
+            elif setting_key.startswith("feature_"):
+                json_settings[setting_key] = _as_bool(setting_value)
+            else:
+                json_settings[setting_key] = setting_value
+        
+        column_names = list(columns)
+        insert_columns = ", ".join(["guild_id", "settings"] + column_names)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(column_names) + 3))
+        column_updates = "".join(f"{name} = EXCLUDED.{name}, " for name in column_names)
+        
+        # One statement creates the row if needed and merges every pending value
+        upsert_query = f"""
+            INSERT INTO guild_settings ({insert_columns})
+            VALUES ({placeholders})
+            ON CONFLICT (guild_id) DO UPDATE
+            SET {column_updates}settings = COALESCE(guild_settings.settings, '{{}}'::jsonb) || EXCLUDED.settings,
+                updated_at = NOW()
+        """
+        
+        async with db_service.pool.acquire() as conn:
+            await conn.execute(upsert_query, guild_id, json.dumps(json_settings), *columns.values())
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error bulk setting guild settings: {e}")
+        return False
+
+
 async def get_guild_leaderboard(db_service, guild_id: int, limit: int = 10) -> List[Dict[str, Any]]:
     """Get the top performers in a guild."""
     query = """
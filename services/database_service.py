@@ -938,6 +938,21 @@ class DatabaseService(UserStatsService):
             logger.error(f"Failed to add guild member {user_id} to guild {guild_id}: {e}")
             return False
     
+    async def get_guild_settings(self, guild_id: int) -> Dict[str, Any]:
+        """Get all settings for a guild, falling back to defaults for unknown guilds."""
+        from services.database_operations.guild_ops import get_guild_settings
+        return await get_guild_settings(self, guild_id)
+    
+    async def set_guild_setting(self, guild_id: int, setting_key: str, setting_value: Any) -> bool:
+        """Set a single guild setting."""
+        from services.database_operations.guild_ops import set_guild_setting
+        return await set_guild_setting(self, guild_id, setting_key, setting_value)
+    
+    async def set_guild_settings_bulk(self, guild_id: int, settings: Dict[str, Any]) -> bool:
+        """Set several guild settings in one upsert."""
+        from services.database_operations.guild_ops import set_guild_settings_bulk
+        return await set_guild_settings_bulk(self, guild_id, settings)
+    
     async def cache_query_result(self, key: str, data: str, expires_in_seconds: int = 300) -> bool:
         """
         Cache a query result.
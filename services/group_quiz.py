@@ -1,5 +1,6 @@
 import discord
 import asyncio
+import heapq
 import logging
 import random
 from typing import Dict, List, Optional, Union, Any, Set, Tuple
@@ -12,6 +13,25 @@ logger = logging.getLogger("bot.group_quiz")
 class GroupQuizSession:
     """Manages a group quiz session that works like a trivia game."""
     
+    # Lifecycle states, kept in one int so a single read gives a consistent view
+    STATUS_ACTIVE = 0
+    STATUS_STOPPING = 1
+    STATUS_FINISHED = 2
+    STATUS_PENDING = 3  # Created but not started yet
+    
+    # Fixed attribute layout: no per-session __dict__, and typos in attribute writes fail loudly
+    __slots__ = (
+        "guild_id", "channel_id", "host_id", "topic", "questions", "timeout",
+        "time_between_questions", "max_participants", "provider_info",
+        "single_answer_mode", "is_private",
+        "participants", "current_question_idx", "_status", "start_time", "end_time",
+        "_start_monotonic", "stop_permissions", "end_task",
+        "current_answers", "current_question_message_id", "current_question_message",
+        "question_timer", "correct_answerers_this_question", "results_message_sent",
+        "_timer_cancelled", "_cancel_event",
+        "_scored_question", "_sorted_leaderboard", "_score_version", "_cached_leaderboard_embed"
+    )
+    
     def __init__(
         self, 
         guild_id: int,
@@ -41,17 +61,28 @@ class GroupQuizSession:
         # Session data
         self.participants: Dict[int, Any] = {}  # user_id -> {score, correct_answers, etc.}
         self.current_question_idx = 0
-        self.is_active = False
+        self._status = self.STATUS_PENDING
         self.start_time = None
         self.end_time = None
+        self._start_monotonic: Optional[float] = None  # time.monotonic() at start, for durations
+        self.stop_permissions: Dict[int, bool] = {host_id: True}  # user_id -> may stop, cached for the session
+        self.end_task: Optional[asyncio.Task] = None  # Background results task started by the stop command
         
         # Question tracking
         self.current_answers: Dict[int, str] = {}  # user_id -> answer
         self.current_question_message_id = None
+        self.current_question_message: Optional[discord.Message] = None  # Sent question, kept for editing
         self.question_timer = None
         self.correct_answerers_this_question: Set[int] = set()  # Track users who've already answered correctly
         self.results_message_sent = False # Flag to prevent duplicate result messages
         self._timer_cancelled = False  # Flag for timer cancellation
+        self._cancel_event = asyncio.Event()  # Set alongside _timer_cancelled to wake sleeping timers
+        
+        # Scoring caches, rebuilt only when scores or participants change
+        self._scored_question: Optional[Tuple[int, List[Dict[str, Any]], Dict[str, Any]]] = None  # (question_idx, correct_responders, progress)
+        self._sorted_leaderboard: Optional[List[Dict[str, Any]]] = None
+        self._score_version = 0  # Bumped whenever scores or participants change
+        self._cached_leaderboard_embed: Optional[Tuple[int, Embed]] = None  # (score_version, embed)
     
     @property
     def current_question(self) -> Optional[Any]:
@@ -60,6 +91,15 @@ class GroupQuizSession:
             return self.questions[self.current_question_idx]
         return None
     
+    @property
+    def is_active(self) -> bool:
+        """Check if the session is running and accepting answers."""
+        return self._status == self.STATUS_ACTIVE
+    
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        self._status = self.STATUS_ACTIVE if value else self.STATUS_FINISHED
+    
     @property
     def is_finished(self) -> bool:
         """Check if the quiz is finished."""
@@ -70,6 +110,37 @@ class GroupQuizSession:
         """Get the number of remaining questions."""
         return max(0, len(self.questions) - self.current_question_idx - 1)
     
+    def stop(self) -> bool:
+        """Move an active session to stopping and cancel its timers; False if it was not active."""
+        if self._status != self.STATUS_ACTIVE:
+            return False
+        self._status = self.STATUS_STOPPING
+        self.cancel_timer()
+        return True
+    
+    def cancel_timer(self) -> None:
+        """Cancel the current question's timers, waking any that are sleeping."""
+        self._timer_cancelled = True
+        self._cancel_event.set()
+    
+    def reset_timer(self) -> None:
+        """Re-arm the timer state for a new question."""
+        self._timer_cancelled = False
+        self._cancel_event.clear()
+    
+    @property
+    def timer_cancelled(self) -> bool:
+        """Check whether the current question's timers have been cancelled."""
+        return self._timer_cancelled
+    
+    async def wait_cancelled(self, timeout: float) -> bool:
+        """Sleep for up to ``timeout`` seconds, returning True as soon as the timers are cancelled."""
+        try:
+            await asyncio.wait_for(self._cancel_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     def register_participant(self, user_id: int, username: str) -> bool:
         """Register a participant for the quiz session."""
         if len(self.participants) >= self.max_participants:
@@ -83,12 +154,14 @@ class GroupQuizSession:
                 "incorrect_answers": 0,
                 "response_times": []
             }
+            self._sorted_leaderboard = None
+            self._score_version += 1
             return True
         return False
     
     def record_answer(self, user_id: int, answer: str, response_time: float) -> bool:
         """Record a user's answer to the current question and determine if it's correct."""
-        if user_id not in self.participants or self.is_finished or not self.current_question:
+        if self._status != self.STATUS_ACTIVE or user_id not in self.participants or self.is_finished or not self.current_question:
             return False # Indicates failure to record or no basis for correctness
 
         # Record the answer and response time regardless of correctness
@@ -303,25 +376,70 @@ class GroupQuizSession:
         # Clear current answers for next question
         self.current_answers = {}
         
+        # Scores changed, so cache this question's results and drop the stale ordering
+        self._sorted_leaderboard = None
+        self._score_version += 1
+        self._scored_question = (self.current_question_idx, correct_responders, self.get_progress_info())
+        
         return correct_responders
     
+    def snapshot(self, limit: int = 5) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+        """Score the current question once and return (correct_responders, leaderboard, progress)."""
+        scored = self._scored_question
+        if scored is None or scored[0] != self.current_question_idx:
+            correct_responders = self.calculate_scores()
+            # Built here rather than read back from calculate_scores, which leaves the cache
+            # untouched when there is nothing to score
+            scored = (self.current_question_idx, correct_responders, self.get_progress_info())
+            self._scored_question = scored
+        
+        _, correct_responders, progress = scored
+        return correct_responders, self.get_leaderboard(limit), progress
+    
+    def get_cached_leaderboard_embed(self) -> Optional[Embed]:
+        """Return the cached leaderboard embed if scores haven't changed since it was built."""
+        cached = self._cached_leaderboard_embed
+        if cached is not None and cached[0] == self._score_version:
+            return cached[1]
+        return None
+    
+    def cache_leaderboard_embed(self, embed: Embed) -> None:
+        """Cache a leaderboard embed for the current score version."""
+        self._cached_leaderboard_embed = (self._score_version, embed)
+    
     def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get the current leaderboard for this quiz session."""
-        leaderboard = [
-            {
-                "user_id": user_id,
-                "username": data["username"],
-                "score": data["score"],
-                "correct": data["correct_answers"],
-                "incorrect": data["incorrect_answers"]
-            }
-            for user_id, data in self.participants.items()
-        ]
-        
-        # Sort by score (highest first)
-        leaderboard.sort(key=lambda x: x["score"], reverse=True)
-        
-        return leaderboard[:limit]
+        if self._sorted_leaderboard is None:
+            self._sorted_leaderboard = self._build_leaderboard()
+        return self._sorted_leaderboard[:limit]
+    
+    def get_top(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Get the top ``k`` leaderboard entries without sorting every participant."""
+        # nlargest ranks exactly like a reverse sort with the same key, so this matches get_leaderboard
+        top = heapq.nlargest(k, self.participants.items(), key=self._ranking_key)
+        return [self._leaderboard_entry(user_id, data) for user_id, data in top]
+    
+    @staticmethod
+    def _ranking_key(item: Tuple[int, Dict[str, Any]]) -> Tuple[int, int]:
+        """Rank participants by score, then by correct answers (highest first)."""
+        data = item[1]
+        return data["score"], data["correct_answers"]
+    
+    @staticmethod
+    def _leaderboard_entry(user_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a single leaderboard entry from a participant's data."""
+        return {
+            "user_id": user_id,
+            "username": data["username"],
+            "score": data["score"],
+            "correct": data["correct_answers"],
+            "incorrect": data["incorrect_answers"]
+        }
+    
+    def _build_leaderboard(self) -> List[Dict[str, Any]]:
+        """Build the full leaderboard sorted by score, then correct answers (highest first)."""
+        ranked = sorted(self.participants.items(), key=self._ranking_key, reverse=True)
+        return [self._leaderboard_entry(user_id, data) for user_id, data in ranked]
     
     def next_question(self) -> Optional[Any]:
         """Move to the next question and return it."""
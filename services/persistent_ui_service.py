@@ -329,13 +329,16 @@ class PersistentUIService:
     
     async def get_button_analytics(
         self, 
-        hours: int = 24
+        hours: int = 24,
+        top_n: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Get button interaction analytics.
         
         Args:
             hours: Number of hours to look back
+            top_n: If set, only return the top N handler classes by interaction
+                count, aggregated across interaction types
             
         Returns:
             Analytics data dictionary
@@ -343,15 +346,27 @@ class PersistentUIService:
         try:
             async with self.database._connection_pool.acquire() as conn:
                 # Get interaction counts by handler
-                handler_stats = await conn.fetchall("""
-                    SELECT handler_class, interaction_type, 
-                           COUNT(*) as count,
-                           AVG(response_time_ms) as avg_response_time
-                    FROM button_interaction_logs 
-                    WHERE created_at > NOW() - INTERVAL '%s hours'
-                    GROUP BY handler_class, interaction_type
-                    ORDER BY count DESC
-                """, (hours,))
+                if top_n is None:
+                    handler_stats = await conn.fetchall("""
+                        SELECT handler_class, interaction_type, 
+                               COUNT(*) as count,
+                               AVG(response_time_ms) as avg_response_time
+                        FROM button_interaction_logs 
+                        WHERE created_at > NOW() - INTERVAL '%s hours'
+                        GROUP BY handler_class, interaction_type
+                        ORDER BY count DESC
+                    """, (hours,))
+                else:
+                    handler_stats = await conn.fetchall("""
+                        SELECT handler_class,
+                               COUNT(*) as count,
+                               AVG(response_time_ms) as avg_response_time
+                        FROM button_interaction_logs 
+                        WHERE created_at > NOW() - INTERVAL '%s hours'
+                        GROUP BY handler_class
+                        ORDER BY count DESC
+                        LIMIT %s
+                    """, (hours, top_n))
                 
                 # Get error rates
                 error_stats = await conn.fetchall("""
@@ -314,10 +314,13 @@ class UIRecoveryService:
         """Wait for bot to be ready before starting cleanup task."""
         await self.bot.wait_until_ready()
     
-    async def get_recovery_status(self) -> Dict[str, Any]:
+    async def get_recovery_status(self, include_analytics: bool = True) -> Dict[str, Any]:
         """
         Get current recovery status and statistics.
         
+        Args:
+            include_analytics: Whether to also fetch the last 24h of button analytics
+        
         Returns:
             Recovery status dictionary
         """
@@ -326,16 +329,18 @@ class UIRecoveryService:
             current_buttons = await self.ui_service.recover_persistent_buttons()
             active_count = len(current_buttons)
             
-            # Get analytics
-            analytics = await self.ui_service.get_button_analytics(hours=24)
-            
-            return {
+            status = {
                 'recovery_stats': self.recovery_stats,
                 'current_active_buttons': active_count,
-                'analytics': analytics,
                 'cleanup_task_running': self.cleanup_task.is_running()
             }
             
+            # Get analytics
+            if include_analytics:
+                status['analytics'] = await self.ui_service.get_button_analytics(hours=24)
+            
+            return status
+            
         except Exception as e:
             self.logger.error(f"Error getting recovery status: {e}")
             return {'error': str(e)}
@@ -85,7 +85,11 @@ class ComprehensiveTestRunner:
                 'description': 'Tests Discord bot cog functionality',
                 'tests': [
                     ('test_cog_functionality.py', 'Cog loading and functionality', False),
-                    ('test_multi_guild_quizzes.py', 'Multi-guild functionality', False)
+                    ('test_multi_guild_quizzes.py', 'Multi-guild functionality', False),
+                    ('test_quiz_models.py', 'Quiz model scoring and ranking', False),
+                    ('test_group_quiz_session.py', 'Group quiz session scoring', False),
+                    ('test_batched_writes.py', 'Batched settings and preference writes', False),
+                    ('test_quiz_expiry.py', 'Quiz expiry', False)
                 ],
                 'required': False
             },
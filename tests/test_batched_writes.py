@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Batched Settings Write Test for Educational Quiz Bot
+
+This test checks that guild settings and user preferences updates are
+batched into single database writes and that failed writes are reported,
+using a mocked database service.
+
+Usage:
+    python tests/test_batched_writes.py
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+from discord.ext import commands
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("batched_writes_test")
+
+
+class BatchedWritesTester:
+    """Test batched settings and preference writes."""
+
+    def __init__(self):
+        self.errors: List[str] = []
+
+    async def run_all_tests(self) -> bool:
+        """Run all batched write tests."""
+        logger.info("=" * 60)
+        logger.info("Educational Quiz Bot - Batched Write Test")
+        logger.info("=" * 60)
+
+        tests = [
+            self.test_guild_settings_flush_failure,
+            self.test_guild_setting_command_reports_failure,
+            self.test_preference_writes_coalesce,
+        ]
+
+        all_passed = True
+        for test in tests:
+            try:
+                if not await test():
+                    all_passed = False
+            except Exception as e:
+                logger.error(f"❌ Test {test.__name__} failed with exception: {e}")
+                import traceback
+                traceback.print_exc()
+                all_passed = False
+
+        # Show summary
+        self._show_summary()
+        return all_passed and len(self.errors) == 0
+
+    def _check(self, condition: bool, message: str) -> bool:
+        """Record an error if a condition doesn't hold."""
+        if not condition:
+            self.errors.append(f"❌ {message}")
+            logger.error(f"❌ {message}")
+        return condition
+
+    async def test_guild_settings_flush_failure(self) -> bool:
+        """Test that a failed guild settings batch is reported to every waiter and not left queued."""
+        logger.info("\n🏰 Testing guild settings flush failure...")
+
+        from cogs.guild_preferences import GuildSettingsWriter
+
+        db_service = MagicMock()
+        db_service.set_guild_settings_bulk = AsyncMock(side_effect=[False, True])
+        writer = GuildSettingsWriter(db_service, logger, flush_interval=0.01)
+
+        first = writer.enqueue(1, "quiz_channel_id", 111)
+        second = writer.enqueue(1, "admin_role_id", 222)
+        results = await asyncio.gather(first, second)
+
+        passed = True
+        passed &= self._check(results == [False, False], f"Failed batch reported as {results}")
+        passed &= self._check(
+            db_service.set_guild_settings_bulk.await_count == 1,
+            f"Expected one bulk write, got {db_service.set_guild_settings_bulk.await_count}"
+        )
+        passed &= self._check(
+            writer.queued_settings(1) is None,
+            f"Settings still queued after the batch finished: {writer.queued_settings(1)}"
+        )
+
+        # The next batch starts fresh and reports its own outcome
+        saved = await writer.enqueue(1, "quiz_channel_id", 333)
+        passed &= self._check(saved is True, "Retried batch was not reported as saved")
+        passed &= self._check(
+            db_service.set_guild_settings_bulk.await_args.kwargs["settings"] == {"quiz_channel_id": 333},
+            f"Retried batch carried {db_service.set_guild_settings_bulk.await_args.kwargs['settings']}"
+        )
+        await writer.close()
+
+        if passed:
+            logger.info("✅ Failed guild settings batch is reported")
+        return passed
+
+    async def test_guild_setting_command_reports_failure(self) -> bool:
+        """Test that a setting command replies at once and reports a failed batch afterwards."""
+        logger.info("\n🏰 Testing guild setting command replies...")
+
+        from cogs.guild_preferences import GuildPreferencesCog, _ERR_SET_QUIZ_CHANNEL
+
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+        cog = GuildPreferencesCog(bot)
+        db_service = MagicMock()
+        db_service.get_guild_settings = AsyncMock(return_value={"quiz_channel_id": None})
+        db_service.set_guild_settings_bulk = AsyncMock(return_value=False)
+        cog.db_service = db_service
+        await cog.get_guild_settings(1)
+
+        ctx = MagicMock()
+        ctx.guild.id = 1
+        ctx.send = AsyncMock()
+        channel = MagicMock()
+        channel.id = 555
+        channel.mention = "#quiz"
+
+        await cog.set_quiz_channel.callback(cog, ctx, channel)
+
+        passed = True
+        passed &= self._check(
+            ctx.send.await_count == 1 and "embed" in ctx.send.await_args.kwargs,
+            f"Command didn't reply with its success embed before the write: {ctx.send.await_args_list}"
+        )
+        passed &= self._check(
+            cog.get_cached_guild_settings(1) == {"quiz_channel_id": 555},
+            f"Cached settings not updated right away: {cog.get_cached_guild_settings(1)}"
+        )
+
+        await cog._settings_writer.close()
+        await asyncio.sleep(0)
+        passed &= self._check(
+            ctx.send.await_args == ((_ERR_SET_QUIZ_CHANNEL,), {}),
+            f"Failed write not reported: {ctx.send.await_args_list}"
+        )
+        passed &= self._check(
+            cog.get_cached_guild_settings(1) is None,
+            "Cached settings kept after the write failed"
+        )
+
+        if passed:
+            logger.info("✅ Setting commands reply first and report failed writes")
+        return passed
+
+    async def test_preference_writes_coalesce(self) -> bool:
+        """Test that rapid preference updates from one user share one database write."""
+        logger.info("\n🎨 Testing preference write coalescing...")
+
+        from cogs.preferences import PreferencesCog
+
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+        cog = PreferencesCog(bot)
+        db_service = MagicMock()
+        db_service.get_user_preferences = AsyncMock(return_value={"difficulty": "medium", "theme": "default"})
+        db_service.set_user_preferences = AsyncMock(return_value=True)
+        cog.db_service = db_service
+
+        results = await asyncio.gather(
+            cog._write_preferences(1, {"theme": "dark"}),
+            cog._write_preferences(1, {"difficulty": "hard"}),
+            cog._write_preferences(1, {"theme": "light"}),
+            cog._write_preferences(2, {"theme": "dark"}),
+        )
+
+        passed = True
+        passed &= self._check(all(results), f"Coalesced writes reported {results}")
+        calls = {call.kwargs["user_id"]: call.kwargs for call in db_service.set_user_preferences.await_args_list}
+        passed &= self._check(
+            db_service.set_user_preferences.await_count == 2,
+            f"Expected one write per user, got {db_service.set_user_preferences.await_count}"
+        )
+        passed &= self._check(
+            calls.get(1) == {"user_id": 1, "theme": "light", "difficulty": "hard"},
+            f"Unexpected merged write for user 1: {calls.get(1)}"
+        )
+        preferences = await cog._get_preferences(1)
+        passed &= self._check(
+            preferences.get("theme") == "light" and preferences.get("difficulty") == "hard",
+            f"Cached preferences not updated: {preferences}"
+        )
+
+        await cog.cog_unload()
+        passed &= self._check(not cog._write_tasks, "Writes still queued after unload")
+
+        if passed:
+            logger.info("✅ Preference writes are coalesced")
+        return passed
+
+    def _show_summary(self) -> None:
+        """Show test summary."""
+        logger.info("\n" + "=" * 60)
+        logger.info("BATCHED WRITE TEST SUMMARY")
+        logger.info("=" * 60)
+
+        if self.errors:
+            logger.error(f"❌ {len(self.errors)} ERRORS FOUND:")
+            for error in self.errors:
+                logger.error(f"   {error}")
+        else:
+            logger.info("✅ All batched write tests passed!")
+
+        logger.info("=" * 60)
+
+
+async def main() -> int:
+    """Run batched write tests."""
+    tester = BatchedWritesTester()
+    success = await tester.run_all_tests()
+
+    if success:
+        logger.info("\n🎉 Batched writes are working correctly!")
+        return 0
+    else:
+        logger.error("\n❌ Please fix the batched write issues above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Group Quiz Session Test for Educational Quiz Bot
+
+This test checks GroupQuizSession scoring: the per-question snapshot and the
+leaderboard views, without needing Discord or a database.
+
+Usage:
+    python tests/test_group_quiz_session.py
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from typing import List
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("group_quiz_session_test")
+
+
+def _make_session(questions):
+    """Create an active GroupQuizSession for the given questions."""
+    from services.group_quiz import GroupQuizSession
+
+    session = GroupQuizSession(guild_id=1, channel_id=2, host_id=100, topic="testing", questions=questions)
+    session.is_active = True
+    return session
+
+
+def _question(question_id: int, answer: str):
+    """Create a multiple-choice question whose options are A to D."""
+    from services import Question
+
+    return Question(question_id=question_id, question=f"Question {question_id}?", answer=answer,
+                    options=["A", "B", "C", "D"])
+
+
+class GroupQuizSessionTester:
+    """Test group quiz session scoring."""
+
+    def __init__(self):
+        self.errors: List[str] = []
+
+    async def run_all_tests(self) -> bool:
+        """Run all group quiz session tests."""
+        logger.info("=" * 60)
+        logger.info("Educational Quiz Bot - Group Quiz Session Test")
+        logger.info("=" * 60)
+
+        tests = [
+            self.test_snapshot_scores_once,
+            self.test_snapshot_unscorable_question,
+            self.test_get_top_matches_leaderboard,
+        ]
+
+        all_passed = True
+        for test in tests:
+            try:
+                if not await test():
+                    all_passed = False
+            except Exception as e:
+                logger.error(f"❌ Test {test.__name__} failed with exception: {e}")
+                import traceback
+                traceback.print_exc()
+                all_passed = False
+
+        # Show summary
+        self._show_summary()
+        return all_passed and len(self.errors) == 0
+
+    def _check(self, condition: bool, message: str) -> bool:
+        """Record an error if a condition doesn't hold."""
+        if not condition:
+            self.errors.append(f"❌ {message}")
+            logger.error(f"❌ {message}")
+        return condition
+
+    async def test_snapshot_scores_once(self) -> bool:
+        """Test that repeated snapshots of a question don't score it again."""
+        logger.info("\n📸 Testing snapshot caching...")
+
+        session = _make_session([_question(1, "B"), _question(2, "C")])
+        session.register_participant(10, "alice")
+        session.register_participant(20, "bob")
+        session.record_answer(10, "B", 2.0)
+        session.record_answer(20, "A", 1.0)
+
+        passed = True
+        responders, leaderboard, progress = session.snapshot()
+        passed &= self._check(
+            [r["user_id"] for r in responders] == [10],
+            f"Unexpected correct responders: {responders}"
+        )
+        passed &= self._check(
+            [e["user_id"] for e in leaderboard] == [10, 20] and progress["current"] == 1,
+            f"Unexpected leaderboard or progress: {leaderboard} {progress}"
+        )
+
+        score = session.participants[10]["score"]
+        again, _, _ = session.snapshot()
+        passed &= self._check(
+            again == responders and session.participants[10]["score"] == score,
+            "Second snapshot of the same question scored it again"
+        )
+
+        if passed:
+            logger.info("✅ Snapshot scores each question once")
+        return passed
+
+    async def test_snapshot_unscorable_question(self) -> bool:
+        """Test that a question with no usable answer doesn't reuse the previous question's results."""
+        logger.info("\n📸 Testing snapshot of an unscorable question...")
+
+        unscorable = _question(2, "Answer unavailable")
+        unscorable.options = []
+        session = _make_session([_question(1, "B"), unscorable])
+        session.register_participant(10, "alice")
+        session.record_answer(10, "B", 2.0)
+        first, _, _ = session.snapshot()
+
+        session.next_question()
+        responders, _, progress = session.snapshot()
+
+        passed = self._check(bool(first), "First question should have a correct responder")
+        passed &= self._check(
+            responders == [] and progress["current"] == 2,
+            f"Unscorable question returned {responders} with progress {progress}"
+        )
+
+        if passed:
+            logger.info("✅ Unscorable question has its own empty results")
+        return passed
+
+    async def test_get_top_matches_leaderboard(self) -> bool:
+        """Test that get_top ranks tied participants like the full leaderboard."""
+        logger.info("\n🏆 Testing get_top against the leaderboard...")
+
+        session = _make_session([_question(1, "A")])
+        rows = [(1, 20, 1), (2, 20, 2), (3, 10, 1), (4, 20, 2), (5, 0, 0), (6, 10, 3)]
+        for user_id, score, correct in rows:
+            session.register_participant(user_id, f"user{user_id}")
+            session.participants[user_id]["score"] = score
+            session.participants[user_id]["correct_answers"] = correct
+
+        passed = True
+        for k in (1, 3, 6):
+            passed &= self._check(
+                session.get_top(k) == session.get_leaderboard(k),
+                f"get_top({k}) differs from get_leaderboard({k})"
+            )
+        passed &= self._check(
+            [e["user_id"] for e in session.get_top(3)] == [2, 4, 1],
+            f"Unexpected top three: {[e['user_id'] for e in session.get_top(3)]}"
+        )
+
+        if passed:
+            logger.info("✅ get_top matches the leaderboard")
+        return passed
+
+    def _show_summary(self) -> None:
+        """Show test summary."""
+        logger.info("\n" + "=" * 60)
+        logger.info("GROUP QUIZ SESSION TEST SUMMARY")
+        logger.info("=" * 60)
+
+        if self.errors:
+            logger.error(f"❌ {len(self.errors)} ERRORS FOUND:")
+            for error in self.errors:
+                logger.error(f"   {error}")
+        else:
+            logger.info("✅ All group quiz session tests passed!")
+
+        logger.info("=" * 60)
+
+
+async def main() -> int:
+    """Run group quiz session tests."""
+    tester = GroupQuizSessionTester()
+    success = await tester.run_all_tests()
+
+    if success:
+        logger.info("\n🎉 Group quiz sessions are working correctly!")
+        return 0
+    else:
+        logger.error("\n❌ Please fix the group quiz session issues above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
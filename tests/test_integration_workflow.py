@@ -185,7 +185,7 @@ class IntegrationWorkflowTester:
             logger.info("   Step 4: Simulating quiz initialization...")
             
             quiz_session.start_time = datetime.now()
-            quiz_session.current_question_index = 0
+            quiz_session.current_question_idx = 0
             
             if quiz_session.current_question:
                 logger.info(f"   First question ready: '{quiz_session.current_question['question'][:50]}...'")
@@ -102,7 +102,7 @@ class QuizMultiGuildTester:
             
             # Manually add to active quizzes
             session_key = (guild_id, channel_id)
-            quiz_cog.active_quizzes[session_key] = quiz
+            quiz_cog._register_quiz(session_key, quiz)
             quiz.state = QuizState.ACTIVE
             
             # Store for verification
@@ -165,7 +165,7 @@ class QuizMultiGuildTester:
         
         # Add to active quizzes
         session_key = (guild_id, channel_id)
-        quiz_cog.active_quizzes[session_key] = quiz
+        quiz_cog._register_quiz(session_key, quiz)
         quiz.state = QuizState.ACTIVE
         
         # Force run cleanup
@@ -208,7 +208,7 @@ class QuizMultiGuildTester:
         
         # Add to active quizzes
         session_key = (guild_id, channel_id)
-        quiz_cog.active_quizzes[session_key] = quiz
+        quiz_cog._register_quiz(session_key, quiz)
         quiz.state = QuizState.ACTIVE
         
         # Call save recovery data
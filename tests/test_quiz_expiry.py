@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Quiz Expiry Test for Educational Quiz Bot
+
+This test checks how the quiz cog's expiry heap reaps quizzes that are
+inactive, too old or finished, without needing Discord or a database.
+
+Usage:
+    python tests/test_quiz_expiry.py
+"""
+
+import os
+import sys
+import asyncio
+import logging
+import time
+from typing import List
+
+import discord
+from discord.ext import commands
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("quiz_expiry_test")
+
+
+def _make_cog():
+    """Create a quiz cog that isn't attached to a running bot."""
+    from cogs.quiz import QuizCog
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    return QuizCog(bot)
+
+
+def _make_quiz(channel_id: int, num_questions: int = 3):
+    """Create an active quiz with placeholder questions."""
+    from services import Question
+    from cogs.models.quiz_models import ActiveQuiz, QuizState
+
+    questions = [
+        Question(question_id=i, question=f"Question {i}?", answer="A", options=["A", "B", "C", "D"])
+        for i in range(num_questions)
+    ]
+    quiz = ActiveQuiz(guild_id=1, channel_id=channel_id, host_id=100, topic="testing", questions=questions)
+    quiz.state = QuizState.ACTIVE
+    return quiz
+
+
+class QuizExpiryTester:
+    """Test quiz expiry through the deadline heap."""
+
+    def __init__(self):
+        self.errors: List[str] = []
+
+    async def run_all_tests(self) -> bool:
+        """Run all quiz expiry tests."""
+        logger.info("=" * 60)
+        logger.info("Educational Quiz Bot - Quiz Expiry Test")
+        logger.info("=" * 60)
+
+        tests = [
+            self.test_expired_quizzes_are_reaped,
+            self.test_active_quiz_is_rescheduled,
+            self.test_finished_quiz_is_reaped,
+        ]
+
+        all_passed = True
+        for test in tests:
+            try:
+                if not await test():
+                    all_passed = False
+            except Exception as e:
+                logger.error(f"❌ Test {test.__name__} failed with exception: {e}")
+                import traceback
+                traceback.print_exc()
+                all_passed = False
+
+        # Show summary
+        self._show_summary()
+        return all_passed and len(self.errors) == 0
+
+    def _check(self, condition: bool, message: str) -> bool:
+        """Record an error if a condition doesn't hold."""
+        if not condition:
+            self.errors.append(f"❌ {message}")
+            logger.error(f"❌ {message}")
+        return condition
+
+    async def test_expired_quizzes_are_reaped(self) -> bool:
+        """Test that inactive and overlong quizzes are removed and fresh ones are kept."""
+        logger.info("\n⏰ Testing expired quiz reaping...")
+
+        cog = _make_cog()
+        now = time.time()
+
+        inactive = _make_quiz(channel_id=10)
+        inactive.last_activity_time = now - 1860  # 31 minutes
+        overlong = _make_quiz(channel_id=20)
+        overlong.start_time = now - 3660  # 61 minutes, but still active
+        fresh = _make_quiz(channel_id=30)
+        for quiz in (inactive, overlong, fresh):
+            cog._register_quiz((1, quiz.channel_id), quiz)
+
+        await cog.cleanup_expired_quizzes()
+
+        passed = True
+        passed &= self._check(
+            set(cog.active_quizzes) == {(1, 30)},
+            f"Unexpected quizzes left after cleanup: {sorted(cog.active_quizzes)}"
+        )
+        passed &= self._check(
+            len(cog._expiry_heap) == 1 and cog._expiry_heap[0][2] == fresh.quiz_id,
+            f"Unexpected heap after cleanup: {cog._expiry_heap}"
+        )
+
+        if passed:
+            logger.info("✅ Expired quizzes are reaped")
+        return passed
+
+    async def test_active_quiz_is_rescheduled(self) -> bool:
+        """Test that a due entry is pushed back when its quiz has seen activity, and stale entries are skipped."""
+        logger.info("\n🔁 Testing rescheduling of active quizzes...")
+
+        cog = _make_cog()
+        now = time.time()
+
+        quiz = _make_quiz(channel_id=10)
+        quiz.last_activity_time = now - 1860
+        cog._register_quiz((1, 10), quiz)
+        # Activity after the entry was pushed
+        quiz.last_activity_time = now
+
+        # The channel's old quiz was replaced by a new one; its entry must not touch the new quiz
+        old = _make_quiz(channel_id=20)
+        old.last_activity_time = now - 1860
+        cog._register_quiz((1, 20), old)
+        replacement = _make_quiz(channel_id=20)
+        cog._register_quiz((1, 20), replacement)
+
+        await cog.cleanup_expired_quizzes()
+
+        passed = True
+        passed &= self._check(
+            cog.active_quizzes.get((1, 10)) is quiz and cog.active_quizzes.get((1, 20)) is replacement,
+            f"Quizzes removed unexpectedly: {sorted(cog.active_quizzes)}"
+        )
+        passed &= self._check(
+            all(deadline > now for deadline, _, _ in cog._expiry_heap),
+            f"Due entries left on the heap: {cog._expiry_heap}"
+        )
+        passed &= self._check(
+            sorted(entry[2] for entry in cog._expiry_heap) == sorted([quiz.quiz_id, replacement.quiz_id]),
+            f"Unexpected heap entries: {cog._expiry_heap}"
+        )
+
+        if passed:
+            logger.info("✅ Active quizzes are rescheduled")
+        return passed
+
+    async def test_finished_quiz_is_reaped(self) -> bool:
+        """Test that a finished quiz is dropped shortly after it ends rather than at its inactivity deadline."""
+        logger.info("\n🏁 Testing finished quiz reaping...")
+
+        cog = _make_cog()
+        quiz = _make_quiz(channel_id=10, num_questions=1)
+        cog._register_quiz((1, 10), quiz)
+
+        quiz.next_question()
+        cog._schedule_expiry((1, 10), quiz)
+
+        passed = True
+        earliest = cog._expiry_heap[0][0]
+        passed &= self._check(
+            earliest <= quiz.end_time + cog._FINISHED_QUIZ_GRACE,
+            f"Finished quiz scheduled {earliest - quiz.end_time:.0f}s after it ended"
+        )
+
+        await cog.cleanup_expired_quizzes()
+        passed &= self._check((1, 10) in cog.active_quizzes, "Finished quiz dropped before its grace period")
+
+        # Move the end time back past the grace period
+        quiz.end_time -= cog._FINISHED_QUIZ_GRACE + 1
+        cog._schedule_expiry((1, 10), quiz)
+        await cog.cleanup_expired_quizzes()
+        passed &= self._check((1, 10) not in cog.active_quizzes, "Finished quiz not dropped after its grace period")
+
+        if passed:
+            logger.info("✅ Finished quizzes are reaped")
+        return passed
+
+    def _show_summary(self) -> None:
+        """Show test summary."""
+        logger.info("\n" + "=" * 60)
+        logger.info("QUIZ EXPIRY TEST SUMMARY")
+        logger.info("=" * 60)
+
+        if self.errors:
+            logger.error(f"❌ {len(self.errors)} ERRORS FOUND:")
+            for error in self.errors:
+                logger.error(f"   {error}")
+        else:
+            logger.info("✅ All quiz expiry tests passed!")
+
+        logger.info("=" * 60)
+
+
+async def main() -> int:
+    """Run quiz expiry tests."""
+    tester = QuizExpiryTester()
+    success = await tester.run_all_tests()
+
+    if success:
+        logger.info("\n🎉 Quiz expiry is working correctly!")
+        return 0
+    else:
+        logger.error("\n❌ Please fix the quiz expiry issues above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
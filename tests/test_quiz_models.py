@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Quiz Model Test for Educational Quiz Bot
+
+This test checks the in-memory quiz models: participant totals, leaderboard
+ranking and quiz statistics, without needing Discord or a database.
+
+Usage:
+    python tests/test_quiz_models.py
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from typing import List
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("quiz_models_test")
+
+
+def _make_quiz(num_questions: int = 5):
+    """Create an ActiveQuiz with placeholder questions."""
+    from services import Question
+    from cogs.models.quiz_models import ActiveQuiz
+
+    questions = [
+        Question(question_id=i, question=f"Question {i}?", answer="A", options=["A", "B", "C", "D"])
+        for i in range(num_questions)
+    ]
+    return ActiveQuiz(guild_id=1, channel_id=2, host_id=100, topic="testing", questions=questions)
+
+
+class QuizModelsTester:
+    """Test the quiz data models."""
+
+    def __init__(self):
+        self.errors: List[str] = []
+
+    async def run_all_tests(self) -> bool:
+        """Run all quiz model tests."""
+        logger.info("=" * 60)
+        logger.info("Educational Quiz Bot - Quiz Model Test")
+        logger.info("=" * 60)
+
+        tests = [
+            self.test_leaderboard_matches_participants,
+            self.test_ranking_and_stats_after_mixed_answers,
+        ]
+
+        all_passed = True
+        for test in tests:
+            try:
+                if not await test():
+                    all_passed = False
+            except Exception as e:
+                logger.error(f"❌ Test {test.__name__} failed with exception: {e}")
+                import traceback
+                traceback.print_exc()
+                all_passed = False
+
+        # Show summary
+        self._show_summary()
+        return all_passed and len(self.errors) == 0
+
+    def _check(self, condition: bool, message: str) -> bool:
+        """Record an error if a condition doesn't hold."""
+        if not condition:
+            self.errors.append(f"❌ {message}")
+            logger.error(f"❌ {message}")
+        return condition
+
+    async def test_leaderboard_matches_participants(self) -> bool:
+        """Test that leaderboard rows and participant totals agree after mixed answers."""
+        logger.info("\n🏆 Testing leaderboard against participants...")
+
+        quiz = _make_quiz()
+        answers = [
+            (1, True, 10), (2, False, 0), (3, True, 5),
+            (2, True, 15), (1, False, 0), (3, True, 5),
+            (4, False, 0), (1, True, 0),
+        ]
+        for user_id, is_correct, points in answers:
+            quiz.record_answer(user_id, is_correct, points)
+
+        passed = True
+        entries = quiz.get_leaderboard_entries()
+        passed &= self._check(
+            [e.user_id for e in entries] == [2, 1, 3, 4],
+            f"Unexpected leaderboard order: {[e.user_id for e in entries]}"
+        )
+        passed &= self._check(
+            len(entries) == len(quiz.participants),
+            "Leaderboard and participants have different sizes"
+        )
+
+        for entry in entries:
+            participant = quiz.participants[entry.user_id]
+            passed &= self._check(
+                (entry.score, entry.correct_answers, entry.wrong_answers, entry.total_answers, entry.accuracy)
+                == (participant.score, participant.correct_count, participant.wrong_count,
+                    participant.total_answers, participant.accuracy),
+                f"Leaderboard entry for user {entry.user_id} doesn't match the participant: "
+                f"{entry} vs {participant}"
+            )
+
+        # User 1 answered right twice (one of them for no points) and wrong once
+        participant = quiz.participants[1]
+        passed &= self._check(
+            (participant.score, participant.correct_count, participant.wrong_count) == (10, 2, 1),
+            f"Unexpected totals for user 1: {participant}"
+        )
+
+        if passed:
+            logger.info("✅ Leaderboard matches participants")
+        return passed
+
+    async def test_ranking_and_stats_after_mixed_answers(self) -> bool:
+        """Test that ranking and cached stats follow each new answer."""
+        logger.info("\n📊 Testing ranking and stats...")
+
+        quiz = _make_quiz()
+        quiz.record_answer(5, True, 10)
+        quiz.record_answer(3, True, 10)
+        quiz.record_answer(7, False, 0)
+
+        passed = True
+        # Equal scores are ordered by user ID
+        top = quiz.get_top(2)
+        passed &= self._check(
+            [e["user_id"] for e in top] == [3, 5],
+            f"Unexpected top two: {[e['user_id'] for e in top]}"
+        )
+        stats = quiz.get_stats()
+        passed &= self._check(
+            (stats["correct_answers"], stats["wrong_answers"], stats["total_participants"]) == (2, 1, 3),
+            f"Unexpected stats: {stats}"
+        )
+
+        # Read once so the next checks would see stale cached copies if they weren't invalidated
+        quiz.get_progress_info()
+        quiz.record_answer(7, True, 25)
+        quiz.record_answer(5, False, 0)
+
+        top = quiz.get_top(3)
+        passed &= self._check(
+            [e["user_id"] for e in top] == [7, 3, 5],
+            f"Ranking not updated after new answers: {[e['user_id'] for e in top]}"
+        )
+        passed &= self._check(
+            top[0]["score"] == 25 and top[0]["accuracy"] == 50.0,
+            f"Unexpected leader entry: {top[0]}"
+        )
+        stats = quiz.get_stats()
+        passed &= self._check(
+            (stats["correct_answers"], stats["wrong_answers"], stats["accuracy"]) == (3, 2, 60.0),
+            f"Stats not updated after new answers: {stats}"
+        )
+        progress = quiz.get_progress_info()
+        passed &= self._check(
+            (progress["questions_answered"], progress["participant_count"]) == (5, 3),
+            f"Progress not updated after new answers: {progress}"
+        )
+
+        if passed:
+            logger.info("✅ Ranking and stats follow new answers")
+        return passed
+
+    def _show_summary(self) -> None:
+        """Show test summary."""
+        logger.info("\n" + "=" * 60)
+        logger.info("QUIZ MODEL TEST SUMMARY")
+        logger.info("=" * 60)
+
+        if self.errors:
+            logger.error(f"❌ {len(self.errors)} ERRORS FOUND:")
+            for error in self.errors:
+                logger.error(f"   {error}")
+        else:
+            logger.info("✅ All quiz model tests passed!")
+
+        logger.info("=" * 60)
+
+
+async def main() -> int:
+    """Run quiz model tests."""
+    tester = QuizModelsTester()
+    success = await tester.run_all_tests()
+
+    if success:
+        logger.info("\n🎉 Quiz models are working correctly!")
+        return 0
+    else:
+        logger.error("\n❌ Please fix the quiz model issues above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))